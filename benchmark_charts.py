@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Benchmark chart construction: figure build time and Plotly JSON payload size."""
+
+import sys
+
+import numpy as np
+import plotly
+import plotly.graph_objects as go
+
+from benchmark_indicators import make_ohlcv, timed, uncached
+from utils.chart_helpers import (
+    add_level_lines,
+    add_pivot_points,
+    calculate_pivot_points,
+    create_candlestick_chart,
+    create_price_chart,
+    volume_colors,
+)
+from utils.figure_cache import get_figure_cache, memoize_figure
+from utils.market_regime import detect_market_regime, plot_market_regime
+from utils.prediction_models import plot_predictions
+from utils.technical_indicators import calculate_support_resistance, plot_with_indicators
+
+ALL_INDICATORS = ['SMA', 'Bollinger Bands', 'RSI', 'MACD', 'Support/Resistance']
+
+# Build-time budgets in seconds for each figure factory at 100k bars; the
+# figure benchmark exits non-zero when one is exceeded
+BUILD_BUDGETS = {
+    'candlestick': 0.5,
+    'indicators': 2.0,
+    'market regime': 1.0,
+    'predictions': 0.5,
+}
+
+
+def cold(factory):
+    """Run a figure factory with an empty figure cache, like a first render."""
+    get_figure_cache().clear()
+    return factory()
+
+
+def check_cached_subplots(n_bars=500):
+    """
+    Check that figures served from the figure cache keep what callers rely
+    on: the subplot grid (traces added by row and col) and validation of
+    later changes. Both depend on plotly internals.
+
+    Returns:
+        bool: Whether the cached figure behaved like a freshly built one
+    """
+    data = make_ohlcv(n_bars)
+    build = memoize_figure(name='benchmark_charts.check_cached_subplots')(create_candlestick_chart)
+    get_figure_cache().clear()
+    build(data)
+    fig = build(data)
+    ok = get_figure_cache().stats()['hits'] == 1
+    try:
+        add_pivot_points(fig, data, row=1, col=1)
+        fig.add_trace(go.Scatter(x=data.index, y=data['Volume']), row=2, col=1)
+    except Exception as error:
+        print(f"Cached figure lost its subplot grid: {error}")
+        ok = False
+    for invalid_change in (lambda: fig.update_layout(height='tall'), lambda: fig.update_traces(opacity='half')):
+        try:
+            invalid_change()
+            print("Cached figure no longer validates changes")
+            ok = False
+        except ValueError:
+            pass
+    print(f"Cached subplot figure (plotly {plotly.__version__}): {'ok' if ok else 'BROKEN'}")
+    return ok
+
+
+def check_price_chart_types(n_bars=500):
+    """
+    Build the Chart Analysis figure for every chart type, with and without
+    the volume subplot, and check that the volume lands on its own axis and
+    that each figure is cached once.
+
+    Returns:
+        bool: Whether every variant was built
+    """
+    data = make_ohlcv(n_bars)
+    ok = True
+    for chart_type in ('Candlestick', 'OHLC', 'Line'):
+        for show_volume in (True, False):
+            try:
+                fig = cold(lambda: create_price_chart(
+                    data, 'TEST', chart_type, show_volume, True, True, [], 'auto'
+                ))
+                passed = chart_type == 'OHLC' or show_volume == any(
+                    trace.name == 'Volume' and trace.yaxis == 'y2' for trace in fig.data
+                )
+                # One cached figure per chart: nested builders must not cache again
+                passed &= get_figure_cache().stats()['entries'] == 1
+            except Exception as error:
+                print(f"{chart_type} chart failed: {error}")
+                passed = False
+            ok &= passed
+            volume = 'with volume' if show_volume else 'no volume'
+            print(f"{chart_type:>12} {volume:<12} {'ok' if passed else 'BROKEN'}")
+    return ok
+
+
+def check_auto_webgl(n_bars=100_000, short_bars=500):
+    """
+    Check that 'auto' rendering picks WebGL from the visible bar count: a
+    long history must get Scattergl traces even though it is downsampled to
+    the plot width, and a short one must stay SVG.
+
+    Returns:
+        bool: Whether every factory chose the expected renderer
+    """
+    ok = True
+    for n, expected in ((n_bars, True), (short_bars, False)):
+        data = make_ohlcv(n)
+        regime_info = detect_market_regime(data)
+        factories = {
+            'candlestick': lambda: create_candlestick_chart(data, render_mode='auto'),
+            'indicators': lambda: uncached(plot_with_indicators, data, ALL_INDICATORS, render_mode='auto'),
+            'market regime': lambda: plot_market_regime(data, regime_info, render_mode='auto'),
+        }
+        for name, factory in factories.items():
+            webgl = any(trace.type == 'scattergl' for trace in cold(factory).data)
+            passed = webgl == expected
+            ok &= passed
+            print(f"{name:>14} {n:>8,} bars  {'WebGL' if webgl else 'SVG':<6} {'ok' if passed else 'WRONG RENDERER'}")
+    return ok
+
+
+def shapes_support_resistance(fig, data, support_levels, resistance_levels):
+    """Support/resistance drawn the original way: one layout shape per level."""
+    for levels, color in ((resistance_levels, "red"), (support_levels, "green")):
+        for date, level in levels:
+            fig.add_shape(
+                type="line", x0=date, y0=level, x1=data.index[-1], y1=level,
+                line=dict(color=color, width=1, dash="dash"), row=1, col=1
+            )
+    return fig
+
+
+def traces_support_resistance(fig, data, support_levels, resistance_levels):
+    """Support/resistance drawn as one segmented trace per level type."""
+    for levels, color in ((resistance_levels, "red"), (support_levels, "green")):
+        add_level_lines(
+            fig, [date for date, _ in levels], [data.index[-1]] * len(levels),
+            [level for _, level in levels], color=color, row=1, col=1
+        )
+    return fig
+
+
+def shapes_pivot_points(fig, data):
+    """Pivot points drawn the original way: a shape and an annotation per level."""
+    for level, value in calculate_pivot_points(data).items():
+        color = 'black' if level == 'P' else ('green' if level.startswith('S') else 'red')
+        fig.add_shape(
+            type="line", x0=data.index[0], y0=value, x1=data.index[-1], y1=value,
+            line=dict(color=color, width=1, dash='solid' if level == 'P' else 'dash'), row=1, col=1
+        )
+        fig.add_annotation(
+            x=data.index[-1], y=value, text=f"{level}: {value:.2f}",
+            showarrow=False, xanchor="left", xshift=10, row=1, col=1
+        )
+    return fig
+
+
+def loop_volume_colors(data):
+    """Volume colors the original way, one iterrows() row at a time."""
+    return ['green' if row['Close'] >= row['Open'] else 'red' for _, row in data.iterrows()]
+
+
+def benchmark_volume_colors(lengths=(1_000, 10_000, 100_000)):
+    """Compare iterrows() volume coloring with the vectorized helper."""
+    print("Volume bar colors")
+    print(f"{'bars':>8} {'iterrows (s)':>13} {'vectorized (s)':>15} {'speed-up':>9}  identical")
+    for n_bars in lengths:
+        data = make_ohlcv(n_bars)
+        loop_time, expected = timed(loop_volume_colors, data, repeat=1)
+        fast_time, actual = timed(volume_colors, data)
+        same = actual.tolist() == expected
+        print(f"{n_bars:>8} {loop_time:>13.3f} {fast_time:>15.5f} {loop_time / fast_time:>8.0f}x  {same}")
+
+
+def benchmark_figure_factories(lengths=(1_000, 10_000, 100_000)):
+    """
+    Time every figure factory at several history lengths.
+
+    Figures are built with an empty figure cache, and indicator figures on
+    a fresh copy with an empty result cache, like the first render of a page.
+
+    Returns:
+        dict: Factory name -> {bars: seconds}
+    """
+    results = {name: {} for name in BUILD_BUDGETS}
+    print("Figure build time (s) and payload (KB)")
+    print(f"{'factory':>14} " + " ".join(f"{n_bars:>17,}" for n_bars in lengths))
+    rows = {name: [] for name in BUILD_BUDGETS}
+    for n_bars in lengths:
+        data = make_ohlcv(n_bars)
+        regime_info = detect_market_regime(data)
+        predictions = list(data['Close'].iloc[-1] * np.linspace(1, 1.05, 30))
+        factories = {
+            'candlestick': lambda: create_candlestick_chart(data),
+            'indicators': lambda: uncached(plot_with_indicators, data, ALL_INDICATORS),
+            'market regime': lambda: plot_market_regime(data, regime_info),
+            'predictions': lambda: plot_predictions(data, predictions, [0.8] * 30),
+        }
+        for name, factory in factories.items():
+            elapsed, fig = timed(cold, factory)
+            results[name][n_bars] = elapsed
+            rows[name].append(f"{elapsed:>8.3f} {payload_kb(fig):>8.0f}")
+    for name, cells in rows.items():
+        print(f"{name:>14} " + " ".join(cells))
+    return results
+
+
+def check_build_budgets(results, n_bars=100_000):
+    """Print and return whether every factory stayed within its build-time budget."""
+    ok = True
+    for name, budget in BUILD_BUDGETS.items():
+        elapsed = results[name].get(n_bars)
+        if elapsed is None:
+            continue
+        passed = elapsed <= budget
+        ok &= passed
+        print(f"{name:>14} {elapsed:.3f}s / {budget:.1f}s budget  {'ok' if passed else 'OVER BUDGET'}")
+    return ok
+
+
+def payload_kb(fig):
+    return len(fig.to_json()) / 1024
+
+
+def benchmark_level_lines(lengths=(500, 1_000, 2_500), window=5):
+    """Compare per-level shapes with batched traces for support/resistance lines."""
+    print(f"Support/resistance lines (window={window})")
+    print(f"{'bars':>8} {'levels':>7} {'shapes (s)':>11} {'traces (s)':>11} "
+          f"{'shapes (KB)':>12} {'traces (KB)':>12} {'speed-up':>9}")
+    for n_bars in lengths:
+        data = make_ohlcv(n_bars)
+        base = create_candlestick_chart(data)
+        support, resistance = calculate_support_resistance(data, window=window)
+
+        # Shapes are slow enough that one run is plenty
+        shapes_time, shapes_fig = timed(
+            lambda: shapes_support_resistance(go.Figure(base), data, support, resistance), repeat=1
+        )
+        traces_time, traces_fig = timed(lambda: traces_support_resistance(go.Figure(base), data, support, resistance))
+        print(f"{n_bars:>8} {len(support) + len(resistance):>7} {shapes_time:>11.3f} {traces_time:>11.4f} "
+              f"{payload_kb(shapes_fig) - payload_kb(base):>12.1f} {payload_kb(traces_fig) - payload_kb(base):>12.1f} "
+              f"{shapes_time / traces_time:>8.0f}x")
+
+
+def benchmark_pivot_points(n_bars=1_000):
+    """Compare per-level shapes and annotations with batched traces for pivot points."""
+    data = make_ohlcv(n_bars)
+    base = create_candlestick_chart(data)
+    shapes_time, shapes_fig = timed(lambda: shapes_pivot_points(go.Figure(base), data))
+    traces_time, traces_fig = timed(lambda: add_pivot_points(go.Figure(base), data))
+    print("Pivot points (7 levels)")
+    print(f"{'':>8} {'build (s)':>10} {'layout objects':>15} {'payload (KB)':>13}")
+    for name, elapsed, fig in (('shapes', shapes_time, shapes_fig), ('traces', traces_time, traces_fig)):
+        objects = len(fig.layout.shapes) + len(fig.layout.annotations) - len(base.layout.annotations)
+        print(f"{name:>8} {elapsed:>10.4f} {objects:>15} {payload_kb(fig) - payload_kb(base):>13.1f}")
+
+
+if __name__ == "__main__":
+    benchmark_level_lines()
+    print()
+    benchmark_pivot_points()
+    print()
+    benchmark_volume_colors()
+    print()
+    build_times = benchmark_figure_factories()
+    print()
+    budgets_ok = check_build_budgets(build_times)
+    print()
+    cached_ok = check_cached_subplots()
+    print()
+    webgl_ok = check_auto_webgl()
+    print()
+    chart_types_ok = check_price_chart_types()
+    if not (cached_ok and budgets_ok and webgl_ok and chart_types_ok):
+        sys.exit(1)
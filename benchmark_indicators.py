@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""Benchmark vectorized indicator code against the original loop implementations."""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils import kernels
+from utils.bar_aggregator import TickBarAggregator
+from utils.chart_helpers import calculate_pivot_points
+from utils.indicator_cache import get_result_cache
+from utils.market_regime import calculate_atr
+from utils.panel_indicators import align_panel, panel_atr, panel_macd, panel_rsi
+from utils.pivot_points import PIVOT_METHODS, calculate_pivot_series
+from utils.resampling import interval_nanoseconds, ticks_to_bars
+from utils.streaming import SimulatedQuoteFeed
+from utils.streaming_indicators import (
+    StreamingATR,
+    StreamingBollingerBands,
+    StreamingEMA,
+    StreamingMACD,
+    StreamingRSI,
+    StreamingSMA,
+)
+from utils.technical_indicators import (
+    EXTENDED_COLUMNS,
+    calculate_anchored_vwap,
+    calculate_bollinger_bands,
+    calculate_ema,
+    calculate_extended_indicators,
+    calculate_macd,
+    calculate_parabolic_sar,
+    calculate_rsi,
+    calculate_sma,
+    calculate_sr_zones,
+    calculate_supertrend,
+    calculate_support_resistance,
+    detect_candlestick_patterns,
+    find_watchlist_zones,
+)
+from utils.volume_profile import distribute_volume, price_edges
+
+
+def make_ohlcv(n_bars, seed=42):
+    """Build a synthetic daily OHLCV frame with a random-walk close."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n_bars)))
+    open_ = close * (1 + rng.normal(0, 0.005, n_bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, n_bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, n_bars)))
+    volume = rng.integers(100_000, 5_000_000, n_bars).astype(float)
+    index = pd.bdate_range('2000-01-03', periods=n_bars)
+    return pd.DataFrame(
+        {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+        index=index
+    )
+
+
+def loop_support_resistance(data, window=10):
+    """Original per-bar implementation, kept as the reference."""
+    resistance_levels = []
+    for i in range(window, len(data) - window):
+        if all(data['High'].iloc[i] > data['High'].iloc[i-j] for j in range(1, window+1)) and \
+           all(data['High'].iloc[i] > data['High'].iloc[i+j] for j in range(1, window+1)):
+            resistance_levels.append((data.index[i], data['High'].iloc[i]))
+
+    support_levels = []
+    for i in range(window, len(data) - window):
+        if all(data['Low'].iloc[i] < data['Low'].iloc[i-j] for j in range(1, window+1)) and \
+           all(data['Low'].iloc[i] < data['Low'].iloc[i+j] for j in range(1, window+1)):
+            support_levels.append((data.index[i], data['Low'].iloc[i]))
+
+    return support_levels, resistance_levels
+
+
+def loop_candlestick_patterns(data):
+    """Original per-bar Doji/Hammer/Engulfing detection, kept as the reference."""
+    doji = []
+    for i in range(len(data)):
+        if abs(data['Open'].iloc[i] - data['Close'].iloc[i]) / (data['High'].iloc[i] - data['Low'].iloc[i] + 0.001) < 0.1:
+            if data['High'].iloc[i] - max(data['Open'].iloc[i], data['Close'].iloc[i]) > 3 * abs(data['Open'].iloc[i] - data['Close'].iloc[i]) and \
+               min(data['Open'].iloc[i], data['Close'].iloc[i]) - data['Low'].iloc[i] > 3 * abs(data['Open'].iloc[i] - data['Close'].iloc[i]):
+                doji.append((data.index[i], 'Long-Legged Doji'))
+            else:
+                doji.append((data.index[i], 'Doji'))
+
+    hammer = []
+    for i in range(len(data)):
+        body = abs(data['Open'].iloc[i] - data['Close'].iloc[i])
+        if body > 0:
+            lower_shadow = min(data['Open'].iloc[i], data['Close'].iloc[i]) - data['Low'].iloc[i]
+            upper_shadow = data['High'].iloc[i] - max(data['Open'].iloc[i], data['Close'].iloc[i])
+            if lower_shadow > 2 * body and upper_shadow < 0.1 * body:
+                hammer.append((data.index[i], 'Hammer'))
+
+    engulfing = []
+    for i in range(1, len(data)):
+        if data['Close'].iloc[i-1] < data['Open'].iloc[i-1] and \
+           data['Close'].iloc[i] > data['Open'].iloc[i] and \
+           data['Close'].iloc[i] > data['Open'].iloc[i-1] and \
+           data['Open'].iloc[i] < data['Close'].iloc[i-1]:
+            engulfing.append((data.index[i], 'Bullish Engulfing'))
+        elif data['Close'].iloc[i-1] > data['Open'].iloc[i-1] and \
+             data['Close'].iloc[i] < data['Open'].iloc[i] and \
+             data['Close'].iloc[i] < data['Open'].iloc[i-1] and \
+             data['Open'].iloc[i] > data['Close'].iloc[i-1]:
+            engulfing.append((data.index[i], 'Bearish Engulfing'))
+
+    return {'doji': doji, 'hammer': hammer, 'engulfing': engulfing}
+
+
+def naive_parabolic_sar(data, step=0.02, max_step=0.2):
+    """Parabolic SAR as a bar-by-bar loop over pandas objects."""
+    high, low = data['High'], data['Low']
+    sar = pd.Series(np.nan, index=data.index)
+    trend = pd.Series(0.0, index=data.index)
+    up = high.iloc[1] >= high.iloc[0]
+    af, ep = step, (high.iloc[0] if up else low.iloc[0])
+    sar.iloc[0], trend.iloc[0] = (low.iloc[0] if up else high.iloc[0]), (1 if up else -1)
+    for i in range(1, len(data)):
+        value = sar.iloc[i - 1] + af * (ep - sar.iloc[i - 1])
+        if up:
+            value = min(value, low.iloc[i - 1], low.iloc[max(i - 2, 0)])
+            if low.iloc[i] < value:
+                up, value, ep, af = False, ep, low.iloc[i], step
+            elif high.iloc[i] > ep:
+                ep, af = high.iloc[i], min(af + step, max_step)
+        else:
+            value = max(value, high.iloc[i - 1], high.iloc[max(i - 2, 0)])
+            if high.iloc[i] > value:
+                up, value, ep, af = True, ep, high.iloc[i], step
+            elif low.iloc[i] < ep:
+                ep, af = low.iloc[i], min(af + step, max_step)
+        sar.iloc[i], trend.iloc[i] = value, (1 if up else -1)
+    return sar, trend
+
+
+def naive_supertrend(data, window=10, multiplier=3):
+    """SuperTrend over a Wilder ATR built with ewm, looping over pandas objects."""
+    high, low, close = data['High'], data['Low'], data['Close']
+    prev_close = close.shift(1)
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    atr = naive_wilder(true_range, window)
+    mid = (high + low) / 2
+    basic_upper, basic_lower = mid + multiplier * atr, mid - multiplier * atr
+
+    line = pd.Series(np.nan, index=data.index)
+    trend = pd.Series(0.0, index=data.index)
+    start = atr.first_valid_index()
+    i0 = data.index.get_loc(start)
+    upper, lower = basic_upper.iloc[i0], basic_lower.iloc[i0]
+    up = close.iloc[i0] >= lower
+    line.iloc[i0], trend.iloc[i0] = (lower if up else upper), (1 if up else -1)
+    for i in range(i0 + 1, len(data)):
+        if basic_upper.iloc[i] < upper or close.iloc[i - 1] > upper:
+            upper = basic_upper.iloc[i]
+        if basic_lower.iloc[i] > lower or close.iloc[i - 1] < lower:
+            lower = basic_lower.iloc[i]
+        if up and close.iloc[i] < lower:
+            up = False
+        elif not up and close.iloc[i] > upper:
+            up = True
+        line.iloc[i], trend.iloc[i] = (lower if up else upper), (1 if up else -1)
+    return line, trend
+
+
+def naive_wilder(series, window):
+    """Wilder smoothing with pandas: seed with the first window's mean, then ewm."""
+    seed = pd.Series([series.iloc[:window].mean()], index=series.index[window - 1:window])
+    smoothed = pd.concat([seed, series.iloc[window:]]).ewm(alpha=1 / window, adjust=False).mean()
+    return smoothed.reindex(series.index)
+
+
+def naive_wilder_rsi(data, window=14):
+    """Wilder RSI with pandas."""
+    delta = data['Close'].diff().iloc[1:]
+    avg_gain = naive_wilder(delta.clip(lower=0), window)
+    avg_loss = naive_wilder(-delta.clip(upper=0), window)
+    return (100 - 100 / (1 + avg_gain / avg_loss)).reindex(data.index)
+
+
+def naive_extended_indicators(data):
+    """Extended pack written the usual way: every indicator makes its own pandas calls."""
+    high, low, close, volume = data['High'], data['Low'], data['Close'], data['Volume']
+    out = {}
+
+    stoch_high, stoch_low = high.rolling(14).max(), low.rolling(14).min()
+    out['Stoch %K'] = 100 * (close - stoch_low) / (stoch_high - stoch_low)
+    out['Stoch %D'] = out['Stoch %K'].rolling(3).mean()
+    out['Williams %R'] = -100 * (high.rolling(14).max() - close) / (high.rolling(14).max() - low.rolling(14).min())
+
+    prev_close = close.shift(1)
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    up_move, down_move = high.diff().fillna(0), -low.diff().fillna(0)
+    plus_dm = up_move.where((up_move > down_move) & (up_move > 0), 0.0)
+    minus_dm = down_move.where((down_move > up_move) & (down_move > 0), 0.0)
+    smoothed_tr = true_range.ewm(alpha=1 / 14, adjust=False).mean()
+    plus_di = 100 * plus_dm.ewm(alpha=1 / 14, adjust=False).mean() / smoothed_tr
+    minus_di = 100 * minus_dm.ewm(alpha=1 / 14, adjust=False).mean() / smoothed_tr
+    dx = (100 * (plus_di - minus_di).abs() / (plus_di + minus_di)).where(plus_di + minus_di > 0, 0.0)
+    out['ADX'], out['+DI'], out['-DI'] = dx.ewm(alpha=1 / 14, adjust=False).mean(), plus_di, minus_di
+
+    typical_price = (high + low + close) / 3
+    mean_dev = typical_price.rolling(20).apply(lambda x: np.abs(x - x.mean()).mean(), raw=True)
+    out['CCI'] = (typical_price - typical_price.rolling(20).mean()) / (0.015 * mean_dev)
+
+    money_flow = typical_price * volume
+    tp_change = typical_price.diff()
+    positive_flow = money_flow.where(tp_change > 0, 0.0).rolling(14).sum()
+    negative_flow = money_flow.where(tp_change < 0, 0.0).rolling(14).sum()
+    out['MFI'] = 100 - 100 / (1 + positive_flow / negative_flow)
+    out['OBV'] = (np.sign(close.diff()).fillna(0) * volume).cumsum()
+
+    tenkan = (high.rolling(9).max() + low.rolling(9).min()) / 2
+    kijun = (high.rolling(26).max() + low.rolling(26).min()) / 2
+    out['Ichimoku Tenkan'], out['Ichimoku Kijun'] = tenkan, kijun
+    out['Ichimoku Senkou A'] = ((tenkan + kijun) / 2).shift(26)
+    out['Ichimoku Senkou B'] = ((high.rolling(52).max() + low.rolling(52).min()) / 2).shift(26)
+
+    keltner_mid = close.ewm(span=20, adjust=False).mean()
+    keltner_atr = true_range.rolling(10).mean()
+    out['Keltner Upper'] = keltner_mid + 2 * keltner_atr
+    out['Keltner Middle'] = keltner_mid
+    out['Keltner Lower'] = keltner_mid - 2 * keltner_atr
+
+    out['Donchian Upper'] = high.rolling(20).max()
+    out['Donchian Lower'] = low.rolling(20).min()
+    out['Donchian Middle'] = (out['Donchian Upper'] + out['Donchian Lower']) / 2
+
+    out['PSAR'], out['PSAR Trend'] = naive_parabolic_sar(data)
+
+    return pd.DataFrame(out)[EXTENDED_COLUMNS]
+
+
+def loop_pivot_series(data, method='classic', anchor='1d'):
+    """Pivot series the slow way: look up the previous period and compute its levels bar by bar."""
+    periods = data.index.to_period({'1d': 'D', '1wk': 'W', '1mo': 'M'}[anchor])
+    unique = periods.unique()
+    positions = unique.get_indexer(periods)
+    prefix = PIVOT_METHODS[method][0]
+    rows = []
+    for position in positions:
+        if position == 0:
+            rows.append({})
+            continue
+        previous = data[periods == unique[position - 1]]
+        bar = pd.DataFrame({
+            'Open': [previous['Open'].iloc[0]], 'High': [previous['High'].max()],
+            'Low': [previous['Low'].min()], 'Close': [previous['Close'].iloc[-1]]
+        })
+        rows.append({f"{prefix} {level}": value for level, value in calculate_pivot_points(bar, method).items()})
+    return pd.DataFrame(rows, index=data.index)
+
+
+def loop_volume_profile(data, edges):
+    """Volume profile the slow way: intersect every bar with every bin."""
+    volumes = np.zeros(len(edges) - 1)
+    for low, high, volume in zip(data['Low'], data['High'], data['Volume']):
+        for i in range(len(volumes)):
+            overlap = min(high, edges[i + 1]) - max(low, edges[i])
+            if overlap > 0:
+                volumes[i] += volume * overlap / (high - low)
+    return volumes
+
+
+def naive_anchored_vwap(data, anchors):
+    """Anchored VWAPs the usual way: a separate pandas cumsum from every anchor."""
+    price_volume = (data['High'] + data['Low'] + data['Close']) / 3 * data['Volume']
+    return pd.DataFrame({
+        anchor: price_volume.loc[anchor:].cumsum() / data['Volume'].loc[anchor:].cumsum()
+        for anchor in anchors
+    }, index=data.index)
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    """Return (best wall time in seconds, result) over `repeat` runs."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def uncached(func, data, *args, **kwargs):
+    """Call an indicator on a fresh copy of `data` with an empty result cache."""
+    get_result_cache().clear()
+    return func(data.copy(), *args, **kwargs)
+
+
+def benchmark_support_resistance(lengths=(250, 1_000, 2_500, 5_000)):
+    """Compare the loop and vectorized support/resistance detectors."""
+    print("Support/Resistance (window=10)")
+    print(f"{'bars':>8} {'loop (s)':>10} {'vectorized (s)':>15} {'speed-up':>9}  identical")
+    for n_bars in lengths:
+        data = make_ohlcv(n_bars)
+        loop_time, expected = timed(loop_support_resistance, data, repeat=1)
+        fast_time, actual = timed(calculate_support_resistance, data)
+        print(f"{n_bars:>8} {loop_time:>10.3f} {fast_time:>15.5f} "
+              f"{loop_time / fast_time:>8.0f}x  {actual == expected}")
+
+
+def benchmark_candlestick_patterns(lengths=(250, 1_000, 2_500, 5_000)):
+    """Compare the loop pattern detector with the vectorized pattern engine."""
+    print("Candlestick patterns (loop: 3 patterns, engine: full library)")
+    print(f"{'bars':>8} {'loop (s)':>10} {'vectorized (s)':>15} {'speed-up':>9}  identical")
+    for n_bars in lengths:
+        data = make_ohlcv(n_bars)
+        loop_time, expected = timed(loop_candlestick_patterns, data, repeat=1)
+        fast_time, actual = timed(detect_candlestick_patterns, data)
+        same = all(actual[group] == expected[group] for group in expected)
+        print(f"{n_bars:>8} {loop_time:>10.3f} {fast_time:>15.5f} "
+              f"{loop_time / fast_time:>8.0f}x  {same}")
+
+
+def benchmark_streaming_indicators(n_bars=2_000, seed_bars=500, tolerance=1e-9):
+    """
+    Seed streaming indicators from a batch history, stream the remaining bars
+    and check every update against the batch result on the full history.
+    """
+    data = make_ohlcv(n_bars)
+    history = data.iloc[:seed_bars]
+    bars = data.iloc[seed_bars:][['Open', 'High', 'Low', 'Close']].to_dict('records')
+
+    cases = [
+        ('SMA', StreamingSMA.from_batch(history, 20), calculate_sma(data, 20)),
+        ('EMA', StreamingEMA.from_batch(history, 20), calculate_ema(data, 20)),
+        ('RSI', StreamingRSI.from_batch(history, 14), calculate_rsi(data, 14)),
+        ('MACD', StreamingMACD.from_batch(history), np.column_stack(calculate_macd(data))),
+        ('Bollinger', StreamingBollingerBands.from_batch(history),
+         np.column_stack(calculate_bollinger_bands(data))),
+        ('ATR', StreamingATR.from_batch(history, 14), calculate_atr(data, 14)),
+    ]
+
+    print(f"Streaming indicators ({len(bars)} bars streamed after a {seed_bars}-bar seed)")
+    print(f"{'indicator':>10} {'max abs error':>14} {'updates/s':>12}")
+    for name, indicator, expected in cases:
+        expected = np.asarray(expected, dtype=float)[seed_bars:]
+        start = time.perf_counter()
+        actual = np.array([indicator.update(bar) for bar in bars], dtype=float)
+        rate = len(bars) / (time.perf_counter() - start)
+        error = np.nanmax(np.abs(actual - expected))
+        status = "ok" if error < tolerance * np.nanmax(np.abs(expected)) else "MISMATCH"
+        print(f"{name:>10} {error:>14.2e} {rate:>12,.0f}  {status}")
+
+
+def check_tick_aggregator(n_ticks=20_000, intervals=('1m', '5m', '15m')):
+    """
+    Stream simulated ticks through the incremental bar aggregator, closing
+    due bars and sending a late tick for an already closed bar before every
+    tick, and check every interval against the batch resampler.
+
+    Returns:
+        bool: Whether the bars of every interval matched
+    """
+    feed = SimulatedQuoteFeed(['SYM'], ticks_per_second=5, seed=7)
+    _, timestamps, prices, sizes = feed.generate(n_ticks, start_time=1_700_000_000 * 10**9)
+    lateness = max(interval_nanoseconds(interval) for interval in intervals)
+    aggregator = TickBarAggregator(intervals=intervals, history=n_ticks)
+
+    start = time.perf_counter()
+    for i, (timestamp, price, size) in enumerate(zip(timestamps.tolist(), prices.tolist(), sizes.tolist())):
+        aggregator.close_due(timestamp)
+        if i:
+            aggregator.update('SYM', timestamp - lateness, 10 * price, size)
+        aggregator.update('SYM', timestamp, price, size)
+    rate = (2 * n_ticks - 1) / (time.perf_counter() - start)
+
+    print(f"Tick-to-bar aggregation ({n_ticks} ticks + {n_ticks - 1} late ticks, {rate:,.0f} ticks/s)")
+    print(f"{'interval':>8} {'bars':>6}  identical")
+    ok = True
+    for interval in intervals:
+        expected = ticks_to_bars(timestamps, prices, sizes, interval)
+        actual = aggregator.bars('SYM', interval)
+        same = actual.index.equals(expected.index) and np.array_equal(actual.to_numpy(), expected.to_numpy())
+        ok &= same
+        print(f"{interval:>8} {len(actual):>6}  {same}")
+    return ok
+
+
+def benchmark_panel_indicators(n_symbols=500, n_bars=2_500):
+    """Compare per-symbol indicator loops with one panel-wide pass."""
+    frames = {f"SYM{i}": make_ohlcv(n_bars, seed=i) for i in range(n_symbols)}
+    panels = {column: align_panel(frames, column) for column in ('High', 'Low', 'Close')}
+
+    print(f"Panel indicators ({n_symbols} symbols x {n_bars} bars)")
+    print(f"{'indicator':>10} {'loop (s)':>10} {'panel (s)':>10} {'speed-up':>9}")
+    cases = [
+        ('RSI', lambda data: calculate_rsi(data), lambda: panel_rsi(panels['Close'])),
+        ('MACD', lambda data: calculate_macd(data), lambda: panel_macd(panels['Close'])),
+        ('ATR', lambda data: calculate_atr(data),
+         lambda: panel_atr(panels['High'], panels['Low'], panels['Close'])),
+    ]
+    for name, single, panel in cases:
+        # Copies keep the per-frame indicator memo from short-circuiting the loop
+        loop_time, _ = timed(lambda: [single(data.copy()) for data in frames.values()], repeat=1)
+        panel_time, _ = timed(panel)
+        print(f"{name:>10} {loop_time:>10.3f} {panel_time:>10.3f} {loop_time / panel_time:>8.0f}x")
+
+
+def benchmark_extended_pack(lengths=(1_000, 5_000)):
+    """Compare the extended indicator nodes with naive per-indicator pandas code."""
+    print(f"Extended indicator pack ({len(EXTENDED_COLUMNS)} outputs)")
+    print(f"{'bars':>8} {'naive (s)':>10} {'engine (s)':>10} {'speed-up':>9}  identical")
+    for n_bars in lengths:
+        data = make_ohlcv(n_bars)
+        naive_time, expected = timed(naive_extended_indicators, data, repeat=1)
+        fused_time, actual = timed(uncached, calculate_extended_indicators, data)
+        same = np.allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-7, atol=1e-8, equal_nan=True)
+        print(f"{n_bars:>8} {naive_time:>10.3f} {fused_time:>10.4f} {naive_time / fused_time:>8.0f}x  {same}")
+
+
+def benchmark_pivot_series(n_bars=1_000, anchors=('1d', '1wk', '1mo')):
+    """Compare per-bar pivot lookups with the vectorized pivot series (all methods)."""
+    data = make_ohlcv(n_bars)
+    print(f"Pivot series ({n_bars} bars, {len(PIVOT_METHODS)} methods)")
+    print(f"{'anchor':>8} {'loop (s)':>10} {'vectorized (s)':>15} {'speed-up':>9}  identical")
+    for anchor in anchors:
+        loop_time, expected = timed(
+            lambda: pd.concat([loop_pivot_series(data, method, anchor) for method in PIVOT_METHODS], axis=1),
+            repeat=1
+        )
+        fast_time, actual = timed(uncached, calculate_pivot_series, data, anchor=anchor)
+        same = np.allclose(actual[expected.columns].to_numpy(), expected.to_numpy(), rtol=1e-12, equal_nan=True)
+        print(f"{anchor:>8} {loop_time:>10.3f} {fast_time:>15.4f} {loop_time / fast_time:>8.0f}x  {same}")
+
+
+def benchmark_sr_zones(n_symbols=200, n_bars=2_500):
+    """Time zone clustering per symbol and for a whole watchlist, and compare line counts."""
+    frames = {f"SYM{i:03d}": make_ohlcv(n_bars, seed=i) for i in range(n_symbols)}
+    data = frames['SYM000']
+    support, resistance = calculate_support_resistance(data)
+    single_time, zones = timed(calculate_sr_zones, data)
+    watchlist_time, table = timed(find_watchlist_zones, frames)
+    print(f"Support/resistance zones ({n_bars} bars)")
+    print(f"  one symbol: {len(support) + len(resistance)} swing levels -> {len(zones)} zones in {single_time:.4f}s")
+    print(f"  watchlist: {n_symbols} symbols -> {len(table)} zones in {watchlist_time:.3f}s")
+
+
+def benchmark_volume_profile(lengths=(1_000, 10_000), bins=50):
+    """Compare a per-bar, per-bin volume profile loop with the prefix-sum binning."""
+    print(f"Volume profile ({bins} bins)")
+    print(f"{'bars':>8} {'loop (s)':>10} {'vectorized (s)':>15} {'speed-up':>9}  identical")
+    for n_bars in lengths:
+        data = make_ohlcv(n_bars)
+        edges = price_edges(data['Low'], data['High'], bins)
+        loop_time, expected = timed(loop_volume_profile, data, edges, repeat=1)
+        fast_time, actual = timed(distribute_volume, data['Low'], data['High'], data['Volume'], edges)
+        same = np.allclose(actual, expected, rtol=1e-8)
+        print(f"{n_bars:>8} {loop_time:>10.3f} {fast_time:>15.5f} {loop_time / fast_time:>8.0f}x  {same}")
+
+
+def benchmark_anchored_vwap(n_bars=100_000, anchor_counts=(5, 50)):
+    """Compare per-anchor pandas cumsums with the shared running totals."""
+    data = make_ohlcv(n_bars)
+    print(f"Anchored VWAP ({n_bars} bars)")
+    print(f"{'anchors':>8} {'naive (s)':>10} {'shared (s)':>11} {'speed-up':>9}  identical")
+    for count in anchor_counts:
+        anchors = data.index[::n_bars // count][:count]
+        naive_time, expected = timed(naive_anchored_vwap, data, anchors, repeat=1)
+        shared_time, actual = timed(uncached, calculate_anchored_vwap, data, anchors)
+        same = np.allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+        print(f"{count:>8} {naive_time:>10.3f} {shared_time:>11.4f} {naive_time / shared_time:>8.0f}x  {same}")
+
+
+def check_kernel_backends(n_bars=5_000):
+    """
+    Check every kernel backend against pandas references and time them.
+
+    Returns:
+        bool: Whether every available backend matched every reference
+    """
+    data = make_ohlcv(n_bars)
+    prev_close = data['Close'].shift(1)
+    true_range = pd.concat(
+        [data['High'] - data['Low'], (data['High'] - prev_close).abs(), (data['Low'] - prev_close).abs()], axis=1
+    ).max(axis=1)
+    references = {
+        'Wilder RSI': lambda: naive_wilder_rsi(data),
+        'Wilder ATR': lambda: naive_wilder(true_range, 14),
+        'Parabolic SAR': lambda: naive_parabolic_sar(data)[0],
+        'SuperTrend': lambda: naive_supertrend(data)[0],
+    }
+    kernels_under_test = {
+        'Wilder RSI': lambda frame: calculate_rsi(frame, smoothing='wilder'),
+        'Wilder ATR': lambda frame: calculate_atr(frame, smoothing='wilder'),
+        'Parabolic SAR': lambda frame: calculate_parabolic_sar(frame)[0],
+        'SuperTrend': lambda frame: calculate_supertrend(frame)[0],
+    }
+
+    backends = kernels.available_backends()
+    ok = True
+    print(f"Recursive kernels ({n_bars} bars, backends: {', '.join(backends)})")
+    print(f"{'kernel':>14} {'pandas (s)':>11} " + " ".join(f"{name + ' (s)':>11}" for name in backends) + "  identical")
+    for name, reference in references.items():
+        ref_time, expected = timed(reference, repeat=1)
+        times, same = [], True
+        for backend in backends:
+            with kernels.use_backend(backend):
+                # Warm-up call compiles the numba kernels
+                uncached(kernels_under_test[name], data)
+                backend_time, actual = timed(uncached, kernels_under_test[name], data)
+            times.append(backend_time)
+            same &= np.allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9, equal_nan=True)
+        ok &= same
+        print(f"{name:>14} {ref_time:>11.3f} " + " ".join(f"{t:>11.4f}" for t in times) + f"  {same}")
+    if 'numba' not in backends:
+        print("numba is not installed: only the numpy backend was checked")
+    return ok
+
+
+def _loop_body(name, loop):
+    """Pure-Python body of a numba kernel: `.py_func` when compiled, the loop itself otherwise."""
+    compiled = getattr(kernels, '_compiled', {}).get(name)
+    return compiled.py_func if compiled is not None else loop
+
+
+def check_kernel_loops(n_bars=5_000):
+    """
+    Check the scalar loop bodies compiled by numba against the numpy backend.
+
+    The loops are run uncompiled on the float arrays numba would receive, so
+    their logic is compared with the numpy path even without numba installed.
+
+    Returns:
+        bool: Whether every loop matched the numpy backend
+    """
+    data = make_ohlcv(n_bars)
+    high, low, close = (data[col].to_numpy(dtype=float) for col in ('High', 'Low', 'Close'))
+    atr = calculate_atr(data).to_numpy(dtype=float)
+    x = np.arange(n_bars, dtype=float)
+    cases = {
+        'exponential': (kernels._exponential_loop, (close, 1 / 14), kernels.exponential_smooth),
+        'wilder': (kernels._wilder_loop, (np.abs(np.diff(close)), 14), kernels.wilder_smooth),
+        'parabolic_sar': (kernels._parabolic_sar_loop, (high, low, 0.02, 0.2), kernels.parabolic_sar),
+        'supertrend': (kernels._supertrend_loop, (high, low, close, atr, 3.0), kernels.supertrend),
+        'lttb': (kernels._lttb_loop, (x, close, 500), kernels.lttb),
+    }
+
+    ok = True
+    print(f"Numba loop bodies vs numpy backend ({n_bars} bars)")
+    for name, (loop, args, public) in cases.items():
+        with kernels.use_backend('numpy'):
+            expected = public(*args)
+        actual = _loop_body(name, loop)(*args)
+        if not isinstance(expected, tuple):
+            expected, actual = (expected,), (actual,)
+        same = all(
+            np.allclose(np.asarray(a, dtype=float), np.asarray(e, dtype=float), rtol=1e-9, atol=1e-9, equal_nan=True)
+            for a, e in zip(actual, expected)
+        )
+        ok &= same
+        print(f"{name:>14}  {same}")
+    return ok
+
+
+if __name__ == "__main__":
+    benchmark_support_resistance()
+    print()
+    benchmark_candlestick_patterns()
+    print()
+    benchmark_streaming_indicators()
+    print()
+    aggregator_ok = check_tick_aggregator()
+    print()
+    benchmark_panel_indicators()
+    print()
+    benchmark_extended_pack()
+    print()
+    benchmark_pivot_series()
+    print()
+    benchmark_sr_zones()
+    print()
+    benchmark_volume_profile()
+    print()
+    benchmark_anchored_vwap()
+    print()
+    kernels_ok = check_kernel_backends()
+    print()
+    loops_ok = check_kernel_loops()
+    if not (aggregator_ok and kernels_ok and loops_ok):
+        sys.exit(1)
@@ -1,16 +1,15 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-from utils.data_fetcher import get_stock_data
-from utils.chart_helpers import (
-    create_candlestick_chart, 
-    add_range_selector, 
-    add_pivot_points,
-    add_annotations
-)
+from datetime import datetime
+from utils.data_fetcher import get_stock_data, get_interval_data
+from utils.resampling import INTERVAL_LABELS
+from utils.chart_helpers import create_price_chart
 from utils.technical_indicators import detect_candlestick_patterns
-from utils.ui_helpers import page_header, premium_css
+from utils.candlestick_patterns import PATTERNS
+from utils.data_quality import summarize_quality_report
+from utils.time_ranges import RANGE_PRESETS, select_range
+from utils.chart_decimation import visible_slice
+from utils.ui_helpers import page_header, premium_css, render_mode_selector, visible_range_slider
 
 st.set_page_config(
     page_title="Chart Analysis - StockSense",
@@ -30,10 +29,17 @@ if 'stock_data' not in st.session_state or st.session_state.stock_data is None:
 stock_data = st.session_state.stock_data
 stock_symbol = st.session_state.selected_stock
 
+# Show what the ingest-time data quality pipeline repaired, if anything
+quality_notes = summarize_quality_report(stock_data.attrs.get('quality_report'))
+if quality_notes:
+    with st.expander("🧹 Data quality adjustments"):
+        for note in quality_notes:
+            st.write(f"• {note}")
+
 st.markdown("")
 
 # Chart controls in a nice layout
-col1, col2 = st.columns(2)
+col1, col2, col3 = st.columns(3)
 
 with col1:
     chart_type = st.selectbox(
@@ -43,162 +49,80 @@ with col1:
     )
 
 with col2:
+    interval = st.selectbox(
+        "Interval",
+        list(INTERVAL_LABELS.keys()),
+        format_func=lambda key: INTERVAL_LABELS[key],
+        help="Bar size; coarser bars are resampled locally from finer stored bars"
+    )
+
+with col3:
     time_range = st.selectbox(
         "Time Range",
-        ["All Data", "1 Month", "3 Months", "6 Months", "1 Year"],
+        list(RANGE_PRESETS),
         help="Filter the chart data by time period"
     )
 
-# Filter data based on selected time range
-end_date = stock_data.index[-1]
-if time_range == "1 Month":
-    start_date = end_date - timedelta(days=30)
-    filtered_data = stock_data[stock_data.index >= start_date]
-elif time_range == "3 Months":
-    start_date = end_date - timedelta(days=90)
-    filtered_data = stock_data[stock_data.index >= start_date]
-elif time_range == "6 Months":
-    start_date = end_date - timedelta(days=180)
-    filtered_data = stock_data[stock_data.index >= start_date]
-elif time_range == "1 Year":
-    start_date = end_date - timedelta(days=365)
-    filtered_data = stock_data[stock_data.index >= start_date]
-else:
-    filtered_data = stock_data.copy()
+render_mode = render_mode_selector()
+
+# Load bars for the selected interval
+if interval != "1d":
+    try:
+        stock_data = get_interval_data(stock_symbol, interval, daily_data=stock_data)
+    except Exception as e:
+        st.error(f"Could not load {INTERVAL_LABELS[interval]} bars: {str(e)}")
+        st.stop()
+
+# Filter data based on selected time range, then to the zoomed-in part of it
+filtered_data = select_range(stock_data, time_range)
+x_range = visible_range_slider(filtered_data, key="chart_analysis_visible_range")
+filtered_data = filtered_data.iloc[visible_slice(filtered_data.index, x_range)]
 
 # Additional chart features
 st.markdown("### ⚙️ Chart Features")
-col_feat1, col_feat2, col_feat3 = st.columns(3)
+col_feat1, col_feat2, col_feat3, col_feat4 = st.columns(4)
 with col_feat1:
     show_volume = st.checkbox("📊 Show Volume", value=True)
 with col_feat2:
     show_pivot_points = st.checkbox("📍 Pivot Points")
 with col_feat3:
     detect_patterns = st.checkbox("🔍 Detect Patterns")
+with col_feat4:
+    show_volume_profile = st.checkbox("📶 Volume Profile", help="Volume traded at each price, with value area and point of control")
 
-st.markdown("---")
-
-# Create chart with better styling
-if chart_type == "Candlestick":
-    fig = create_candlestick_chart(
-        filtered_data, 
-        title=f"{stock_symbol} - Candlestick Chart",
-        show_volume=show_volume
-    )
-    fig.update_layout(
-        template="plotly_dark",
-        paper_bgcolor='rgba(26, 31, 46, 1)',
-        plot_bgcolor='rgba(26, 31, 46, 1)',
-        font=dict(color='#E5E7EB'),
-        height=700
-    )
-elif chart_type == "OHLC":
-    fig = go.Figure(
-        data=[
-            go.Ohlc(
-                x=filtered_data.index,
-                open=filtered_data['Open'],
-                high=filtered_data['High'],
-                low=filtered_data['Low'],
-                close=filtered_data['Close'],
-                increasing_line_color='#10B981',
-                decreasing_line_color='#EF4444',
-                name="Price"
-            )
-        ]
-    )
-    fig.update_layout(
-        title=f"{stock_symbol} - OHLC Chart",
-        xaxis_rangeslider_visible=False,
-        template="plotly_dark",
-        paper_bgcolor='rgba(26, 31, 46, 1)',
-        plot_bgcolor='rgba(26, 31, 46, 1)',
-        font=dict(color='#E5E7EB'),
-        height=700
-    )
-else:  # Line chart
-    fig = go.Figure()
-    fig.add_trace(
-        go.Scatter(
-            x=filtered_data.index,
-            y=filtered_data['Close'],
-            mode='lines',
-            name="Close Price"
-        )
-    )
-    
-    fig.update_layout(
-        title=f"{stock_symbol} - Price Chart",
-        xaxis_title="Date",
-        yaxis_title="Price",
-        template="plotly_white",
-        height=700
+if detect_patterns:
+    pattern_groups = list(dict.fromkeys(p.group for p in PATTERNS.values()))
+    selected_groups = st.multiselect(
+        "Pattern Families",
+        pattern_groups,
+        default=['doji', 'hammer', 'engulfing'],
+        format_func=lambda group: group.replace('_', ' ').title()
     )
-    
-    # Add volume if requested
-    if show_volume:
-        fig = make_subplots(
-            rows=2, 
-            cols=1, 
-            shared_xaxes=True,
-            vertical_spacing=0.1,
-            row_heights=[0.8, 0.2]
-        )
-        
-        # Add price line
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_data.index,
-                y=filtered_data['Close'],
-                mode='lines',
-                name="Close Price"
-            ),
-            row=1, col=1
-        )
-        
-        # Add volume bars
-        colors = ['green' if row['Close'] >= row['Open'] else 'red' for _, row in filtered_data.iterrows()]
-        
-        fig.add_trace(
-            go.Bar(
-                x=filtered_data.index,
-                y=filtered_data['Volume'],
-                marker_color=colors,
-                name="Volume"
-            ),
-            row=2, col=1
-        )
-        
-        fig.update_layout(
-            title=f"{stock_symbol} - Price Chart",
-            template="plotly_white",
-            height=700,
-            xaxis_rangeslider_visible=False
-        )
-        
-        fig.update_yaxes(title_text="Price", row=1, col=1)
-        fig.update_yaxes(title_text="Volume", row=2, col=1)
 
-# Add range selector
-fig = add_range_selector(fig)
-
-# Add pivot points if requested
-if show_pivot_points:
-    fig = add_pivot_points(fig, filtered_data)
+st.markdown("---")
 
-# Detect and display candlestick patterns if requested
+# Detect candlestick patterns if requested
+patterns = {}
+annotations = []
 if detect_patterns:
     patterns = detect_candlestick_patterns(filtered_data)
+    patterns = {group: found for group, found in patterns.items() if group in selected_groups}
     
     # Collect all patterns for annotation
-    annotations = []
     for pattern_type, pattern_list in patterns.items():
         for date, label in pattern_list:
             annotations.append((date, label))
-    
-    # Add annotations to chart
-    if annotations:
-        fig = add_annotations(fig, filtered_data, annotations)
+
+fig = create_price_chart(
+    filtered_data,
+    stock_symbol,
+    chart_type,
+    show_volume,
+    show_pivot_points,
+    show_volume_profile,
+    annotations,
+    render_mode
+)
 
 # Display the chart
 st.plotly_chart(fig, use_container_width=True)
@@ -211,7 +135,7 @@ if detect_patterns:
     for pattern_name, pattern_list in patterns.items():
         if pattern_list:
             has_patterns = True
-            st.write(f"**{pattern_name.capitalize()} Patterns:**")
+            st.write(f"**{pattern_name.replace('_', ' ').title()} Patterns:**")
             
             pattern_data = []
             for date, label in pattern_list:
@@ -2,17 +2,23 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime
 from utils.technical_indicators import (
-    calculate_sma,
     calculate_ema,
     calculate_rsi,
     calculate_bollinger_bands,
     calculate_macd,
     calculate_support_resistance,
+    calculate_sr_zones,
+    find_divergences,
     plot_with_indicators
 )
-from utils.ui_helpers import page_header, premium_css
+from utils.data_fetcher import get_interval_data
+from utils.indicator_engine import get_engine
+from utils.signal_events import crosses_above, crosses_below, event_table
+from utils.resampling import INTERVAL_LABELS
+from utils.time_ranges import RANGE_PRESETS, select_range
+from utils.ui_helpers import page_header, premium_css, render_mode_selector, visible_range_slider
 
 st.set_page_config(
     page_title="Technical Indicators - StockSense",
@@ -35,28 +41,31 @@ stock_symbol = st.session_state.selected_stock
 # Sidebar controls
 st.sidebar.header("Indicator Settings")
 
+# Interval selection
+interval = st.sidebar.selectbox(
+    "Interval",
+    list(INTERVAL_LABELS.keys()),
+    format_func=lambda key: INTERVAL_LABELS[key]
+)
+
 # Time range selection
 time_range = st.sidebar.selectbox(
     "Time Range",
-    ["All Data", "1 Month", "3 Months", "6 Months", "1 Year"]
+    list(RANGE_PRESETS)
 )
 
+render_mode = render_mode_selector()
+
+# Load bars for the selected interval
+if interval != "1d":
+    try:
+        stock_data = get_interval_data(stock_symbol, interval, daily_data=stock_data)
+    except Exception as e:
+        st.error(f"Could not load {INTERVAL_LABELS[interval]} bars: {str(e)}")
+        st.stop()
+
 # Filter data based on selected time range
-end_date = stock_data.index[-1]
-if time_range == "1 Month":
-    start_date = end_date - timedelta(days=30)
-    filtered_data = stock_data[stock_data.index >= start_date]
-elif time_range == "3 Months":
-    start_date = end_date - timedelta(days=90)
-    filtered_data = stock_data[stock_data.index >= start_date]
-elif time_range == "6 Months":
-    start_date = end_date - timedelta(days=180)
-    filtered_data = stock_data[stock_data.index >= start_date]
-elif time_range == "1 Year":
-    start_date = end_date - timedelta(days=365)
-    filtered_data = stock_data[stock_data.index >= start_date]
-else:
-    filtered_data = stock_data.copy()
+filtered_data = select_range(stock_data, time_range)
 
 # Indicator selection
 st.sidebar.subheader("Select Indicators")
@@ -65,6 +74,19 @@ show_bollinger = st.sidebar.checkbox("Bollinger Bands")
 show_rsi = st.sidebar.checkbox("Relative Strength Index (RSI)")
 show_macd = st.sidebar.checkbox("MACD")
 show_support_resistance = st.sidebar.checkbox("Support & Resistance")
+show_vwap = st.sidebar.checkbox("VWAP", help="Session VWAP with ±2σ bands (daily sessions for intraday bars, monthly otherwise)")
+show_anchored_vwap = st.sidebar.checkbox("Anchored VWAP")
+
+vwap_anchors = 'swings'
+if show_anchored_vwap:
+    anchor_mode = st.sidebar.radio("VWAP Anchor", ["Recent swing points", "Custom date"])
+    if anchor_mode == "Custom date":
+        vwap_anchors = [st.sidebar.date_input(
+            "Anchor date",
+            value=filtered_data.index[len(filtered_data) // 2].date(),
+            min_value=filtered_data.index[0].date(),
+            max_value=filtered_data.index[-1].date()
+        )]
 
 # Create list of selected indicators
 selected_indicators = []
@@ -78,10 +100,17 @@ if show_macd:
     selected_indicators.append("MACD")
 if show_support_resistance:
     selected_indicators.append("Support/Resistance")
+if show_vwap:
+    selected_indicators.append("VWAP")
+if show_anchored_vwap:
+    selected_indicators.append("Anchored VWAP")
 
 # Display chart with selected indicators
 if selected_indicators:
-    fig = plot_with_indicators(filtered_data, selected_indicators)
+    # Indicators are computed over the whole time range and drawn for the visible part
+    x_range = visible_range_slider(filtered_data, key="technical_indicators_visible_range")
+    fig = plot_with_indicators(filtered_data, selected_indicators, x_range=x_range, render_mode=render_mode,
+                               vwap_anchors=vwap_anchors)
     st.plotly_chart(fig, use_container_width=True)
 else:
     st.info("Please select at least one technical indicator from the sidebar.")
@@ -101,10 +130,9 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 with tab1:
     st.markdown("### Moving Averages Analysis")
     
-    # Calculate different SMAs
-    sma_20 = calculate_sma(filtered_data, window=20)
-    sma_50 = calculate_sma(filtered_data, window=50)
-    sma_200 = calculate_sma(filtered_data, window=200)
+    # Calculate different SMAs in one engine call (shared with the chart above)
+    smas = get_engine(filtered_data).compute([('sma', {'window': window}) for window in (20, 50, 200)])
+    sma_20, sma_50, sma_200 = smas.values()
     
     # Current price relative to SMAs
     current_price = filtered_data['Close'].iloc[-1]
@@ -141,23 +169,23 @@ with tab1:
     
     if len(sma_20) > 0 and len(sma_50) > 0:
         # Check for recent crossovers
-        crossovers = []
-        for i in range(1, len(sma_20)):
-            if sma_20.iloc[i-1] < sma_50.iloc[i-1] and sma_20.iloc[i] >= sma_50.iloc[i]:
-                crossovers.append(("Golden Cross", sma_20.index[i], "Bullish signal where 20-day SMA crosses above 50-day SMA"))
-            elif sma_20.iloc[i-1] > sma_50.iloc[i-1] and sma_20.iloc[i] <= sma_50.iloc[i]:
-                crossovers.append(("Death Cross", sma_20.index[i], "Bearish signal where 20-day SMA crosses below 50-day SMA"))
-        
-        if crossovers:
-            crossover_data = []
-            for signal, date, desc in crossovers:
-                crossover_data.append({
-                    "Signal": signal,
-                    "Date": date.strftime('%Y-%m-%d'),
-                    "Description": desc
-                })
+        crossovers = event_table({
+            "Golden Cross": crosses_above(sma_20, sma_50),
+            "Death Cross": crosses_below(sma_20, sma_50)
+        })
+        
+        if not crossovers.empty:
+            descriptions = {
+                "Golden Cross": "Bullish signal where 20-day SMA crosses above 50-day SMA",
+                "Death Cross": "Bearish signal where 20-day SMA crosses below 50-day SMA"
+            }
+            crossover_data = pd.DataFrame({
+                "Signal": crossovers['Event'],
+                "Date": crossovers['Date'].dt.strftime('%Y-%m-%d'),
+                "Description": crossovers['Event'].map(descriptions)
+            })
             
-            st.table(pd.DataFrame(crossover_data))
+            st.table(crossover_data)
         else:
             st.info("No SMA crossovers detected in the selected time range.")
     else:
@@ -266,60 +294,24 @@ with tab3:
         # RSI divergence analysis
         st.markdown("#### RSI Divergence Analysis")
         
-        # Check for bullish and bearish divergences
-        price_lows = []
-        rsi_lows = []
-        price_highs = []
-        rsi_highs = []
-        
-        # Find local minima and maxima
-        for i in range(5, len(rsi) - 5):
-            # Check for price local minimum
-            if all(filtered_data['Low'].iloc[i] <= filtered_data['Low'].iloc[i-j] for j in range(1, 6)) and \
-               all(filtered_data['Low'].iloc[i] <= filtered_data['Low'].iloc[i+j] for j in range(1, 6)):
-                price_lows.append((filtered_data.index[i], filtered_data['Low'].iloc[i], rsi.iloc[i]))
-            
-            # Check for RSI local minimum
-            if all(rsi.iloc[i] <= rsi.iloc[i-j] for j in range(1, 6)) and \
-               all(rsi.iloc[i] <= rsi.iloc[i+j] for j in range(1, 6)):
-                rsi_lows.append((filtered_data.index[i], filtered_data['Low'].iloc[i], rsi.iloc[i]))
-            
-            # Check for price local maximum
-            if all(filtered_data['High'].iloc[i] >= filtered_data['High'].iloc[i-j] for j in range(1, 6)) and \
-               all(filtered_data['High'].iloc[i] >= filtered_data['High'].iloc[i+j] for j in range(1, 6)):
-                price_highs.append((filtered_data.index[i], filtered_data['High'].iloc[i], rsi.iloc[i]))
-            
-            # Check for RSI local maximum
-            if all(rsi.iloc[i] >= rsi.iloc[i-j] for j in range(1, 6)) and \
-               all(rsi.iloc[i] >= rsi.iloc[i+j] for j in range(1, 6)):
-                rsi_highs.append((filtered_data.index[i], filtered_data['High'].iloc[i], rsi.iloc[i]))
-        
-        # Check for bullish divergence (price makes lower low, RSI makes higher low)
-        bullish_divergences = []
-        if len(price_lows) >= 2 and len(rsi_lows) >= 2:
-            for i in range(len(price_lows) - 1):
-                if price_lows[i][1] > price_lows[i+1][1] and price_lows[i][2] < price_lows[i+1][2]:
-                    bullish_divergences.append((price_lows[i+1][0], "Bullish Divergence"))
-        
-        # Check for bearish divergence (price makes higher high, RSI makes lower high)
-        bearish_divergences = []
-        if len(price_highs) >= 2 and len(rsi_highs) >= 2:
-            for i in range(len(price_highs) - 1):
-                if price_highs[i][1] < price_highs[i+1][1] and price_highs[i][2] > price_highs[i+1][2]:
-                    bearish_divergences.append((price_highs[i+1][0], "Bearish Divergence"))
+        # Swing points and divergences are matched as arrays
+        divergences = find_divergences(filtered_data, rsi, window=5)
         
         # Display divergences
-        if bullish_divergences or bearish_divergences:
-            divergence_data = []
-            
-            for date, div_type in bullish_divergences + bearish_divergences:
-                divergence_data.append({
-                    "Date": date.strftime('%Y-%m-%d'),
-                    "Type": div_type,
-                    "Signal": "Potential bullish reversal" if div_type == "Bullish Divergence" else "Potential bearish reversal"
-                })
+        if not divergences.empty:
+            signals = {
+                "Bullish Divergence": "Potential bullish reversal",
+                "Bearish Divergence": "Potential bearish reversal",
+                "Hidden Bullish Divergence": "Potential bullish continuation",
+                "Hidden Bearish Divergence": "Potential bearish continuation"
+            }
+            divergence_data = pd.DataFrame({
+                "Date": divergences['Date'].dt.strftime('%Y-%m-%d'),
+                "Type": divergences['Type'],
+                "Signal": divergences['Type'].map(signals)
+            })
             
-            st.table(pd.DataFrame(divergence_data))
+            st.table(divergence_data)
         else:
             st.info("No clear RSI divergences detected in the selected time range.")
     else:
@@ -353,12 +345,10 @@ with tab4:
                 description = "MACD is below signal line but above zero line, indicating weakening momentum but still positive."
         
         # Check for recent crossovers
-        crossovers = []
-        for i in range(1, len(macd_line)):
-            if macd_line.iloc[i-1] < signal_line.iloc[i-1] and macd_line.iloc[i] >= signal_line.iloc[i]:
-                crossovers.append((macd_line.index[i], "Bullish Crossover"))
-            elif macd_line.iloc[i-1] > signal_line.iloc[i-1] and macd_line.iloc[i] <= signal_line.iloc[i]:
-                crossovers.append((macd_line.index[i], "Bearish Crossover"))
+        crossovers = event_table({
+            "Bullish Crossover": crosses_above(macd_line, signal_line),
+            "Bearish Crossover": crosses_below(macd_line, signal_line)
+        })
         
         # Create metrics
         col1, col2 = st.columns(2)
@@ -390,17 +380,14 @@ with tab4:
         # Display recent crossovers
         st.markdown("#### Recent MACD Crossovers")
         
-        if crossovers:
-            crossover_data = []
+        if not crossovers.empty:
+            crossover_data = pd.DataFrame({
+                "Date": crossovers['Date'].dt.strftime('%Y-%m-%d'),
+                "Type": crossovers['Event'],
+                "Signal": np.where(crossovers['Event'] == "Bullish Crossover", "Buy signal", "Sell signal")
+            })
             
-            for date, cross_type in crossovers:
-                crossover_data.append({
-                    "Date": date.strftime('%Y-%m-%d'),
-                    "Type": cross_type,
-                    "Signal": "Buy signal" if cross_type == "Bullish Crossover" else "Sell signal"
-                })
-            
-            st.table(pd.DataFrame(crossover_data).tail(5))
+            st.table(crossover_data.tail(5))
         else:
             st.info("No MACD crossovers detected in the selected time range.")
     else:
@@ -476,6 +463,22 @@ with tab5:
             else:
                 st.info("No resistance levels detected.")
         
+        # Nearby levels clustered into ranked zones
+        st.markdown("#### Support & Resistance Zones")
+        zones = calculate_sr_zones(filtered_data)
+        if not zones.empty:
+            zone_table = pd.DataFrame({
+                "Zone": [f"${low:.2f} - ${high:.2f}" for low, high in zip(zones['Low'], zones['High'])],
+                "Type": zones['Type'],
+                "Touches": zones['Touches'],
+                "Strength": zones['Strength'].round(1),
+                "Distance": [f"{((price / current_price) - 1) * 100:.2f}%" for price in zones['Price']],
+                "Last Touch": zones['Last Touch'].dt.strftime('%Y-%m-%d')
+            })
+            st.table(zone_table)
+        else:
+            st.info("No zones detected.")
+        
         # Display analysis insights
         st.markdown("#### Price Position Analysis")
         
@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime
 from utils.prediction_models import (
     linear_regression_prediction,
     quadratic_regression_prediction,
@@ -20,7 +20,8 @@ from utils.market_regime import (
     plot_market_regime,
     get_preferred_models_for_regime
 )
-from utils.ui_helpers import page_header, premium_css
+from utils.time_ranges import select_range
+from utils.ui_helpers import page_header, premium_css, render_mode_selector
 
 # Set page configuration
 st.set_page_config(
@@ -44,6 +45,8 @@ if 'stock_data' not in st.session_state or st.session_state.stock_data is None:
 stock_data = st.session_state.stock_data
 stock_symbol = st.session_state.selected_stock
 
+render_mode = render_mode_selector()
+
 # Detect market regime
 try:
     regime_info = detect_market_regime(stock_data)
@@ -98,7 +101,7 @@ with st.expander("Market Regime Details", expanded=False):
     st.markdown(get_regime_description(current_regime))
     
     # Display regime plot
-    regime_plot = plot_market_regime(stock_data, regime_info)
+    regime_plot = plot_market_regime(stock_data, regime_info, render_mode=render_mode)
     st.plotly_chart(regime_plot, use_container_width=True)
     
     st.markdown(f"""
@@ -156,18 +159,7 @@ use_regime_aware = st.sidebar.checkbox(
 )
 
 # Filter data based on selected training period
-end_date = stock_data.index[-1]
-if training_period == "1 Year":
-    start_date = end_date - timedelta(days=365)
-    training_data = stock_data[stock_data.index >= start_date]
-elif training_period == "6 Months":
-    start_date = end_date - timedelta(days=180)
-    training_data = stock_data[stock_data.index >= start_date]
-elif training_period == "3 Months":
-    start_date = end_date - timedelta(days=90)
-    training_data = stock_data[stock_data.index >= start_date]
-else:
-    training_data = stock_data.copy()
+training_data = select_range(stock_data, training_period)
 
 # Calculate predictions based on selected models
 predictions = {}
@@ -263,7 +255,8 @@ if predictions:
             training_data, 
             predictions[selected_model], 
             confidence[selected_model],
-            prediction_days
+            prediction_days,
+            render_mode=render_mode
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -441,7 +434,7 @@ if predictions:
             # Display ensemble weights if available
             if show_ensemble and 'model_weights' in locals():
                 st.subheader("Ensemble Model Weights")
-                weights_fig = plot_ensemble_weights(model_weights, prediction_days)
+                weights_fig = plot_ensemble_weights(model_weights, prediction_days, render_mode=render_mode)
                 st.plotly_chart(weights_fig, use_container_width=True)
                 
                 if use_regime_aware:
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import re
+import uuid
 from datetime import datetime
 from utils.price_alerts import (
     validate_phone_number,
@@ -8,8 +9,11 @@ from utils.price_alerts import (
     remove_price_alert,
     display_alerts,
     check_price_alerts,
+    check_price_alerts_live,
     send_alert_notification
 )
+from utils.streaming import get_stream_service
+from utils.bar_aggregator import get_bar_aggregator
 from utils.ui_helpers import page_header, premium_css
 
 st.set_page_config(
@@ -122,6 +126,66 @@ if 'active_alerts' in st.session_state and st.session_state.active_alerts:
         else:
             st.info("No alerts triggered at current price levels.")
 
+# Live monitoring from the streaming quote feed
+st.subheader("Live Monitoring")
+
+stream_service = get_stream_service()
+bar_aggregator = get_bar_aggregator()
+
+# The stream is shared by all sessions; each session holds it for its own symbols
+stream_holder = st.session_state.setdefault('stream_holder', uuid.uuid4().hex)
+live_enabled = st.toggle(
+    "Stream live quotes",
+    key="stream_live_quotes",
+    help="Uses the Finnhub websocket feed when configured, otherwise a local simulator "
+         "whose prices are never checked against your alerts"
+)
+
+if live_enabled:
+    alert_symbols = {alert.stock_symbol for alert in st.session_state.get('active_alerts', [])}
+    alert_symbols.add(stock_symbol)
+    try:
+        stream_service.acquire(stream_holder, sorted(alert_symbols), start_prices={stock_symbol: current_price})
+    except RuntimeError as e:
+        st.warning(f"Could not restart the quote stream: {e}. Try again in a few seconds.")
+else:
+    stream_service.release(stream_holder)
+
+@st.fragment(run_every=2)
+def live_alert_panel():
+    """Refresh the streamed price and evaluate alerts every two seconds."""
+    if not stream_service.is_running():
+        st.caption("Live streaming is off.")
+        return
+    
+    simulated = stream_service.is_simulated()
+    if simulated:
+        st.warning("Finnhub is not configured, so these quotes come from a local simulator. "
+                   "Simulated prices are not checked against your alerts and send no notifications.")
+    
+    latest = stream_service.buffer.latest(stock_symbol)
+    if latest is None:
+        st.caption("Waiting for the first tick...")
+        return
+    
+    label = "Simulated Price" if simulated else "Live Price"
+    st.metric(label, f"${latest[1]:.2f}", f"{latest[1] - current_price:+.2f}")
+    
+    live_bars = bar_aggregator.bars(stock_symbol, '1m')
+    if len(live_bars) > 1:
+        st.line_chart(live_bars['Close'], height=200)
+    
+    if st.session_state.get('active_alerts') and not simulated:
+        triggered_alerts, updated_alerts = check_price_alerts_live(
+            stream_service.buffer, st.session_state.active_alerts
+        )
+        st.session_state.active_alerts = updated_alerts
+        for alert in triggered_alerts:
+            send_alert_notification(alert)
+
+if live_enabled:
+    live_alert_panel()
+
 # Alert guidelines and FAQ
 with st.expander("Alert Guidelines and FAQ"):
     st.markdown("""
@@ -141,6 +205,8 @@ with st.expander("Alert Guidelines and FAQ"):
     
     #### Limitations
     - Alerts are checked when you load this page or click "Check Alerts Now"
+    - With "Stream live quotes" enabled, alerts are re-checked against streamed ticks every two seconds
+      (only for the live Finnhub feed, never for simulated quotes)
     - For continuous monitoring, you'll need to keep the application running
     - Notifications are only displayed within the application
     
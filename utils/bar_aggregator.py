@@ -0,0 +1,210 @@
+"""
+Incremental tick-to-bar aggregation.
+
+Turns a stream of trade ticks into rolling OHLCV bars for several intraday
+intervals at once, in O(1) per tick, and emits an event whenever a bar
+closes. For the same ticks its output is identical to the batch resampler
+(utils.resampling.ticks_to_bars), so charts, indicators and alerts can use
+one shared source of live bars.
+"""
+
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.resampling import interval_nanoseconds
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class _BarState:
+    """Open (still forming) bar of one symbol at one interval."""
+
+    __slots__ = ('start', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, start, price, size):
+        self.start = start
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+        self.volume = size
+
+    def as_tuple(self):
+        return self.start, self.open, self.high, self.low, self.close, self.volume
+
+
+class TickBarAggregator:
+    """
+    Aggregates ticks into OHLCV bars for several intervals simultaneously.
+
+    Bars are aligned to UTC bucket starts (e.g. every full minute for '1m').
+    A bar closes when the first tick of a later bucket arrives, or when
+    close_due() is called with a time past its end. Closed bars are kept in
+    a bounded history per symbol and interval; ticks that arrive for a
+    bucket that has already closed are ignored, so every bucket is emitted
+    once.
+    """
+
+    def __init__(self, intervals=('1m', '5m'), history: int = 1000,
+                 on_bar_close: Optional[Callable] = None):
+        """
+        Initialize the aggregator.
+
+        Args:
+            intervals: Intraday intervals to build (e.g. '1m', '5m', '15m')
+            history: Number of closed bars retained per symbol and interval
+            on_bar_close: Optional callback(symbol, interval, bar) for closed bars,
+                where bar is a (start_ns, open, high, low, close, volume) tuple
+        """
+        self.intervals = list(intervals)
+        self.widths = [interval_nanoseconds(interval) for interval in self.intervals]
+        self.history = history
+        self.open_bars: Dict[str, List[Optional[_BarState]]] = {}
+        # Start of the last closed bar per symbol and interval (-1: none yet)
+        self.closed_starts: Dict[str, List[int]] = {}
+        self.closed_bars: Dict[Tuple[str, str], deque] = {}
+        self.listeners: List[Callable] = [on_bar_close] if on_bar_close else []
+        self.lock = threading.Lock()
+
+    def add_listener(self, callback: Callable):
+        """Register a callback(symbol, interval, bar) for bar-close events."""
+        self.listeners.append(callback)
+
+    def _close(self, symbol: str, position: int, state: _BarState):
+        """Archive a finished bar and notify listeners."""
+        interval = self.intervals[position]
+        bar = state.as_tuple()
+        key = (symbol, interval)
+        if key not in self.closed_bars:
+            self.closed_bars[key] = deque(maxlen=self.history)
+        self.closed_bars[key].append(bar)
+        self.closed_starts[symbol][position] = state.start
+        for callback in self.listeners:
+            callback(symbol, interval, bar)
+
+    def update(self, symbol: str, timestamp: int, price: float, size: float = 0.0):
+        """
+        Add one tick.
+
+        Work per tick is constant: one bucket computation and a handful of
+        comparisons for each configured interval.
+
+        Args:
+            symbol: Stock symbol
+            timestamp: Tick time in nanoseconds since the epoch
+            price: Trade price
+            size: Trade size
+        """
+        with self.lock:
+            states = self.open_bars.get(symbol)
+            if states is None:
+                states = [None] * len(self.intervals)
+                self.open_bars[symbol] = states
+                self.closed_starts[symbol] = [-1] * len(self.intervals)
+            closed_starts = self.closed_starts[symbol]
+
+            for position, width in enumerate(self.widths):
+                start = timestamp - timestamp % width
+                state = states[position]
+
+                if start <= closed_starts[position]:
+                    # The tick's bucket has already been emitted
+                    continue
+                if state is None or start > state.start:
+                    if state is not None:
+                        self._close(symbol, position, state)
+                    states[position] = _BarState(start, price, size)
+                elif start == state.start:
+                    if price > state.high:
+                        state.high = price
+                    if price < state.low:
+                        state.low = price
+                    state.close = price
+                    state.volume += size
+                # Ticks older than the open bar arrive too late and are ignored
+
+    def close_due(self, now: int):
+        """
+        Close every open bar whose interval has ended by `now`.
+
+        Useful on a timer, so quiet symbols still emit their final bar.
+
+        Args:
+            now: Current time in nanoseconds since the epoch
+        """
+        with self.lock:
+            for symbol, states in self.open_bars.items():
+                for position, width in enumerate(self.widths):
+                    state = states[position]
+                    if state is not None and state.start + width <= now:
+                        self._close(symbol, position, state)
+                        states[position] = None
+
+    def current_bar(self, symbol: str, interval: str) -> Optional[Tuple]:
+        """
+        Get the still-forming bar of a symbol.
+
+        Returns:
+            (start_ns, open, high, low, close, volume), or None
+        """
+        states = self.open_bars.get(symbol)
+        if states is None:
+            return None
+        state = states[self.intervals.index(interval)]
+        return None if state is None else state.as_tuple()
+
+    def bars(self, symbol: str, interval: str, include_open: bool = True) -> pd.DataFrame:
+        """
+        Get the bars of a symbol as an OHLCV DataFrame.
+
+        Args:
+            symbol: Stock symbol
+            interval: One of the configured intervals
+            include_open: Whether to append the still-forming bar
+
+        Returns:
+            pd.DataFrame: Bars indexed by UTC bucket start
+        """
+        with self.lock:
+            rows = list(self.closed_bars.get((symbol, interval), ()))
+            current = self.current_bar(symbol, interval) if include_open else None
+        if current is not None:
+            rows.append(current)
+
+        starts = np.array([row[0] for row in rows], dtype=np.int64)
+        values = np.array([row[1:] for row in rows], dtype=float).reshape(-1, 5)
+        index = pd.to_datetime(starts, unit='ns', utc=True)
+        return pd.DataFrame(values, index=index, columns=BAR_COLUMNS)
+
+    def attach(self, service):
+        """
+        Subscribe to a QuoteStreamService so every streamed tick updates the bars.
+
+        Args:
+            service (utils.streaming.QuoteStreamService): Running quote service
+        """
+        def on_tick(symbol, buffer):
+            tick = buffer.latest(symbol)
+            if tick is not None:
+                self.update(symbol, *tick)
+
+        service.subscribe(on_tick)
+        return on_tick
+
+
+# Global aggregator attached to the global quote stream
+_aggregator = None
+
+
+def get_bar_aggregator() -> TickBarAggregator:
+    """Get the global tick-to-bar aggregator, attached to the global quote stream."""
+    global _aggregator
+    if _aggregator is None:
+        from utils.streaming import get_stream_service
+        _aggregator = TickBarAggregator(intervals=('1m', '5m', '15m'))
+        _aggregator.attach(get_stream_service())
+    return _aggregator
@@ -0,0 +1,279 @@
+"""
+Vectorized candlestick pattern engine.
+
+OHLC columns are loaded into NumPy arrays once and every pattern is
+evaluated as a boolean mask over the whole series. Multi-bar patterns look
+back through shifted copies of the same arrays, so a full history scan is
+a handful of array operations per pattern.
+
+New patterns are added with the register_pattern decorator:
+
+    @register_pattern('Bullish Foo', group='foo', bars=2)
+    def _bullish_foo(c):
+        return c.bullish & (c.prev(c.close) < c.close)
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class Candles:
+    """OHLC arrays and derived candle geometry shared by all pattern functions."""
+
+    def __init__(self, data: pd.DataFrame):
+        """
+        Load candle arrays from a DataFrame.
+
+        Args:
+            data (pd.DataFrame): Stock data with OHLC columns
+        """
+        self.open = data['Open'].to_numpy(dtype=float)
+        self.high = data['High'].to_numpy(dtype=float)
+        self.low = data['Low'].to_numpy(dtype=float)
+        self.close = data['Close'].to_numpy(dtype=float)
+
+        self.body = np.abs(self.open - self.close)
+        self.body_top = np.maximum(self.open, self.close)
+        self.body_bottom = np.minimum(self.open, self.close)
+        self.range = self.high - self.low
+        self.upper_shadow = self.high - self.body_top
+        self.lower_shadow = self.body_bottom - self.low
+        self.bullish = self.close > self.open
+        self.bearish = self.close < self.open
+
+    def __len__(self):
+        return len(self.close)
+
+    def prev(self, values: np.ndarray, bars: int = 1) -> np.ndarray:
+        """
+        Shift an array forward so position i holds the value from bar i - bars.
+
+        The first `bars` positions are padded with NaN (False for boolean
+        arrays), so patterns never fire before enough history exists.
+        """
+        shifted = np.empty_like(values)
+        shifted[:bars] = False if values.dtype == bool else np.nan
+        shifted[bars:] = values[:len(values) - bars]
+        return shifted
+
+
+class _Pattern:
+    """Registry entry for one pattern."""
+
+    def __init__(self, name: str, group: str, bars: int, func: Callable):
+        self.name = name
+        self.group = group
+        self.bars = bars
+        self.func = func
+
+
+PATTERNS: Dict[str, _Pattern] = {}
+
+
+def register_pattern(name: str, group: str, bars: int = 1):
+    """
+    Decorator registering a pattern function in the library.
+
+    Args:
+        name (str): Pattern label, e.g. 'Bullish Engulfing'
+        group (str): Family the pattern is reported under, e.g. 'engulfing'
+        bars (int): Number of candles the pattern spans
+
+    Returns:
+        Callable: Decorator taking a function(Candles) -> boolean mask
+    """
+    def decorator(func):
+        PATTERNS[name] = _Pattern(name, group, bars, func)
+        return func
+    return decorator
+
+
+# Single-bar patterns
+
+def _doji(c):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return c.body / (c.range + 0.001) < 0.1
+
+
+def _long_legged(c):
+    return (c.upper_shadow > 3 * c.body) & (c.lower_shadow > 3 * c.body)
+
+
+@register_pattern('Long-Legged Doji', group='doji')
+def _long_legged_doji(c):
+    return _doji(c) & _long_legged(c)
+
+
+@register_pattern('Doji', group='doji')
+def _plain_doji(c):
+    return _doji(c) & ~_long_legged(c)
+
+
+@register_pattern('Hammer', group='hammer')
+def _hammer(c):
+    return (c.body > 0) & (c.lower_shadow > 2 * c.body) & (c.upper_shadow < 0.1 * c.body)
+
+
+@register_pattern('Shooting Star', group='shooting_star')
+def _shooting_star(c):
+    return (c.body > 0) & (c.upper_shadow > 2 * c.body) & (c.lower_shadow < 0.1 * c.body)
+
+
+# Two-bar patterns
+
+@register_pattern('Bullish Engulfing', group='engulfing', bars=2)
+def _bullish_engulfing(c):
+    return (
+        c.prev(c.bearish) & c.bullish &
+        (c.close > c.prev(c.open)) & (c.open < c.prev(c.close))
+    )
+
+
+@register_pattern('Bearish Engulfing', group='engulfing', bars=2)
+def _bearish_engulfing(c):
+    return (
+        c.prev(c.bullish) & c.bearish &
+        (c.close < c.prev(c.open)) & (c.open > c.prev(c.close))
+    )
+
+
+@register_pattern('Bullish Harami', group='harami', bars=2)
+def _bullish_harami(c):
+    return (
+        c.prev(c.bearish) & c.bullish &
+        (c.open > c.prev(c.close)) & (c.close < c.prev(c.open))
+    )
+
+
+@register_pattern('Bearish Harami', group='harami', bars=2)
+def _bearish_harami(c):
+    return (
+        c.prev(c.bullish) & c.bearish &
+        (c.open < c.prev(c.close)) & (c.close > c.prev(c.open))
+    )
+
+
+@register_pattern('Inside Bar', group='inside_outside', bars=2)
+def _inside_bar(c):
+    return (c.high < c.prev(c.high)) & (c.low > c.prev(c.low))
+
+
+@register_pattern('Outside Bar', group='inside_outside', bars=2)
+def _outside_bar(c):
+    return (c.high > c.prev(c.high)) & (c.low < c.prev(c.low))
+
+
+# Three-bar patterns
+
+def _star_middle(c):
+    """Small-bodied middle candle following a long-bodied first candle."""
+    first_body = c.prev(c.body, 2)
+    long_first = first_body > 0.5 * c.prev(c.range, 2)
+    return long_first & (c.prev(c.body) < 0.3 * first_body)
+
+
+@register_pattern('Morning Star', group='star', bars=3)
+def _morning_star(c):
+    first_close = c.prev(c.close, 2)
+    first_mid = (c.prev(c.open, 2) + first_close) / 2
+    return (
+        c.prev(c.bearish, 2) & _star_middle(c) &
+        (c.prev(c.body_top) < first_close) &
+        c.bullish & (c.close > first_mid)
+    )
+
+
+@register_pattern('Evening Star', group='star', bars=3)
+def _evening_star(c):
+    first_close = c.prev(c.close, 2)
+    first_mid = (c.prev(c.open, 2) + first_close) / 2
+    return (
+        c.prev(c.bullish, 2) & _star_middle(c) &
+        (c.prev(c.body_bottom) > first_close) &
+        c.bearish & (c.close < first_mid)
+    )
+
+
+@register_pattern('Three White Soldiers', group='soldiers_crows', bars=3)
+def _three_white_soldiers(c):
+    up = c.bullish & c.prev(c.bullish) & c.prev(c.bullish, 2)
+    rising = (c.close > c.prev(c.close)) & (c.prev(c.close) > c.prev(c.close, 2))
+    # Each candle opens inside the previous body and closes near its high
+    opens_inside = (
+        (c.open > c.prev(c.open)) & (c.open < c.prev(c.close)) &
+        (c.prev(c.open) > c.prev(c.open, 2)) & (c.prev(c.open) < c.prev(c.close, 2))
+    )
+    strong = (
+        (c.upper_shadow < 0.5 * c.body) &
+        (c.prev(c.upper_shadow) < 0.5 * c.prev(c.body)) &
+        (c.prev(c.upper_shadow, 2) < 0.5 * c.prev(c.body, 2))
+    )
+    return up & rising & opens_inside & strong
+
+
+@register_pattern('Three Black Crows', group='soldiers_crows', bars=3)
+def _three_black_crows(c):
+    down = c.bearish & c.prev(c.bearish) & c.prev(c.bearish, 2)
+    falling = (c.close < c.prev(c.close)) & (c.prev(c.close) < c.prev(c.close, 2))
+    # Each candle opens inside the previous body and closes near its low
+    opens_inside = (
+        (c.open < c.prev(c.open)) & (c.open > c.prev(c.close)) &
+        (c.prev(c.open) < c.prev(c.open, 2)) & (c.prev(c.open) > c.prev(c.close, 2))
+    )
+    strong = (
+        (c.lower_shadow < 0.5 * c.body) &
+        (c.prev(c.lower_shadow) < 0.5 * c.prev(c.body)) &
+        (c.prev(c.lower_shadow, 2) < 0.5 * c.prev(c.body, 2))
+    )
+    return down & falling & opens_inside & strong
+
+
+def pattern_masks(data: pd.DataFrame, patterns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Evaluate patterns as boolean masks over the whole series.
+
+    Args:
+        data (pd.DataFrame): Stock data with OHLC columns
+        patterns (list, optional): Pattern names to evaluate (default: all registered)
+
+    Returns:
+        dict: Pattern name -> boolean array aligned with data.index
+    """
+    candles = Candles(data)
+    names = list(PATTERNS) if patterns is None else patterns
+    return {name: PATTERNS[name].func(candles) for name in names}
+
+
+def scan_patterns(data: pd.DataFrame, patterns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Scan a price history for candlestick patterns.
+
+    Args:
+        data (pd.DataFrame): Stock data with OHLC columns
+        patterns (list, optional): Pattern names to evaluate (default: all registered)
+
+    Returns:
+        pd.DataFrame: One row per detection, indexed by (Date, Pattern) in
+            date order, with the pattern 'Group' as the only column
+    """
+    masks = pattern_masks(data, patterns)
+    names = list(masks)
+
+    positions = [np.flatnonzero(mask) for mask in masks.values()]
+    codes = [np.full(len(found), code) for code, found in enumerate(positions)]
+    positions = np.concatenate(positions) if positions else np.empty(0, dtype=np.intp)
+    codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.intp)
+
+    # Stable sort keeps registry order for patterns on the same bar
+    order = np.argsort(positions, kind='stable')
+    positions = positions[order]
+    labels = np.asarray(names, dtype=object)[codes[order]]
+    groups = np.asarray([PATTERNS[name].group for name in names], dtype=object)[codes[order]]
+
+    index = pd.MultiIndex.from_arrays(
+        [data.index[positions], labels],
+        names=['Date', 'Pattern']
+    )
+    return pd.DataFrame({'Group': groups}, index=index)
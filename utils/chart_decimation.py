@@ -0,0 +1,166 @@
+"""
+Adaptive decimation of chart traces for long histories.
+
+A chart only has so many horizontal pixels, so sending every bar of a
+20-year daily history (and every point of each overlay) to the browser
+wastes megabytes of Plotly JSON. Given the visible range and the plot
+width, candles are aggregated into the finest of the coarser OHLC
+intervals (daily -> weekly -> monthly) that fits the pixel budget, and line
+overlays are downsampled with LTTB, which keeps peaks and troughs. A
+narrower visible range needs fewer bars, so zooming in returns full
+resolution again.
+
+    candles, interval = decimate_ohlc(data, x_range, width_px=1200)
+    sma = decimate_line(calculate_sma(data, 50), x_range, width_px=1200)
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils import kernels
+from utils.resampling import INTERVALS, resample_ohlcv
+
+# Plot width assumed when the caller does not know it
+DEFAULT_WIDTH_PX = 1200
+
+# Candles narrower than this many pixels become unreadable
+PIXELS_PER_CANDLE = 3
+
+# Line overlays keep about this many points per horizontal pixel
+POINTS_PER_PIXEL = 1
+
+# Nominal bar lengths in minutes, used to find the intervals coarser than the data
+_INTERVAL_MINUTES = {
+    '1m': 1, '5m': 5, '15m': 15, '30m': 30, '60m': 60,
+    '1d': 1440, '1wk': 10080, '1mo': 43200
+}
+
+
+def visible_slice(index: pd.Index, x_range=None) -> slice:
+    """
+    Positions of the bars inside a visible x range.
+
+    Args:
+        index (pd.Index): Sorted bar index
+        x_range (tuple, optional): (start, end) of the visible range; either
+            end may be None for an open range
+
+    Returns:
+        slice: Positional slice of the visible bars
+    """
+    if x_range is None or len(index) == 0:
+        return slice(0, len(index))
+    start, end = x_range
+    first = 0 if start is None else index.searchsorted(_bound(start, index), 'left')
+    last = len(index) if end is None else index.searchsorted(_bound(end, index), 'right')
+    return slice(first, last)
+
+
+def covering_range(index: pd.Index, x_range=None):
+    """
+    The visible x range, or None (the full history) when it holds no bars.
+
+    Args:
+        index (pd.Index): Sorted bar index
+        x_range (tuple, optional): (start, end) of the visible range
+
+    Returns:
+        tuple or None: x_range when it contains at least one bar, else None
+    """
+    positions = visible_slice(index, x_range)
+    return x_range if positions.stop > positions.start else None
+
+
+def _bound(value, index: pd.Index):
+    """Range bound comparable with the index (matching its timezone)."""
+    if not isinstance(index, pd.DatetimeIndex):
+        return value
+    bound = pd.Timestamp(value)
+    if index.tz is not None and bound.tz is None:
+        return bound.tz_localize(index.tz)
+    if index.tz is None and bound.tz is not None:
+        return bound.tz_localize(None)
+    return bound
+
+
+def _native_minutes(data: pd.DataFrame) -> float:
+    """Bar length of the data: its interval attribute, else the median spacing."""
+    interval = data.attrs.get('interval')
+    if interval in _INTERVAL_MINUTES:
+        return _INTERVAL_MINUTES[interval]
+    if len(data) < 2:
+        return 0.0
+    spacing = (data.index[1:] - data.index[:-1]).median()
+    return spacing.total_seconds() / 60
+
+
+def decimate_ohlc(data: pd.DataFrame, x_range=None,
+                  width_px: Optional[int] = DEFAULT_WIDTH_PX) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Visible OHLCV bars, aggregated until they fit the plot width.
+
+    Args:
+        data (pd.DataFrame): OHLCV bars with a sorted DatetimeIndex
+        x_range (tuple, optional): (start, end) of the visible range
+        width_px (int, optional): Plot width in pixels; None keeps every bar
+
+    Returns:
+        tuple: (bars to plot, interval they were aggregated to, or None if
+            they are the original bars)
+    """
+    visible = data.iloc[visible_slice(data.index, x_range)]
+    if width_px is None or visible.empty or not isinstance(visible.index, pd.DatetimeIndex):
+        return visible, None
+
+    max_bars = max(width_px // PIXELS_PER_CANDLE, 1)
+    if len(visible) <= max_bars:
+        return visible, None
+
+    native = _native_minutes(visible)
+    coarser = [interval for interval in INTERVALS if _INTERVAL_MINUTES[interval] > native]
+    bars, chosen = visible, None
+    for interval in coarser:
+        bars, chosen = resample_ohlcv(visible, interval), interval
+        if len(bars) <= max_bars:
+            break
+    return bars, chosen
+
+
+def line_points(n_points: int, width_px: Optional[int] = DEFAULT_WIDTH_PX) -> int:
+    """Number of points decimate_line keeps from a line of n_points visible points."""
+    if width_px is None:
+        return n_points
+    return min(n_points, max(width_px * POINTS_PER_PIXEL, 3))
+
+
+def decimate_line(series: pd.Series, x_range=None,
+                  width_px: Optional[int] = DEFAULT_WIDTH_PX) -> pd.Series:
+    """
+    Visible points of a line overlay, downsampled with LTTB to fit the plot width.
+
+    Missing values (indicator warm-up) are dropped before downsampling, so
+    the line is drawn over the bars where it is defined.
+
+    Args:
+        series (pd.Series): Line values indexed like the price data
+        x_range (tuple, optional): (start, end) of the visible range
+        width_px (int, optional): Plot width in pixels; None keeps every point
+
+    Returns:
+        pd.Series: Points to plot
+    """
+    visible = series.iloc[visible_slice(series.index, x_range)]
+    if width_px is None:
+        return visible
+
+    max_points = line_points(len(visible), width_px)
+    if len(visible) <= max_points:
+        return visible
+
+    visible = visible.dropna()
+    values = visible.to_numpy(dtype=float)
+    # Bar positions as x keep weekends and overnight gaps from skewing the buckets
+    keep = kernels.lttb(np.arange(len(values)), values, max_points)
+    return visible.iloc[keep]
@@ -3,19 +3,162 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
-def create_candlestick_chart(data, title=None, height=700, show_volume=True):
+from utils.chart_decimation import DEFAULT_WIDTH_PX, decimate_ohlc, visible_slice
+from utils.figure_cache import memoize_figure
+from utils.pivot_points import pivot_levels
+from utils.resampling import INTERVAL_LABELS
+from utils.volume_profile import DEFAULT_BINS, volume_profile
+
+# Figures with more points per trace than this switch to WebGL in 'auto' mode
+WEBGL_POINT_THRESHOLD = 2000
+
+RENDER_MODES = {
+    'auto': 'Auto',
+    'svg': 'SVG',
+    'webgl': 'WebGL'
+}
+
+def use_webgl(n_points, render_mode='auto'):
+    """
+    Decide whether line and bar traces should be drawn with WebGL.
+    
+    'auto' looks at the bars in the visible range before decimation, so a
+    long history still gets WebGL after it was downsampled to the plot width.
+    
+    Args:
+        n_points (int): Bars in the visible range (before decimation)
+        render_mode (str): 'auto' (WebGL above WEBGL_POINT_THRESHOLD), 'svg' or 'webgl'
+        
+    Returns:
+        bool: True for WebGL rendering
+    """
+    if render_mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode: {render_mode}")
+    if render_mode == 'auto':
+        return n_points > WEBGL_POINT_THRESHOLD
+    return render_mode == 'webgl'
+
+def scatter_type(n_points, render_mode='auto'):
+    """
+    Scatter trace class for a figure: go.Scattergl when WebGL is used, else go.Scatter.
+    
+    Args:
+        n_points (int): Bars in the visible range (before decimation)
+        render_mode (str): 'auto', 'svg' or 'webgl'
+        
+    Returns:
+        type: go.Scattergl or go.Scatter
+    """
+    return go.Scattergl if use_webgl(n_points, render_mode) else go.Scatter
+
+def direction_colors(values, reference=0, up_color='green', down_color='red'):
+    """
+    Per-bar colors from one vectorized comparison.
+    
+    Args:
+        values (array-like): Bar values (e.g. Close, or a MACD histogram)
+        reference (array-like or float): Value to compare against (e.g. Open, or 0)
+        up_color (str): Color where values >= reference
+        down_color (str): Color elsewhere (including missing values)
+        
+    Returns:
+        np.ndarray: One color per bar
+    """
+    values = np.asarray(values, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    return np.where(values >= reference, up_color, down_color)
+
+def volume_colors(data, up_color='green', down_color='red'):
+    """Volume bar colors: up_color on bars closing at or above their open."""
+    return direction_colors(data['Close'], data['Open'], up_color, down_color)
+
+def bar_traces(x, y, colors, name, render_mode='auto', n_bars=None):
+    """
+    Colored bar series (volume, histograms) as Plotly traces.
+    
+    Plotly has no WebGL bar trace, so in WebGL mode the bars are drawn as
+    vertical segments from zero, one go.Scattergl trace per color with None
+    gaps between segments.
+    
+    Args:
+        x (sequence): Bar positions
+        y (sequence): Bar heights
+        colors (sequence): Color of each bar
+        name (str): Trace name
+        render_mode (str): 'auto', 'svg' or 'webgl'
+        n_bars (int, optional): Visible bars before decimation; defaults to len(x)
+        
+    Returns:
+        list: Traces to add to the figure
+    """
+    if not use_webgl(len(x) if n_bars is None else n_bars, render_mode):
+        return [go.Bar(x=x, y=y, marker_color=colors, name=name)]
+    
+    x = pd.Index(x)
+    y = np.asarray(y, dtype=float)
+    colors = np.asarray(colors)
+    traces = []
+    for color in dict.fromkeys(colors.tolist()):
+        mask = colors == color
+        count = int(mask.sum())
+        seg_x = np.empty(3 * count, dtype=object)
+        seg_y = np.empty(3 * count, dtype=object)
+        seg_x[0::3] = seg_x[1::3] = list(x[mask])
+        seg_y[0::3] = 0.0
+        seg_y[1::3] = list(y[mask])
+        traces.append(go.Scattergl(
+            x=seg_x,
+            y=seg_y,
+            mode='lines',
+            line=dict(color=color, width=2),
+            name=name,
+            legendgroup=name,
+            showlegend=not traces
+        ))
+    return traces
+
+def subplot_cell(fig, row, col):
+    """
+    Row/col arguments for adding to a figure, empty for a figure without a
+    subplot grid (plotly rejects row and col there).
+    """
+    # Same grid attribute the figure cache restores on cached figures
+    if getattr(fig, '_grid_ref', None) is None:
+        return {}
+    return {'row': row, 'col': col}
+
+def price_trace_name(interval):
+    """Legend name of the price trace, noting when candles were aggregated."""
+    return "Price" if interval is None else f"Price ({INTERVAL_LABELS.get(interval, interval)})"
+
+@memoize_figure
+def create_candlestick_chart(data, title=None, height=700, show_volume=True,
+                             x_range=None, width_px=DEFAULT_WIDTH_PX, render_mode='auto',
+                             volume_profile_bins=None):
     """
     Create a professional candlestick chart with optional volume bars.
     
+    Long histories are aggregated into coarser candles that fit the plot
+    width; a narrower x_range gets full-resolution bars.
+    
     Args:
         data (pd.DataFrame): Stock data with OHLCV columns
         title (str, optional): Chart title
         height (int): Chart height
         show_volume (bool): Whether to show volume bars
+        x_range (tuple, optional): (start, end) of the visible date range
+        width_px (int, optional): Plot width in pixels; None plots every bar
+        render_mode (str): 'auto', 'svg' or 'webgl' for the volume bars
+        volume_profile_bins (int, optional): Overlay a volume profile of the
+            visible range with this many price bins
         
     Returns:
         plotly.graph_objects.Figure: Plotly figure
     """
+    bars, interval = decimate_ohlc(data, x_range, width_px)
+    positions = visible_slice(data.index, x_range)
+    n_visible = positions.stop - positions.start
+    
     if show_volume:
         fig = make_subplots(
             rows=2, 
@@ -29,12 +172,12 @@ def create_candlestick_chart(data, title=None, height=700, show_volume=True):
     
     # Add candlestick chart
     candlestick = go.Candlestick(
-        x=data.index,
-        open=data['Open'],
-        high=data['High'],
-        low=data['Low'],
-        close=data['Close'],
-        name="Price"
+        x=bars.index,
+        open=bars['Open'],
+        high=bars['High'],
+        low=bars['Low'],
+        close=bars['Close'],
+        name=price_trace_name(interval)
     )
     
     if show_volume:
@@ -43,17 +186,11 @@ def create_candlestick_chart(data, title=None, height=700, show_volume=True):
         fig.add_trace(candlestick)
     
     # Add volume bars if requested
-    if show_volume and 'Volume' in data.columns:
-        colors = ['green' if row['Close'] >= row['Open'] else 'red' for _, row in data.iterrows()]
-        
-        volume_bars = go.Bar(
-            x=data.index,
-            y=data['Volume'],
-            marker_color=colors,
-            name="Volume"
-        )
+    if show_volume and 'Volume' in bars.columns:
+        colors = volume_colors(bars)
         
-        fig.add_trace(volume_bars, row=2, col=1)
+        for volume_bars in bar_traces(bars.index, bars['Volume'], colors, "Volume", render_mode, n_visible):
+            fig.add_trace(volume_bars, row=2, col=1)
     
     # Update layout
     layout_args = {
@@ -68,6 +205,10 @@ def create_candlestick_chart(data, title=None, height=700, show_volume=True):
     
     fig.update_layout(**layout_args)
     
+    if volume_profile_bins:
+        # Profiled from the original bars, not the decimated candles
+        add_volume_profile(fig, volume_profile(data, bins=volume_profile_bins, x_range=x_range))
+    
     if show_volume:
         fig.update_yaxes(title_text="Price", row=1, col=1)
         fig.update_yaxes(title_text="Volume", row=2, col=1)
@@ -76,6 +217,71 @@ def create_candlestick_chart(data, title=None, height=700, show_volume=True):
     
     return fig
 
+def add_volume_profile(fig, profile, width=0.25, color='rgba(100, 116, 139, 0.45)',
+                       value_area_color='rgba(59, 130, 246, 0.55)', poc_color='orange'):
+    """
+    Overlay a volume profile as horizontal bars on the right of the price panel.
+    
+    The bars live on an extra x axis laid over the price panel's dates,
+    reversed so they grow leftwards from the right edge, and share the
+    price axis; bins inside the value area are highlighted and the point
+    of control is marked with a line.
+    
+    Args:
+        fig (plotly.graph_objects.Figure): Figure whose price panel uses axes x and y
+        profile (dict): Result of utils.volume_profile.volume_profile
+        width (float): Share of the plot width taken by the longest bar
+        color (str): Bar color outside the value area
+        value_area_color (str): Bar color inside the value area
+        poc_color (str): Point of control line color
+        
+    Returns:
+        plotly.graph_objects.Figure: Updated figure
+    """
+    bins = profile['profile']
+    if bins.empty or not profile['total_volume']:
+        return fig
+    
+    axis_count = sum(1 for key in fig.layout.to_plotly_json() if key.startswith('xaxis'))
+    axis = f"x{max(axis_count, 1) + 1}"
+    longest = bins['Volume'].max() / width
+    in_value_area = (bins['Low'] >= profile['value_area_low']) & (bins['High'] <= profile['value_area_high'])
+    
+    fig.add_trace(
+        go.Bar(
+            x=bins['Volume'],
+            y=bins['Price'],
+            orientation='h',
+            width=(bins['High'] - bins['Low']).to_numpy(),
+            marker=dict(color=np.where(in_value_area, value_area_color, color), line=dict(width=0)),
+            xaxis=axis,
+            yaxis='y',
+            name='Volume Profile',
+            showlegend=False,
+            hovertemplate='%{y:.2f}: %{x:,.0f}<extra>Volume Profile</extra>'
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=[longest, 0],
+            y=[profile['poc'], profile['poc']],
+            mode='lines',
+            line=dict(color=poc_color, width=1, dash='dot'),
+            xaxis=axis,
+            yaxis='y',
+            name='POC',
+            showlegend=False,
+            hoverinfo='skip'
+        )
+    )
+    fig.update_layout({
+        f"xaxis{axis[1:]}": dict(
+            overlaying='x', side='top', range=[longest, 0], fixedrange=True,
+            showticklabels=False, showgrid=False, zeroline=False
+        )
+    })
+    return fig
+
 def create_range_selector():
     """
     Create a range selector for charts.
@@ -110,8 +316,7 @@ def add_range_selector(fig, row=1, col=1):
     
     fig.update_xaxes(
         rangeselector=rangeselector,
-        row=row,
-        col=col
+        **subplot_cell(fig, row, col)
     )
     
     return fig
@@ -142,51 +347,143 @@ def add_annotations(fig, data, annotations, row=1, col=1):
                 arrowhead=1,
                 ax=0,
                 ay=-40,
-                row=row,
-                col=col
+                **subplot_cell(fig, row, col)
             )
     
     return fig
 
-def calculate_pivot_points(data):
+def level_segments(starts, ends, levels):
+    """
+    Coordinates of many horizontal segments for a single line trace.
+    
+    Each segment (start, level) -> (end, level) is followed by a None gap,
+    so Plotly draws them as separate lines within one trace.
+    
+    Args:
+        starts (sequence): Segment start x values
+        ends (sequence): Segment end x values
+        levels (sequence): Segment y values
+        
+    Returns:
+        tuple: (x, y) object arrays of length 3 * len(levels)
+    """
+    count = len(levels)
+    x = np.empty(3 * count, dtype=object)
+    y = np.empty(3 * count, dtype=object)
+    x[0::3] = list(starts)
+    x[1::3] = list(ends)
+    y[0::3] = list(levels)
+    y[1::3] = list(levels)
+    return x, y
+
+def add_level_lines(fig, starts, ends, levels, color, dash='dash', width=1, name=None, row=1, col=1):
+    """
+    Draw horizontal level lines (support, resistance, pivots) as one trace.
+    
+    Looks the same as one layout shape per level, but the figure carries a
+    single trace however many levels there are, which keeps figure
+    construction, the JSON payload and client relayouts small.
+    
+    Args:
+        fig (plotly.graph_objects.Figure): Plotly figure
+        starts (sequence): Start date of each line
+        ends (sequence): End date of each line
+        levels (sequence): Price of each line
+        color (str): Line color
+        dash (str): Line dash style
+        width (int): Line width
+        name (str, optional): Trace name
+        row (int): Row to add the lines to
+        col (int): Column to add the lines to
+        
+    Returns:
+        plotly.graph_objects.Figure: Updated figure
+    """
+    if len(levels) == 0:
+        return fig
+    
+    x, y = level_segments(starts, ends, levels)
+    fig.add_trace(
+        go.Scatter(
+            x=x,
+            y=y,
+            mode='lines',
+            line=dict(color=color, width=width, dash=dash),
+            name=name,
+            showlegend=False,
+            hoverinfo='skip'
+        ),
+        **subplot_cell(fig, row, col)
+    )
+    return fig
+
+def add_zone_bands(fig, starts, ends, lows, highs, color, opacity=0.15, name=None, row=1, col=1):
+    """
+    Draw price zones (e.g. support/resistance zones) as shaded bands in one trace.
+    
+    Every band is a closed rectangle followed by a None gap, and the trace
+    fills each rectangle separately, so any number of zones costs one trace.
+    
+    Args:
+        fig (plotly.graph_objects.Figure): Plotly figure
+        starts (sequence): Start date of each band
+        ends (sequence): End date of each band
+        lows (sequence): Lower price of each band
+        highs (sequence): Upper price of each band
+        color (str): Fill and outline color
+        opacity (float): Fill opacity
+        name (str, optional): Trace name
+        row (int): Row to add the bands to
+        col (int): Column to add the bands to
+        
+    Returns:
+        plotly.graph_objects.Figure: Updated figure
+    """
+    count = len(lows)
+    if count == 0:
+        return fig
+    
+    x = np.empty(6 * count, dtype=object)
+    y = np.empty(6 * count, dtype=object)
+    starts, ends = list(starts), list(ends)
+    for offset, (xs, ys) in enumerate(((starts, lows), (ends, lows), (ends, highs), (starts, highs), (starts, lows))):
+        x[offset::6] = xs
+        y[offset::6] = list(ys)
+    fig.add_trace(
+        go.Scatter(
+            x=x,
+            y=y,
+            mode='lines',
+            fill='toself',
+            fillcolor=color,
+            opacity=opacity,
+            line=dict(color=color, width=1),
+            name=name,
+            showlegend=False,
+            hoverinfo='skip'
+        ),
+        **subplot_cell(fig, row, col)
+    )
+    return fig
+
+def calculate_pivot_points(data, method='classic'):
     """
-    Calculate classic pivot points based on the last trading day.
+    Calculate pivot points based on the last trading day.
     
     Args:
         data (pd.DataFrame): Stock data with OHLC columns
+        method (str): Pivot method: 'classic', 'fibonacci', 'camarilla',
+            'woodie' or 'demark'
         
     Returns:
         dict: Dictionary of pivot points
     """
     # Get the last trading day data
     last_day = data.iloc[-1]
-    high = last_day['High']
-    low = last_day['Low']
-    close = last_day['Close']
-    
-    # Calculate pivot point
-    pivot = (high + low + close) / 3
-    
-    # Calculate support and resistance levels
-    s1 = (2 * pivot) - high
-    s2 = pivot - (high - low)
-    s3 = low - 2 * (high - pivot)
-    
-    r1 = (2 * pivot) - low
-    r2 = pivot + (high - low)
-    r3 = high + 2 * (pivot - low)
-    
-    return {
-        'P': pivot,
-        'S1': s1,
-        'S2': s2,
-        'S3': s3,
-        'R1': r1,
-        'R2': r2,
-        'R3': r3
-    }
+    levels = pivot_levels(last_day['Open'], last_day['High'], last_day['Low'], last_day['Close'], method)
+    return {level: float(value) for level, value in levels.items()}
 
-def add_pivot_points(fig, data, row=1, col=1):
+def add_pivot_points(fig, data, row=1, col=1, method='classic'):
     """
     Add pivot points to a chart.
     
@@ -195,64 +492,182 @@ def add_pivot_points(fig, data, row=1, col=1):
         data (pd.DataFrame): Stock data
         row (int): Row to add pivot points to
         col (int): Column to add pivot points to
+        method (str): Pivot method (see calculate_pivot_points)
         
     Returns:
         plotly.graph_objects.Figure: Updated figure
     """
     # Calculate pivot points
-    pivot_points = calculate_pivot_points(data)
-    
-    # Define line colors for different levels
-    colors = {
-        'P': 'black',
-        'S1': 'green',
-        'S2': 'green',
-        'S3': 'green',
-        'R1': 'red',
-        'R2': 'red',
-        'R3': 'red'
-    }
+    pivot_points = calculate_pivot_points(data, method)
     
-    # Define line styles
-    dash_styles = {
-        'P': 'solid',
-        'S1': 'dash',
-        'S2': 'dash',
-        'S3': 'dash',
-        'R1': 'dash',
-        'R2': 'dash',
-        'R3': 'dash'
-    }
+    # Pivot in solid black, supports in dashed green, resistances in dashed red
+    def style(level):
+        if level == 'P':
+            return 'black', 'solid'
+        return ('green' if level.startswith('S') else 'red'), 'dash'
     
-    # Add horizontal lines for each pivot point
+    # One segmented line trace per (color, dash) style and one text trace for
+    # the labels, instead of a layout shape and annotation per level
+    start, end = data.index[0], data.index[-1]
+    styles = {}
     for level, value in pivot_points.items():
-        fig.add_shape(
-            type="line",
-            x0=data.index[0],
-            y0=value,
-            x1=data.index[-1],
-            y1=value,
-            line=dict(
-                color=colors[level],
-                width=1,
-                dash=dash_styles[level]
-            ),
-            row=row,
-            col=col
-        )
+        styles.setdefault(style(level), []).append(value)
+    for (color, dash), values in styles.items():
+        add_level_lines(fig, [start] * len(values), [end] * len(values), values,
+                        color=color, dash=dash, row=row, col=col)
+    
+    fig.add_trace(
+        go.Scatter(
+            x=[end] * len(pivot_points),
+            y=list(pivot_points.values()),
+            text=[f"{level}: {value:.2f}" for level, value in pivot_points.items()],
+            mode='text',
+            textposition='middle right',
+            # Labels sit right of the last bar, past the plot edge
+            cliponaxis=False,
+            showlegend=False,
+            hoverinfo='skip'
+        ),
+        **subplot_cell(fig, row, col)
+    )
+    
+    return fig
+
+@memoize_figure
+def create_price_chart(filtered_data, stock_symbol, chart_type, show_volume, show_pivot_points, show_volume_profile,
+                       annotations, render_mode='auto'):
+    """
+    Build the Chart Analysis page chart with its overlays.
+    
+    Cached on the data and options, so reruns triggered by other widgets
+    reuse the stored figure instead of rebuilding it.
+    
+    Args:
+        filtered_data (pd.DataFrame): Visible OHLCV bars
+        stock_symbol (str): Symbol shown in the title
+        chart_type (str): 'Candlestick', 'OHLC' or 'Line'
+        show_volume (bool): Whether to add a volume subplot
+        show_pivot_points (bool): Whether to draw pivot point levels
+        show_volume_profile (bool): Whether to draw the volume profile
+        annotations (list): (date, label) pairs to annotate
+        render_mode (str): 'auto', 'svg' or 'webgl'
         
-        # Add text labels
-        fig.add_annotation(
-            x=data.index[-1],
-            y=value,
-            text=f"{level}: {value:.2f}",
-            showarrow=False,
-            xanchor="left",
-            xshift=10,
-            row=row,
-            col=col
+    Returns:
+        plotly.graph_objects.Figure: Plotly figure
+    """
+    # Create chart with better styling; the candlestick builder is called
+    # unwrapped so the figure is cached once, under this function's key
+    if chart_type == "Candlestick":
+        fig = create_candlestick_chart.__wrapped__(
+            filtered_data, 
+            title=f"{stock_symbol} - Candlestick Chart",
+            show_volume=show_volume,
+            render_mode=render_mode,
+            volume_profile_bins=DEFAULT_BINS if show_volume_profile else None
         )
-    
+        fig.update_layout(
+            template="plotly_dark",
+            paper_bgcolor='rgba(26, 31, 46, 1)',
+            plot_bgcolor='rgba(26, 31, 46, 1)',
+            font=dict(color='#E5E7EB'),
+            height=700
+        )
+    elif chart_type == "OHLC":
+        fig = go.Figure(
+            data=[
+                go.Ohlc(
+                    x=filtered_data.index,
+                    open=filtered_data['Open'],
+                    high=filtered_data['High'],
+                    low=filtered_data['Low'],
+                    close=filtered_data['Close'],
+                    increasing_line_color='#10B981',
+                    decreasing_line_color='#EF4444',
+                    name="Price"
+                )
+            ]
+        )
+        fig.update_layout(
+            title=f"{stock_symbol} - OHLC Chart",
+            xaxis_rangeslider_visible=False,
+            template="plotly_dark",
+            paper_bgcolor='rgba(26, 31, 46, 1)',
+            plot_bgcolor='rgba(26, 31, 46, 1)',
+            font=dict(color='#E5E7EB'),
+            height=700
+        )
+    else:  # Line chart
+        Scatter = scatter_type(len(filtered_data), render_mode)
+        fig = go.Figure()
+        fig.add_trace(
+            Scatter(
+                x=filtered_data.index,
+                y=filtered_data['Close'],
+                mode='lines',
+                name="Close Price"
+            )
+        )
+
+        fig.update_layout(
+            title=f"{stock_symbol} - Price Chart",
+            xaxis_title="Date",
+            yaxis_title="Price",
+            template="plotly_white",
+            height=700
+        )
+
+        # Add volume if requested
+        if show_volume:
+            fig = make_subplots(
+                rows=2, 
+                cols=1, 
+                shared_xaxes=True,
+                vertical_spacing=0.1,
+                row_heights=[0.8, 0.2]
+            )
+
+            # Add price line
+            fig.add_trace(
+                Scatter(
+                    x=filtered_data.index,
+                    y=filtered_data['Close'],
+                    mode='lines',
+                    name="Close Price"
+                ),
+                row=1, col=1
+            )
+
+            # Add volume bars
+            colors = volume_colors(filtered_data)
+
+            for volume_bars in bar_traces(filtered_data.index, filtered_data['Volume'], colors, "Volume", render_mode):
+                fig.add_trace(volume_bars, row=2, col=1)
+
+            fig.update_layout(
+                title=f"{stock_symbol} - Price Chart",
+                template="plotly_white",
+                height=700,
+                xaxis_rangeslider_visible=False
+            )
+
+            fig.update_yaxes(title_text="Price", row=1, col=1)
+            fig.update_yaxes(title_text="Volume", row=2, col=1)
+
+    # Add range selector
+    fig = add_range_selector(fig)
+
+    # The candlestick chart draws its own volume profile
+    if show_volume_profile and chart_type != "Candlestick":
+        fig = add_volume_profile(fig, volume_profile(filtered_data, bins=DEFAULT_BINS))
+
+    # Add pivot points if requested
+    if show_pivot_points:
+        fig = add_pivot_points(fig, filtered_data)
+
+    # Annotate detected candlestick patterns
+    if annotations:
+        fig = add_annotations(fig, filtered_data, annotations)
+
     return fig
 
 def format_number(number):
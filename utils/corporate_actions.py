@@ -0,0 +1,230 @@
+"""
+Split and dividend adjustment engine.
+
+The data store keeps raw (unadjusted) bars plus a per-symbol corporate
+actions table. Adjusted series are derived when the bars are read, by
+multiplying the raw prices with cumulative adjustment factors. Because the
+factors are a reverse cumulative product over the actions, registering a new
+split or dividend only changes one entry of the table; no history has to be
+downloaded again.
+"""
+
+import numpy as np
+import pandas as pd
+
+ACTION_COLUMNS = ['Dividend', 'Split']
+
+
+def empty_actions():
+    """
+    Create an empty corporate actions table.
+
+    Returns:
+        pd.DataFrame: Table indexed by ex-date with Dividend and Split columns
+    """
+    return pd.DataFrame(
+        {'Dividend': pd.Series(dtype=float), 'Split': pd.Series(dtype=float)},
+        index=pd.DatetimeIndex([], name='Date')
+    )
+
+
+def _as_naive_dates(index):
+    """Normalize a DatetimeIndex to timezone-naive calendar dates."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def normalize_actions(actions):
+    """
+    Convert provider action data into the standard actions table.
+
+    Accepts yfinance-style frames ('Dividends' / 'Stock Splits' columns) as
+    well as frames that already use the 'Dividend' / 'Split' columns. Rows
+    without an action are dropped and multiple actions on one ex-date are
+    combined.
+
+    Args:
+        actions (pd.DataFrame): Provider corporate actions
+
+    Returns:
+        pd.DataFrame: Standard corporate actions table
+    """
+    if actions is None or len(actions) == 0:
+        return empty_actions()
+
+    table = actions.rename(columns={'Dividends': 'Dividend', 'Stock Splits': 'Split'})
+    table = table.reindex(columns=ACTION_COLUMNS).astype(float)
+    table.index = _as_naive_dates(table.index)
+    table.index.name = 'Date'
+
+    # A split ratio of 0 (or missing) means "no split"
+    table['Dividend'] = table['Dividend'].fillna(0.0)
+    table['Split'] = table['Split'].where(table['Split'] > 0, 1.0)
+
+    table = table[(table['Dividend'] != 0) | (table['Split'] != 1.0)]
+    table = table.groupby(level=0).agg({'Dividend': 'sum', 'Split': 'prod'})
+    return table.sort_index()
+
+
+def actions_from_bars(data):
+    """
+    Extract the corporate actions embedded in a yfinance history frame.
+
+    Args:
+        data (pd.DataFrame): Bars that may contain 'Dividends' / 'Stock Splits' columns
+
+    Returns:
+        pd.DataFrame: Standard corporate actions table
+    """
+    columns = [col for col in ['Dividends', 'Stock Splits'] if col in data.columns]
+    if not columns:
+        return empty_actions()
+    return normalize_actions(data[columns])
+
+
+def merge_actions(existing, new):
+    """
+    Merge two action tables; entries from `new` replace those on the same date.
+
+    Args:
+        existing (pd.DataFrame): Current actions table
+        new (pd.DataFrame): Actions to add
+
+    Returns:
+        pd.DataFrame: Merged actions table
+    """
+    if existing is None or existing.empty:
+        return normalize_actions(new)
+    new = normalize_actions(new)
+    if new.empty:
+        return existing
+    kept = existing[~existing.index.isin(new.index)]
+    return pd.concat([kept, new]).sort_index()
+
+
+def _action_positions(index, actions):
+    """Position in `index` of the first bar on or after each ex-date."""
+    return np.searchsorted(_as_naive_dates(index).to_numpy(), actions.index.to_numpy(), side='left')
+
+
+def adjustment_factors(index, close, actions, dividends=True):
+    """
+    Compute cumulative price and volume adjustment factors.
+
+    A split with ratio r on ex-date t scales every earlier price by 1/r and
+    every earlier volume by r. A dividend d on ex-date t scales every earlier
+    price by (1 - d / close[t-1]), where close is the raw close. The factor
+    for bar i is the product of all event factors strictly after it, computed
+    as a reverse cumulative product.
+
+    Args:
+        index (pd.DatetimeIndex): Bar timestamps (sorted)
+        close (array-like): Raw (unadjusted) closing prices
+        actions (pd.DataFrame): Corporate actions table
+        dividends (bool): Whether to include dividend adjustments
+
+    Returns:
+        tuple: (price_factor, volume_factor) as NumPy arrays
+    """
+    n = len(index)
+    price_events = np.ones(n + 1)
+    volume_events = np.ones(n + 1)
+
+    if actions is None or actions.empty or n == 0:
+        return price_events[1:], volume_events[1:]
+
+    positions = _action_positions(index, actions)
+    splits = actions['Split'].to_numpy(dtype=float)
+    np.multiply.at(price_events, positions, 1.0 / splits)
+    np.multiply.at(volume_events, positions, splits)
+
+    if dividends:
+        amounts = actions['Dividend'].to_numpy(dtype=float)
+        close = np.asarray(close, dtype=float)
+        has_dividend = (amounts != 0) & (positions > 0)
+        prev_close = close[np.clip(positions - 1, 0, n - 1)]
+        # Dividends are quoted in the share basis of their ex-date, so the
+        # preceding raw close must be expressed in the same (post-split) basis
+        ratio = 1.0 - amounts * splits / prev_close
+        np.multiply.at(price_events, positions[has_dividend], ratio[has_dividend])
+
+    # factor[i] = prod(events[i + 1:])
+    price_factor = np.cumprod(price_events[::-1])[::-1][1:]
+    volume_factor = np.cumprod(volume_events[::-1])[::-1][1:]
+    return price_factor, volume_factor
+
+
+def dividends_to_raw_basis(actions):
+    """
+    Express dividend amounts in the share basis of their ex-date.
+
+    yfinance reports dividends in today's share basis, i.e. already divided
+    by every later split. Multiplying by the product of the later split
+    ratios restores the amount that was actually paid per share.
+
+    Args:
+        actions (pd.DataFrame): Corporate actions table in today's share basis
+
+    Returns:
+        pd.DataFrame: Corporate actions table with raw dividend amounts
+    """
+    if actions is None or actions.empty:
+        return empty_actions()
+
+    splits = actions['Split'].to_numpy(dtype=float)
+    later_splits = np.append(np.cumprod(splits[::-1])[::-1][1:], 1.0)
+    raw_actions = actions.copy()
+    raw_actions['Dividend'] = actions['Dividend'].to_numpy(dtype=float) * later_splits
+    return raw_actions
+
+
+def unadjust_splits(data, actions):
+    """
+    Convert split-adjusted bars (as returned by yfinance) back to raw bars.
+
+    Args:
+        data (pd.DataFrame): Split-adjusted OHLCV bars
+        actions (pd.DataFrame): Corporate actions table
+
+    Returns:
+        pd.DataFrame: Raw bars
+    """
+    price_factor, volume_factor = adjustment_factors(data.index, data['Close'], actions, dividends=False)
+    raw = data.copy()
+    price_cols = [col for col in ['Open', 'High', 'Low', 'Close'] if col in raw.columns]
+    raw[price_cols] = raw[price_cols].to_numpy(dtype=float) / price_factor[:, None]
+    if 'Volume' in raw.columns:
+        raw['Volume'] = raw['Volume'].to_numpy(dtype=float) / volume_factor
+    return raw
+
+
+def apply_adjustments(raw, actions, adjust='all'):
+    """
+    Derive an adjusted view of raw bars.
+
+    Args:
+        raw (pd.DataFrame): Raw OHLCV bars
+        actions (pd.DataFrame): Corporate actions table
+        adjust (str): 'all' for split and dividend adjustment, 'splits' for
+            split adjustment only, or None for raw bars
+
+    Returns:
+        pd.DataFrame: Adjusted bars with an 'Adj Close' column
+    """
+    if adjust not in ('all', 'splits', None):
+        raise ValueError(f"Unknown adjustment mode: {adjust}")
+
+    adjusted = raw.copy()
+    if adjust is not None and actions is not None and not actions.empty:
+        price_factor, volume_factor = adjustment_factors(
+            raw.index, raw['Close'], actions, dividends=(adjust == 'all')
+        )
+        price_cols = [col for col in ['Open', 'High', 'Low', 'Close'] if col in adjusted.columns]
+        adjusted[price_cols] = adjusted[price_cols].to_numpy(dtype=float) * price_factor[:, None]
+        if 'Volume' in adjusted.columns:
+            adjusted['Volume'] = adjusted['Volume'].to_numpy(dtype=float) * volume_factor
+
+    adjusted['Adj Close'] = adjusted['Close']
+    return adjusted
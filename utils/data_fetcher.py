@@ -8,6 +8,14 @@ import os
 from datetime import datetime, timedelta
 import streamlit as st
 from utils.request_throttler import get_throttler
+from utils.data_store import get_data_store
+from utils.resampling import is_intraday, can_derive, resample_ohlcv, INTRADAY_INTERVALS
+from utils.corporate_actions import (
+    normalize_actions,
+    actions_from_bars,
+    dividends_to_raw_basis,
+    unadjust_splits
+)
 
 # Load API keys from environment variables or config
 try:
@@ -68,6 +76,9 @@ def _get_finnhub_data(symbol, start_date, end_date):
 def _get_alpha_vantage_data(symbol, start_date, end_date):
     """
     Fetch data from Alpha Vantage API (Secondary - 5 calls/min, 500/day)
+    
+    TIME_SERIES_DAILY returns raw (unadjusted) bars; adjustment is applied by
+    the data store from the symbol's corporate actions table.
     """
     if not ALPHA_VANTAGE_API_KEY:
         raise Exception("Alpha Vantage API key not configured")
@@ -104,8 +115,7 @@ def _get_alpha_vantage_data(symbol, start_date, end_date):
                 'High': float(values['2. high']),
                 'Low': float(values['3. low']),
                 'Close': float(values['4. close']),
-                'Volume': float(values['5. volume']),
-                'Adj Close': float(values['4. close'])
+                'Volume': float(values['5. volume'])
             })
         
         if not df_data:
@@ -126,10 +136,19 @@ def _get_alpha_vantage_data(symbol, start_date, end_date):
 def _get_yfinance_data(symbol, start_date, end_date):
     """
     Fetch data from yfinance (Fallback - free but has rate limits)
+    
+    Returns raw (unadjusted) bars and the symbol's corporate actions table.
+    yfinance reports prices in today's split basis, so the split adjustment
+    is reversed here to match the raw bars of the other providers.
     """
     try:
         ticker = yf.Ticker(symbol)
-        data = ticker.history(start=start_date, end=end_date + timedelta(days=1))
+        data = ticker.history(
+            start=start_date,
+            end=end_date + timedelta(days=1),
+            auto_adjust=False,
+            actions=True
+        )
         
         if data.empty:
             raise Exception(f"No data found for {symbol}")
@@ -139,7 +158,15 @@ def _get_yfinance_data(symbol, start_date, end_date):
         if not all(col in data.columns for col in required_cols):
             raise Exception(f"Invalid data structure for {symbol}")
         
-        return data
+        # Splits after end_date still affect the reported prices, so prefer
+        # the full action history over the actions inside the window
+        try:
+            actions = normalize_actions(ticker.actions)
+        except Exception:
+            actions = actions_from_bars(data)
+        
+        raw = unadjust_splits(data[required_cols], actions)
+        return raw, dividends_to_raw_basis(actions)
         
     except Exception as e:
         error_str = str(e).lower()
@@ -148,6 +175,43 @@ def _get_yfinance_data(symbol, start_date, end_date):
         raise Exception(f"yfinance error: {str(e)}")
 
 
+# Corporate actions are refetched once a day, like company info
+CORPORATE_ACTIONS_TTL = 86400
+
+
+def _get_corporate_actions(symbol):
+    """
+    Fetch the split/dividend history of a symbol for providers without one.
+    
+    The store's table is reused while it is younger than
+    CORPORATE_ACTIONS_TTL, so newly announced splits and dividends are
+    picked up at most a day late. The request goes through the throttler
+    like every other provider call.
+    
+    Returns:
+        pandas.DataFrame: Corporate actions table (raw share basis), or None
+            if the stored table is fresh or the request failed
+    """
+    age = get_data_store().actions_age(symbol)
+    if age is not None and age < CORPORATE_ACTIONS_TTL:
+        return None  # Still fresh; the store keeps its table
+    
+    throttler = get_throttler()
+    wait_time = throttler.wait_if_needed(symbol)
+    if wait_time:
+        time.sleep(wait_time)
+    
+    try:
+        actions = yf.Ticker(symbol).actions
+        throttler.record_request(symbol)
+        return dividends_to_raw_basis(normalize_actions(actions))
+    except Exception as e:
+        error_str = str(e).lower()
+        if "rate limit" in error_str or "too many" in error_str or "429" in error_str:
+            throttler.record_rate_limit(symbol)
+        return None
+
+
 @st.cache_data(ttl=3600)  # Cache data for 1 hour
 def get_stock_data(symbol, start_date, end_date):
     """
@@ -159,6 +223,11 @@ def get_stock_data(symbol, start_date, end_date):
     
     Finnhub can validate symbols but doesn't provide historical data in free tier.
     
+    Fetched bars are validated and repaired once by the local data store
+    (see utils.data_quality); the quality report is available in
+    ``data.attrs['quality_report']``. Raw bars from every provider are
+    split/dividend adjusted by the store, so histories are interchangeable.
+    
     Args:
         symbol (str): Stock symbol (e.g., AAPL, RELIANCE.NS)
         start_date (datetime): Start date for data
@@ -195,7 +264,7 @@ def get_stock_data(symbol, start_date, end_date):
             data = _get_alpha_vantage_data(symbol, start_date, end_date)
             throttler.record_request(symbol)
             st.success("✅ Data fetched from Alpha Vantage")
-            return data
+            return get_data_store().ingest(symbol, data, actions=_get_corporate_actions(symbol))
         except Exception as e:
             api_errors['Alpha Vantage'] = str(e)
             # Check if rate limited
@@ -205,10 +274,10 @@ def get_stock_data(symbol, start_date, end_date):
     # API 2: Try yfinance (always available)
     try:
         st.info("📡 Fetching from yfinance...")
-        data = _get_yfinance_data(symbol, start_date, end_date)
+        data, actions = _get_yfinance_data(symbol, start_date, end_date)
         throttler.record_request(symbol)
         st.success("✅ Data fetched from yfinance")
-        return data
+        return get_data_store().ingest(symbol, data, actions=actions)
     except Exception as e:
         api_errors['yfinance'] = str(e)
         error_str = str(e).lower()
@@ -268,6 +337,119 @@ def get_stock_data(symbol, start_date, end_date):
             f"• Try a different stock symbol"
         )
 
+# Longest history yfinance serves for each intraday interval
+INTRADAY_MAX_PERIOD = {
+    '1m': '7d',
+    '5m': '60d',
+    '15m': '60d',
+    '30m': '60d',
+    '60m': '730d'
+}
+
+
+# Seconds before stored intraday bars are fetched again
+INTRADAY_TTL = 300
+
+
+def _is_fresh(store, symbol, interval):
+    """Whether bars of an interval were ingested within INTRADAY_TTL."""
+    age = store.bars_age(symbol, interval)
+    return age is not None and age < INTRADAY_TTL
+
+
+@st.cache_data(ttl=INTRADAY_TTL)  # Intraday bars go stale quickly
+def get_intraday_data(symbol, interval='5m'):
+    """
+    Fetch intraday bars from yfinance and ingest them into the data store.
+    
+    Stored bars are reused while they are younger than INTRADAY_TTL. If the
+    interval was never fetched but fresh bars of a finer interval are
+    stored, the bars are resampled locally instead of spending another
+    request. Otherwise the bars are refetched and merged into the store.
+    
+    Args:
+        symbol (str): Stock symbol
+        interval (str): One of '1m', '5m', '15m', '30m', '60m'
+        
+    Returns:
+        pandas.DataFrame: Intraday bars (split/dividend adjusted)
+        
+    Raises:
+        Exception: If the bars cannot be fetched
+    """
+    if interval not in INTRADAY_MAX_PERIOD:
+        raise ValueError(f"Unsupported intraday interval: {interval}")
+    
+    symbol = symbol.strip().upper()
+    store = get_data_store()
+    
+    if _is_fresh(store, symbol, interval):
+        return store.get(symbol, interval)
+    if store.bars_age(symbol, interval) is None and any(
+            _is_fresh(store, symbol, source)
+            for source in INTRADAY_INTERVALS if source != interval and can_derive(source, interval)):
+        return store.get(symbol, interval)
+    
+    throttler = get_throttler()
+    wait_time = throttler.wait_if_needed(symbol)
+    if wait_time:
+        st.info(f"⏳ Waiting {wait_time:.0f}s before retry (respecting API limits)...")
+        time.sleep(wait_time)
+    
+    try:
+        ticker = yf.Ticker(symbol)
+        data = ticker.history(
+            period=INTRADAY_MAX_PERIOD[interval],
+            interval=interval,
+            auto_adjust=False,
+            actions=True
+        )
+        
+        if data.empty:
+            raise Exception(f"No intraday data found for {symbol}")
+        
+        throttler.record_request(symbol)
+        actions = actions_from_bars(data)
+        required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
+        raw = unadjust_splits(data[required_cols], actions)
+        return store.ingest(symbol, raw, interval=interval, actions=dividends_to_raw_basis(actions))
+        
+    except Exception as e:
+        error_str = str(e).lower()
+        if "rate limit" in error_str or "too many" in error_str or "429" in error_str:
+            throttler.record_rate_limit(symbol)
+            raise Exception(f"yfinance rate limit: {str(e)}")
+        raise Exception(f"yfinance intraday error: {str(e)}")
+
+
+def get_interval_data(symbol, interval, daily_data=None):
+    """
+    Get bars for a symbol at any supported interval.
+    
+    Daily and coarser bars are resampled from the stored (or supplied) daily
+    history; intraday bars come from the store or, if nothing fine enough is
+    stored yet, from a single intraday fetch.
+    
+    Args:
+        symbol (str): Stock symbol
+        interval (str): Bar interval, e.g. '5m', '60m', '1d', '1wk'
+        daily_data (pd.DataFrame, optional): Daily bars already loaded by the page
+        
+    Returns:
+        pandas.DataFrame: Bars at the requested interval
+    """
+    if interval == '1d' and daily_data is not None:
+        return daily_data
+    
+    if is_intraday(interval):
+        return get_intraday_data(symbol, interval)
+    
+    data = get_data_store().get(symbol.strip().upper(), interval)
+    if data is None and daily_data is not None:
+        data = resample_ohlcv(daily_data, interval)
+    return data
+
+
 @st.cache_data(ttl=86400)  # Cache for 24 hours
 def get_stock_info(symbol):
     """
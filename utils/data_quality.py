@@ -0,0 +1,191 @@
+"""
+Data quality pipeline for OHLCV bars.
+
+Provider data is validated and repaired once, when it enters the local data
+store, so indicators, charts and models can assume a clean frame: a sorted,
+unique DatetimeIndex, consistent OHLC values and no isolated price spikes.
+Every step is a vectorized mask over the whole frame and the outcome of each
+step is recorded in a quality report attached to the frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+def _robust_zscore(values, window):
+    """
+    Rolling robust z-score based on the median and median absolute deviation.
+
+    Args:
+        values (pd.Series): Input series (typically log returns)
+        window (int): Rolling window size
+
+    Returns:
+        pd.Series: Robust z-scores (NaN until the window is filled)
+    """
+    rolling = values.rolling(window=window, min_periods=max(5, window // 2))
+    median = rolling.median()
+    mad = (values - median).abs().rolling(window=window, min_periods=max(5, window // 2)).median()
+
+    # 1.4826 scales the MAD to the standard deviation of a normal distribution
+    scale = (1.4826 * mad).replace(0, np.nan)
+    return (values - median) / scale
+
+
+def validate_ohlcv(data, outlier_window=21, outlier_threshold=8.0, max_fill_gap=3):
+    """
+    Validate and repair a frame of OHLCV bars.
+
+    The pipeline runs, in order: index normalisation (sorting and a monotonic
+    check), removal of duplicate timestamps, masking of non-positive prices,
+    OHLC consistency repair, rolling robust z-score outlier detection on close
+    log returns, and a forward-fill policy for the gaps that remain.
+
+    Isolated spikes (a flagged return immediately reversed by an opposite
+    flagged return) are treated as bad prints and replaced by the previous
+    bar. Persistent jumps are only flagged, since they are usually corporate
+    actions that the adjustment step should handle.
+
+    Args:
+        data (pd.DataFrame): Raw bars with Open/High/Low/Close/Volume columns
+        outlier_window (int): Window size for the robust z-score
+        outlier_threshold (float): Absolute z-score above which a return is flagged
+        max_fill_gap (int): Maximum number of consecutive bars to forward-fill
+
+    Returns:
+        tuple: (clean_data, report) where report is a dict describing every repair
+    """
+    report = {
+        'rows_in': len(data),
+        'rows_out': 0,
+        'was_monotonic': True,
+        'duplicates_removed': 0,
+        'non_positive_prices': 0,
+        'ohlc_violations': 0,
+        'zero_volume_bars': 0,
+        'outliers': [],
+        'spikes_repaired': 0,
+        'values_filled': 0,
+        'rows_dropped': 0,
+        'issues': 0
+    }
+
+    if data is None or data.empty:
+        return data, report
+
+    df = data.copy()
+
+    # Index normalisation
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
+    df.index.name = 'Date'
+
+    report['was_monotonic'] = bool(df.index.is_monotonic_increasing)
+    if not report['was_monotonic']:
+        df = df.sort_index(kind='mergesort')
+
+    duplicated = df.index.duplicated(keep='last')
+    report['duplicates_removed'] = int(duplicated.sum())
+    if report['duplicates_removed']:
+        df = df[~duplicated]
+
+    price_cols = [col for col in PRICE_COLUMNS if col in df.columns]
+    prices = df[price_cols].to_numpy(dtype=float, copy=True)
+
+    # Non-positive prices are never valid
+    non_positive = prices <= 0
+    report['non_positive_prices'] = int(non_positive.sum())
+    prices[non_positive] = np.nan
+
+    # OHLC consistency: High must be the bar maximum and Low the bar minimum
+    if len(price_cols) == 4:
+        o, h, l, c = prices.T
+        with np.errstate(invalid='ignore'):
+            violation = (h < l) | (h < np.fmax(o, c)) | (l > np.fmin(o, c))
+        report['ohlc_violations'] = int(violation.sum())
+
+        if report['ohlc_violations']:
+            bar_max = np.fmax(np.fmax(o, h), np.fmax(l, c))
+            bar_min = np.fmin(np.fmin(o, h), np.fmin(l, c))
+            prices[violation, 1] = bar_max[violation]
+            prices[violation, 2] = bar_min[violation]
+
+    df[price_cols] = prices
+
+    if 'Volume' in df.columns:
+        volume = df['Volume'].to_numpy(dtype=float)
+        report['zero_volume_bars'] = int((volume == 0).sum())
+
+    # Outlier detection on close-to-close log returns
+    if 'Close' in df.columns and len(df) > outlier_window:
+        log_returns = np.log(df['Close']).diff()
+        zscore = _robust_zscore(log_returns, outlier_window)
+        flagged = (zscore.abs() > outlier_threshold).to_numpy()
+        report['outliers'] = list(df.index[flagged])
+
+        # A spike is a flagged move that is reversed by the next bar
+        signs = np.sign(log_returns.to_numpy())
+        reversed_next = np.zeros(len(df), dtype=bool)
+        reversed_next[:-1] = flagged[1:] & (signs[1:] == -signs[:-1])
+        spikes = flagged & reversed_next
+        report['spikes_repaired'] = int(spikes.sum())
+
+        if report['spikes_repaired']:
+            df.loc[spikes, price_cols] = np.nan
+
+    # Forward-fill policy: fill short gaps, drop bars that remain unusable
+    missing_before = int(df[price_cols].isna().to_numpy().sum())
+    df[price_cols] = df[price_cols].ffill(limit=max_fill_gap)
+    missing_after = int(df[price_cols].isna().to_numpy().sum())
+    report['values_filled'] = missing_before - missing_after
+
+    unusable = df['Close'].isna() if 'Close' in df.columns else df[price_cols].isna().all(axis=1)
+    report['rows_dropped'] = int(unusable.sum())
+    if report['rows_dropped']:
+        df = df[~unusable.to_numpy()]
+
+    report['rows_out'] = len(df)
+    report['issues'] = (
+        report['duplicates_removed'] + report['non_positive_prices'] +
+        report['ohlc_violations'] + len(report['outliers']) + report['rows_dropped'] +
+        int(not report['was_monotonic'])
+    )
+
+    df.attrs['quality_report'] = report
+    return df, report
+
+
+def summarize_quality_report(report):
+    """
+    Build a short human-readable summary of a quality report.
+
+    Args:
+        report (dict): Report returned by validate_ohlcv
+
+    Returns:
+        list: List of summary strings, empty if no issues were found
+    """
+    if not report:
+        return []
+
+    lines = []
+    if not report.get('was_monotonic', True):
+        lines.append("Bars were out of order and have been sorted")
+    if report.get('duplicates_removed'):
+        lines.append(f"{report['duplicates_removed']} duplicate bars removed")
+    if report.get('non_positive_prices'):
+        lines.append(f"{report['non_positive_prices']} non-positive prices masked")
+    if report.get('ohlc_violations'):
+        lines.append(f"{report['ohlc_violations']} bars with inconsistent High/Low repaired")
+    if report.get('spikes_repaired'):
+        lines.append(f"{report['spikes_repaired']} isolated price spikes replaced")
+    if report.get('outliers'):
+        lines.append(f"{len(report['outliers'])} outlier returns flagged")
+    if report.get('zero_volume_bars'):
+        lines.append(f"{report['zero_volume_bars']} zero-volume bars")
+    if report.get('rows_dropped'):
+        lines.append(f"{report['rows_dropped']} unusable bars dropped")
+
+    return lines
@@ -0,0 +1,263 @@
+"""
+Local market data store.
+Holds validated raw bars and corporate actions per symbol so that data
+quality checks run once at ingest instead of on every page render, and
+adjusted series are derived on read.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from utils.data_quality import validate_ohlcv
+from utils.corporate_actions import apply_adjustments, empty_actions, merge_actions
+from utils.resampling import INTERVALS, can_derive, resample_ohlcv
+
+
+def align_timezone(data: pd.DataFrame, reference: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    Express a frame's index in the timezone convention of a reference index.
+
+    Providers disagree on timestamps: yfinance returns exchange-local
+    tz-aware bars while Alpha Vantage returns naive exchange-local ones.
+    Naive bars are localized to the reference timezone and aware bars are
+    converted to it (or to naive wall time when the reference is naive),
+    so the two histories can be merged and compared.
+
+    Args:
+        data: Bars to convert
+        reference: Index whose timezone convention to adopt
+
+    Returns:
+        The bars with an index comparable to `reference`
+    """
+    index = data.index
+    if not isinstance(index, pd.DatetimeIndex) or index.tz == reference.tz:
+        return data
+    if reference.tz is None:
+        index = index.tz_localize(None)
+    elif index.tz is None:
+        index = index.tz_localize(reference.tz, ambiguous='NaT', nonexistent='shift_forward')
+    else:
+        index = index.tz_convert(reference.tz)
+    data = data.set_axis(index)
+    return data[index.notna()] if index.hasnans else data
+
+
+class MarketDataStore:
+    """
+    In-process store of cleaned OHLCV bars keyed by (symbol, interval).
+    Every frame passes through the data quality pipeline exactly once, when
+    it is ingested. Bars are stored unadjusted next to a corporate actions
+    table; split/dividend adjusted views are computed when read and cached
+    until the bars or the actions change. Intervals that were never fetched
+    are derived from finer stored bars by the resampler.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self.bars: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self.reports: Dict[Tuple[str, str], dict] = {}
+        self.ingested: Dict[Tuple[str, str], float] = {}
+        self.actions: Dict[str, pd.DataFrame] = {}
+        self.actions_fetched: Dict[str, float] = {}
+        self.adjusted: Dict[Tuple[str, str, Optional[str]], pd.DataFrame] = {}
+        self.lock = threading.Lock()
+
+    def _invalidate(self, symbol: str):
+        """Drop cached adjusted views for a symbol (caller holds the lock)."""
+        for key in [key for key in self.adjusted if key[0] == symbol]:
+            del self.adjusted[key]
+
+    def ingest(self, symbol: str, data: pd.DataFrame, interval: str = '1d',
+               actions: Optional[pd.DataFrame] = None, adjust: Optional[str] = 'all') -> pd.DataFrame:
+        """
+        Validate, repair and store a frame of raw bars.
+
+        New bars are merged with any history already stored for the symbol,
+        with incoming bars taking precedence on overlapping timestamps.
+        Incoming timestamps adopt the timezone convention of the stored
+        history, so bars from different providers merge.
+
+        Args:
+            symbol: Stock symbol
+            data: Raw (unadjusted) OHLCV bars from a provider
+            interval: Bar interval (e.g. '1d')
+            actions: Optional corporate actions table for the symbol, as
+                fetched from a provider (restarts its actions_age)
+            adjust: Adjustment mode of the returned view ('all', 'splits' or None)
+
+        Returns:
+            The ingested date range, adjusted according to `adjust`
+        """
+        clean, report = validate_ohlcv(data)
+
+        key = (symbol, interval)
+        with self.lock:
+            existing = self.bars.get(key)
+            if existing is not None and not existing.empty:
+                clean = align_timezone(clean, existing.index)
+                merged = pd.concat([existing[~existing.index.isin(clean.index)], clean])
+                merged = merged.sort_index(kind='mergesort')
+            else:
+                merged = clean
+            merged.attrs = {'symbol': symbol, 'interval': interval, 'quality_report': report}
+            self.bars[key] = merged
+            self.reports[key] = report
+            self.ingested[key] = time.time()
+
+            if actions is not None:
+                self.actions[symbol] = merge_actions(self.actions.get(symbol), actions)
+                self.actions_fetched[symbol] = time.time()
+            self._invalidate(symbol)
+
+        if clean.empty:
+            return clean
+        return self.get(symbol, interval, start=clean.index[0], end=clean.index[-1], adjust=adjust)
+
+    def get(self, symbol: str, interval: str = '1d', start=None, end=None,
+            adjust: Optional[str] = 'all') -> Optional[pd.DataFrame]:
+        """
+        Get stored bars for a symbol.
+
+        If the interval was never ingested but finer bars are stored, the
+        bars are derived from the finest stored resolution. Older buckets
+        that the finest source does not cover are filled from coarser
+        sources, so a weekly view built from 60 days of 5-minute bars still
+        covers the whole daily history.
+
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval
+            start: Optional inclusive start timestamp
+            end: Optional inclusive end timestamp
+            adjust: 'all' (splits and dividends), 'splits', or None for raw bars
+
+        Returns:
+            Stored bars, or None if the symbol has no usable bars
+        """
+        cache_key = (symbol, interval, adjust)
+        with self.lock:
+            data = self.adjusted.get(cache_key)
+            raw = self.bars.get((symbol, interval))
+            sources = [
+                source for source in INTERVALS
+                if (symbol, source) in self.bars and can_derive(source, interval)
+            ]
+
+            if data is None and raw is not None:
+                if adjust is None:
+                    data = raw
+                else:
+                    data = apply_adjustments(raw, self.actions.get(symbol), adjust=adjust)
+                    data.attrs = dict(raw.attrs)
+                    self.adjusted[cache_key] = data
+
+        if data is None and raw is None:
+            if not sources:
+                return None
+            data = self._derive(symbol, interval, sources, adjust)
+            with self.lock:
+                self.adjusted[cache_key] = data
+
+        if start is not None or end is not None:
+            data = data.loc[start:end]
+        return data
+
+    def _derive(self, symbol: str, interval: str, sources, adjust: Optional[str]) -> pd.DataFrame:
+        """Resample `interval` bars from stored finer sources (finest first)."""
+        derived = None
+        for source in sources:
+            bars = resample_ohlcv(self.get(symbol, source, adjust=adjust), interval)
+            if derived is None:
+                derived = bars
+            elif not bars.empty and (bars.index.tz is None) == (derived.index.tz is None):
+                # The first bucket of a finer source may be partial; prefer the coarser source there
+                first, last = derived.index[0], derived.index[-1]
+                derived = pd.concat([
+                    bars[bars.index <= first],
+                    derived[derived.index > first],
+                    bars[bars.index > last]
+                ])
+        return derived
+
+    def get_corporate_actions(self, symbol: str) -> pd.DataFrame:
+        """Get the corporate actions table for a symbol."""
+        with self.lock:
+            actions = self.actions.get(symbol)
+        return actions if actions is not None else empty_actions()
+
+    def bars_age(self, symbol: str, interval: str = '1d') -> Optional[float]:
+        """
+        Seconds since bars of a symbol and interval were last ingested.
+
+        Returns:
+            Age in seconds, or None if the interval was never ingested
+        """
+        with self.lock:
+            ingested = self.ingested.get((symbol, interval))
+        return None if ingested is None else time.time() - ingested
+
+    def actions_age(self, symbol: str) -> Optional[float]:
+        """
+        Seconds since a provider's corporate actions were last ingested for a symbol.
+
+        Returns:
+            Age in seconds, or None if no actions were ever ingested
+        """
+        with self.lock:
+            fetched = self.actions_fetched.get(symbol)
+        return None if fetched is None else time.time() - fetched
+
+    def add_corporate_action(self, symbol: str, date, dividend: float = 0.0, split: float = 1.0):
+        """
+        Register a split or dividend for a symbol.
+
+        Stored bars are raw, so only the action table changes; adjusted views
+        pick up the new factor on the next read without refetching history.
+
+        Args:
+            symbol: Stock symbol
+            date: Ex-date of the action
+            dividend: Cash dividend per share (in the ex-date share basis)
+            split: Split ratio (e.g. 2.0 for a 2-for-1 split)
+        """
+        action = pd.DataFrame({'Dividend': [dividend], 'Split': [split]}, index=pd.DatetimeIndex([date]))
+        with self.lock:
+            self.actions[symbol] = merge_actions(self.actions.get(symbol), action)
+            self._invalidate(symbol)
+
+    def quality_report(self, symbol: str, interval: str = '1d') -> Optional[dict]:
+        """Get the quality report from the most recent ingest of a symbol."""
+        with self.lock:
+            return self.reports.get((symbol, interval))
+
+    def clear(self, symbol: Optional[str] = None):
+        """Remove one symbol (all intervals) or everything from the store."""
+        with self.lock:
+            if symbol is None:
+                self.bars.clear()
+                self.reports.clear()
+                self.ingested.clear()
+                self.actions.clear()
+                self.actions_fetched.clear()
+                self.adjusted.clear()
+                return
+            for key in [key for key in self.bars if key[0] == symbol]:
+                del self.bars[key]
+                self.reports.pop(key, None)
+                self.ingested.pop(key, None)
+            self.actions.pop(symbol, None)
+            self.actions_fetched.pop(symbol, None)
+            self._invalidate(symbol)
+
+
+# Global store instance
+_store = MarketDataStore()
+
+
+def get_data_store() -> MarketDataStore:
+    """Get the global market data store instance."""
+    return _store
@@ -0,0 +1,144 @@
+"""
+Server-side cache of built Plotly figures.
+
+Streamlit reruns the whole page on every widget interaction, so without a
+cache each rerun rebuilds every chart even when the symbol, range and
+chart options are unchanged. Figures are stored as serialized JSON, keyed
+by a content fingerprint of the input data plus the chart options, in an
+LRU cache shared by all pages and sessions. A hit only deserializes the
+stored JSON; pages can keep modifying the returned figure because every
+caller gets its own copy.
+
+    @memoize_figure
+    def plot_something(data, option=1):
+        ...
+"""
+
+import functools
+import hashlib
+import json
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from utils.indicator_cache import ResultCache
+
+
+def _series_fingerprint(series: pd.Series):
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        values = np.ascontiguousarray(series.to_numpy(dtype=float))
+    else:
+        # Dates, strings, categories: hash every value instead
+        values = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    digest = hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+    ends = (series.index[0], series.index[-1]) if len(series) else ()
+    return ('series', series.name, len(series)) + ends + (digest,)
+
+
+def _key_part(value):
+    """Hashable stand-in for a figure builder argument."""
+    if isinstance(value, pd.DataFrame):
+        # Every column counts: candles change with High/Low/Volume, not just Close
+        numeric = value.select_dtypes('number')
+        attrs = (value.attrs.get('symbol'), value.attrs.get('interval'))
+        return attrs + tuple(_series_fingerprint(numeric[column]) for column in numeric.columns)
+    if isinstance(value, pd.Series):
+        return _series_fingerprint(value)
+    if isinstance(value, np.ndarray):
+        values = np.ascontiguousarray(value)
+        return ('array', values.shape, str(values.dtype), hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest())
+    if isinstance(value, dict):
+        return tuple(sorted((key, _key_part(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_key_part(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def figure_from_json(payload: str, grid=None) -> go.Figure:
+    """
+    Rebuild a figure from JSON stored by this cache.
+
+    The payload was produced from a validated figure, so it is loaded
+    without re-validating every property (about 10x faster); validation is
+    switched back on for any changes the caller makes afterwards.
+
+    Args:
+        payload (str): Figure JSON
+        grid (tuple, optional): (grid_ref, grid_str) of a make_subplots
+            figure, which JSON does not carry; without it traces can no
+            longer be added by row and col
+    """
+    # Relies on plotly internals (checked with plotly 6 and 7, the range
+    # requirements.txt allows): go.Figure accepts '_grid_ref'/'_grid_str' in
+    # its dict argument, as in the figures make_subplots builds, and every
+    # object checks its private _validate flag on assignment. Only the
+    # figure, its layout and its traces are built unvalidated; nested objects
+    # are created validated when first accessed. If a plotly release changes
+    # either, the figure is rebuilt through the public, validating
+    # constructor instead. benchmark_charts.check_cached_subplots covers both.
+    try:
+        spec = json.loads(payload)
+        if grid is not None:
+            spec['_grid_ref'], spec['_grid_str'] = grid
+        fig = go.Figure(spec, _validate=False)
+        for obj in (fig, fig.layout, *fig.data):
+            obj._validate = True
+        return fig
+    except (AttributeError, KeyError, TypeError, ValueError):
+        fig = go.Figure(json.loads(payload))
+        if grid is not None:
+            fig._grid_ref, fig._grid_str = grid
+        return fig
+
+
+def _serialize(fig: go.Figure):
+    # The subplot grid lives in private attributes that to_json() leaves out
+    grid_ref = getattr(fig, '_grid_ref', None)
+    grid = (grid_ref, fig._grid_str) if grid_ref is not None else None
+    return fig.to_json(), grid
+
+
+def memoize_figure(func: Optional[Callable] = None, *, name: Optional[str] = None):
+    """
+    Decorator caching the JSON (and subplot grid) of the figure a chart builder returns.
+
+    The key is the builder name plus every argument, with DataFrames,
+    Series and arrays replaced by content fingerprints, so an unchanged
+    rerun gets the stored figure without recomputing indicators or
+    rebuilding traces. Arguments that cannot be keyed skip the cache.
+
+    Args:
+        func (Callable): Function returning a plotly Figure
+        name (str, optional): Cache name (defaults to the function's qualified name)
+    """
+    def decorator(inner):
+        cache_name = name or f"{inner.__module__}.{inner.__qualname__}"
+
+        @functools.wraps(inner)
+        def wrapper(*args, **kwargs):
+            try:
+                key = (cache_name, _key_part(args), _key_part(kwargs))
+                hash(key)
+            except (TypeError, ValueError):
+                # Arguments that cannot be keyed: build without the cache
+                return inner(*args, **kwargs)
+            payload, grid = get_figure_cache().get_or_compute(key, lambda: _serialize(inner(*args, **kwargs)))
+            return figure_from_json(payload, grid)
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+# Global figure cache shared by all pages and sessions; figures are large,
+# so it keeps fewer entries than the indicator result cache
+_figure_cache = ResultCache(max_entries=32)
+
+
+def get_figure_cache() -> ResultCache:
+    """Get the global figure cache."""
+    return _figure_cache
@@ -0,0 +1,213 @@
+"""
+Content-addressed memoization of indicator results.
+
+Results are keyed by a cheap fingerprint of the input frame (symbol,
+interval, length, first/last index and a hash of the OHLCV columns) plus
+the indicator name and parameters, and kept in one process-wide LRU
+cache. Any page or session that asks for the same indicator on the same
+data, even through a different DataFrame object, gets the stored result
+instead of recomputing it; a Streamlit rerun that does not change the
+inputs skips the computation entirely.
+"""
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Columns hashed into a frame fingerprint by default
+FINGERPRINT_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume')
+
+# Copy-on-write is always on from pandas 3; before that, a shallow copy
+# shares (and lets callers modify) the cached data
+_COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3
+
+
+def frame_fingerprint(data: pd.DataFrame, columns: Iterable[str] = FINGERPRINT_COLUMNS) -> Tuple:
+    """
+    Compute a cheap content fingerprint of a price frame.
+
+    Every column a result depends on must be hashed, otherwise frames that
+    only differ in an unhashed column share cached results.
+
+    Args:
+        data (pd.DataFrame): Stock data
+        columns (iterable): Columns to hash; those missing from the frame are skipped
+
+    Returns:
+        tuple: (symbol, interval, length, first index, last index, hashed
+            columns, content hash)
+    """
+    if data.empty:
+        return (data.attrs.get('symbol'), data.attrs.get('interval'), 0)
+
+    hashed = tuple(column for column in columns if column in data.columns)
+    hasher = hashlib.blake2b(digest_size=16)
+    for column in hashed:
+        hasher.update(np.ascontiguousarray(data[column].to_numpy(dtype=float)).tobytes())
+    return (
+        data.attrs.get('symbol'),
+        data.attrs.get('interval'),
+        len(data),
+        data.index[0],
+        data.index[-1],
+        hashed,
+        hasher.hexdigest()
+    )
+
+
+def detach(value):
+    """
+    Return a view of a cached value that callers can modify freely.
+
+    DataFrames and Series get shallow copies where copy-on-write keeps them
+    independent of the cached object (pandas >= 3) and deep copies
+    otherwise; arrays are copied and containers are detached recursively.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not _COPY_ON_WRITE)
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, list):
+        return [detach(item) for item in value]
+    if isinstance(value, dict):
+        return {key: detach(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return tuple(detach(item) for item in value)
+    return value
+
+
+class ResultCache:
+    """Thread-safe LRU cache of computed results."""
+
+    _MISSING = object()
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of results kept
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        """
+        Look up a result, marking it as recently used.
+
+        Args:
+            key (Hashable): Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached result, or `default`
+        """
+        with self.lock:
+            value = self.entries.get(key, self._MISSING)
+            if value is self._MISSING:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value):
+        """
+        Store a result, evicting the least recently used ones beyond max_entries.
+
+        Args:
+            key (Hashable): Cache key
+            value: Result to store
+        """
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable):
+        """Return the cached value for key, computing and storing it on a miss."""
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drop every result and reset the hit/miss counters."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache usage counters.
+
+        Returns:
+            dict: 'entries', 'hits' and 'misses'
+        """
+        with self.lock:
+            return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
+
+
+def _freeze(value):
+    """Hashable stand-in for dict/list/set arguments used in cache keys."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def memoize_by_frame(func: Optional[Callable] = None, *, name: Optional[str] = None,
+                     columns: Iterable[str] = FINGERPRINT_COLUMNS):
+    """
+    Decorator memoizing a function whose first argument is a price frame.
+
+    The key is the frame fingerprint plus the function name and the other
+    arguments (dicts and lists are frozen). Callers receive detached copies,
+    so modifying a returned frame never alters the cached result.
+
+    Args:
+        func (Callable): Function taking (data, *args, **kwargs)
+        name (str, optional): Cache name (defaults to the function's qualified name)
+        columns (iterable): Columns the result depends on (default: all OHLCV columns)
+    """
+    columns = tuple(columns)
+
+    def decorator(inner):
+        cache_name = name or f"{inner.__module__}.{inner.__qualname__}"
+
+        @functools.wraps(inner)
+        def wrapper(data, *args, **kwargs):
+            try:
+                key = (frame_fingerprint(data, columns), cache_name, _freeze(args), _freeze(kwargs))
+                hash(key)
+            except TypeError:
+                # Arguments that cannot be frozen: compute directly
+                return inner(data, *args, **kwargs)
+            return detach(get_result_cache().get_or_compute(key, lambda: inner(data, *args, **kwargs)))
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+# Global result cache shared by all pages and sessions
+_result_cache = ResultCache()
+
+
+def get_result_cache() -> ResultCache:
+    """Get the global result cache."""
+    return _result_cache
@@ -0,0 +1,343 @@
+"""
+Indicator computation graph with shared intermediates.
+
+Indicators are declared as nodes over one OHLCV frame. A node computes its
+value from other nodes through the engine, so shared intermediates such as
+close-to-close deltas, true range, rolling means or EMAs are computed once
+per data version and memoized. For example Bollinger Bands reuse the SMA
+node, RSI and returns reuse the delta node, and ATR reuses true range.
+
+Node results are also stored in the process-wide result cache under the
+frame's content fingerprint (a hash of all its OHLCV columns), so other
+frames with the same data (another page, session or rerun) reuse them
+without recomputing. Values are returned detached, so callers can modify
+them without corrupting the memo.
+
+    engine = get_engine(data)
+    values = engine.compute(['rsi', ('sma', {'window': 50}), 'macd'])
+"""
+
+import threading
+import weakref
+from typing import Callable, Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils import kernels
+from utils.indicator_cache import _freeze, detach, frame_fingerprint, get_result_cache
+from utils.resampling import bucket_labels
+
+_NODES: Dict[str, Callable] = {}
+
+# OHLCV columns exposed as source nodes
+_COLUMNS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+
+def indicator(name: str):
+    """
+    Decorator declaring an indicator node.
+
+    The decorated function receives the engine plus keyword parameters and
+    must obtain its inputs through engine.get(), so they are shared.
+
+    Args:
+        name (str): Node name used in engine.get() and engine.compute()
+    """
+    def decorator(func):
+        _NODES[name] = func
+        return func
+    return decorator
+
+
+class IndicatorEngine:
+    """Evaluates indicator nodes over one OHLCV frame, memoizing every node."""
+
+    def __init__(self, data: pd.DataFrame):
+        """
+        Initialize the engine.
+
+        Args:
+            data (pd.DataFrame): Stock data with OHLCV columns
+        """
+        # Held weakly: the engine registry must not keep frames alive
+        self._data = weakref.ref(data)
+        self.version = frame_fingerprint(data)
+        self.memo: Dict[Tuple, object] = {}
+        self.lock = threading.RLock()
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """The frame the engine evaluates."""
+        data = self._data()
+        if data is None:
+            raise ReferenceError("The engine's DataFrame has been garbage collected")
+        return data
+
+    def get(self, name: str, **params):
+        """
+        Get the value of one node, computing it and its inputs at most once.
+
+        Args:
+            name (str): Node name ('sma', 'rsi', 'macd', ...)
+            **params: Node parameters (e.g. window=20)
+
+        Returns:
+            pd.Series or tuple of pd.Series: Node value
+        """
+        key = (name, _freeze(params))
+        with self.lock:
+            if key not in self.memo:
+                if name in _COLUMNS:
+                    self.memo[key] = self.data[_COLUMNS[name]]
+                elif name in _NODES:
+                    self.memo[key] = get_result_cache().get_or_compute(
+                        (self.version, 'indicator_engine') + key,
+                        lambda: _NODES[name](self, **params)
+                    )
+                else:
+                    raise KeyError(f"Unknown indicator: {name}")
+            return detach(self.memo[key])
+
+    def compute(self, requests: Iterable) -> Dict[str, object]:
+        """
+        Compute a set of indicators in one call.
+
+        Args:
+            requests (iterable): Node names, or (name, params) pairs
+
+        Returns:
+            dict: Label (e.g. 'sma(window=50)') -> node value
+        """
+        results = {}
+        for request in requests:
+            name, params = (request, {}) if isinstance(request, str) else request
+            results[label(name, params)] = self.get(name, **params)
+        return results
+
+
+def label(name: str, params: Dict) -> str:
+    """Readable label of a node request, e.g. 'sma(window=50)'."""
+    if not params:
+        return name
+    args = ', '.join(f"{key}={value}" for key, value in sorted(params.items()))
+    return f"{name}({args})"
+
+
+# Engines per live DataFrame, dropped when the frame is garbage collected
+_engines: Dict[int, Tuple[weakref.ref, IndicatorEngine]] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(data: pd.DataFrame) -> IndicatorEngine:
+    """
+    Get the shared engine for a DataFrame.
+
+    Every caller passing the same frame shares one memo, so a page that
+    plots and then summarizes indicators computes each of them once.
+
+    Args:
+        data (pd.DataFrame): Stock data with OHLCV columns
+
+    Returns:
+        IndicatorEngine: Engine bound to the frame's current version
+    """
+    key = id(data)
+    with _engines_lock:
+        entry = _engines.get(key)
+        if entry is not None and entry[0]() is data and entry[1].version == frame_fingerprint(data):
+            return entry[1]
+
+        engine = IndicatorEngine(data)
+        ref = weakref.ref(data, lambda _, key=key: _engines.pop(key, None))
+        _engines[key] = (ref, engine)
+        return engine
+
+
+# Shared intermediates
+
+@indicator('delta')
+def _delta(engine):
+    return engine.get('close').diff()
+
+
+@indicator('returns')
+def _returns(engine):
+    return engine.get('close').pct_change()
+
+
+@indicator('range')
+def _range(engine):
+    return engine.get('high') - engine.get('low')
+
+
+@indicator('true_range')
+def _true_range(engine):
+    prev_close = engine.get('close').shift(1)
+    high = engine.get('high')
+    low = engine.get('low')
+    # fmax skips NaN, so the first bar falls back to High - Low
+    tr = np.fmax(engine.get('range'), np.fmax((high - prev_close).abs(), (low - prev_close).abs()))
+    return pd.Series(tr, index=engine.data.index)
+
+
+@indicator('typical_price')
+def _typical_price(engine):
+    return (engine.get('high') + engine.get('low') + engine.get('close')) / 3
+
+
+@indicator('price_volume')
+def _price_volume(engine):
+    # Typical price and volume with bars missing either zeroed out
+    price = engine.get('typical_price').to_numpy(dtype=float)
+    volume = engine.get('volume').to_numpy(dtype=float)
+    valid = np.isfinite(price) & np.isfinite(volume)
+    return np.where(valid, price, 0.0), np.where(valid, volume, 0.0)
+
+
+def _running_totals(*values):
+    """Cumulative sums with a leading zero, so totals over bars a..b are t[b + 1] - t[a]."""
+    totals = np.zeros((len(values), len(values[0]) + 1))
+    for row, value in zip(totals, values):
+        np.cumsum(value, out=row[1:])
+    return totals
+
+
+@indicator('rolling')
+def _rolling(engine, source='close', window=20, stat='mean'):
+    return getattr(engine.get(source).rolling(window=window), stat)()
+
+
+@indicator('ewm')
+def _ewm(engine, source='close', span=20):
+    return engine.get(source).ewm(span=span, adjust=False).mean()
+
+
+# Indicators
+
+@indicator('sma')
+def _sma(engine, window=20, source='close'):
+    return engine.get('rolling', source=source, window=window, stat='mean')
+
+
+@indicator('ema')
+def _ema(engine, window=20, source='close'):
+    return engine.get('ewm', source=source, span=window)
+
+
+@indicator('std')
+def _std(engine, window=20, source='close'):
+    return engine.get('rolling', source=source, window=window, stat='std')
+
+
+@indicator('bollinger')
+def _bollinger(engine, window=20, num_std=2):
+    middle_band = engine.get('sma', window=window)
+    std_dev = engine.get('std', window=window)
+    return middle_band + (std_dev * num_std), middle_band, middle_band - (std_dev * num_std)
+
+
+@indicator('rsi')
+def _rsi(engine, window=14):
+    delta = engine.get('delta')
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+
+    avg_gain = gain.rolling(window=window).mean()
+    avg_loss = loss.rolling(window=window).mean()
+
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+@indicator('macd')
+def _macd(engine, fast_period=12, slow_period=26, signal_period=9):
+    macd_line = engine.get('ema', window=fast_period) - engine.get('ema', window=slow_period)
+    signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+    return macd_line, signal_line, macd_line - signal_line
+
+
+@indicator('atr')
+def _atr(engine, window=14):
+    return engine.get('rolling', source='true_range', window=window, stat='mean')
+
+
+@indicator('obv')
+def _obv(engine):
+    direction = np.sign(engine.get('delta')).fillna(0)
+    return (direction * engine.get('volume')).cumsum()
+
+
+@indicator('vwap')
+def _vwap(engine, session='1d'):
+    # VWAP and volume-weighted standard deviation, restarted every session.
+    # Session totals are differences of running totals over the whole
+    # history; prices are taken relative to the session's first bar so the
+    # squared terms stay small and the variance keeps its precision.
+    index = engine.data.index
+    price, volume = engine.get('price_volume')
+    if session is None:
+        starts = np.zeros(len(index), dtype=np.intp)
+    else:
+        keys = bucket_labels(index, session).asi8
+        new_session = np.ones(len(keys), dtype=bool)
+        new_session[1:] = keys[1:] != keys[:-1]
+        # Position of each bar's session start
+        starts = np.maximum.accumulate(np.where(new_session, np.arange(len(keys)), 0))
+
+    offset = price - price[starts]
+    totals = _running_totals(volume, volume * offset, volume * offset * offset)
+    session_volume, offset_volume, square_volume = totals[:, 1:] - totals[:, starts]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_offset = offset_volume / session_volume
+        variance = np.maximum(square_volume / session_volume - mean_offset * mean_offset, 0.0)
+    return pd.Series(price[starts] + mean_offset, index=index), pd.Series(np.sqrt(variance), index=index)
+
+
+@indicator('anchored_vwap')
+def _anchored_vwap(engine, anchors=()):
+    # VWAP from each anchor position on; every anchor reuses the same running totals
+    index = engine.data.index
+    price, volume = engine.get('price_volume')
+    totals = _running_totals(volume, volume * price)
+    anchors = np.asarray(anchors, dtype=np.intp)
+    anchored_volume = totals[0, None, 1:] - totals[0, anchors, None]
+    anchored_price_volume = totals[1, None, 1:] - totals[1, anchors, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vwap = np.where(np.arange(len(index))[None, :] >= anchors[:, None],
+                        anchored_price_volume / anchored_volume, np.nan)
+    return pd.DataFrame(vwap.T, index=index, columns=index[anchors])
+
+
+# Recursive indicators, computed by the kernels module's active backend
+
+@indicator('rsi_wilder')
+def _rsi_wilder(engine, window=14):
+    rsi = kernels.wilder_rsi(engine.get('close').to_numpy(dtype=float), window)
+    return pd.Series(rsi, index=engine.data.index)
+
+
+@indicator('atr_wilder')
+def _atr_wilder(engine, window=14):
+    atr = kernels.wilder_smooth(engine.get('true_range').to_numpy(dtype=float), window)
+    return pd.Series(atr, index=engine.data.index)
+
+
+@indicator('psar')
+def _psar(engine, step=0.02, max_step=0.2):
+    sar, trend = kernels.parabolic_sar(
+        engine.get('high').to_numpy(dtype=float), engine.get('low').to_numpy(dtype=float), step, max_step
+    )
+    return pd.Series(sar, index=engine.data.index), pd.Series(trend, index=engine.data.index)
+
+
+@indicator('supertrend')
+def _supertrend(engine, window=10, multiplier=3):
+    line, trend = kernels.supertrend(
+        engine.get('high').to_numpy(dtype=float),
+        engine.get('low').to_numpy(dtype=float),
+        engine.get('close').to_numpy(dtype=float),
+        engine.get('atr_wilder', window=window).to_numpy(dtype=float),
+        multiplier
+    )
+    return pd.Series(line, index=engine.data.index), pd.Series(trend, index=engine.data.index)
@@ -0,0 +1,363 @@
+"""
+Compiled kernels for recursive indicators.
+
+Wilder smoothing (RSI, ATR, ADX), Parabolic SAR, SuperTrend and LTTB chart
+downsampling depend on their own previous output, so they cannot be
+written as pandas rolling operations. Each kernel here has two
+interchangeable backends with the same API:
+
+- 'numba': the scalar loop compiled with Numba (used when it is installed)
+- 'numpy': IIR filters for the linear recursions and the same loop run on
+  plain Python floats for the branching ones
+
+    set_backend('numpy')      # force the fallback, e.g. to compare results
+    sar, trend = parabolic_sar(high, low)
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Tuple
+
+import numpy as np
+from scipy.signal import lfilter
+
+# Optional dependency: only needed for the compiled backend
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ('numpy', 'numba')
+
+
+def available_backends() -> Tuple[str, ...]:
+    """Backends usable in this environment."""
+    return BACKENDS if numba is not None else ('numpy',)
+
+
+_backend = 'numba' if numba is not None else 'numpy'
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> str:
+    """Name of the active backend."""
+    return _backend
+
+
+def set_backend(name: str = 'auto') -> str:
+    """
+    Select the kernel backend.
+
+    Args:
+        name (str): 'numba', 'numpy', or 'auto' (numba when installed)
+
+    Returns:
+        str: The backend now active
+    """
+    global _backend
+    if name == 'auto':
+        name = available_backends()[-1]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend: {name} (expected one of {BACKENDS})")
+    if name not in available_backends():
+        raise ImportError("numba is required for the 'numba' kernel backend (pip install numba)")
+    with _backend_lock:
+        _backend = name
+    return _backend
+
+
+@contextmanager
+def use_backend(name: str):
+    """Temporarily switch the kernel backend."""
+    previous = get_backend()
+    set_backend(name)
+    try:
+        yield
+    finally:
+        set_backend(previous)
+
+
+# Scalar loops. They index plain sequences and only use arithmetic that
+# Numba compiles in nopython mode; `x != x` is the NaN test for both.
+
+def _exponential_loop(values, alpha):
+    n = len(values)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    value = values[0]
+    out[0] = value
+    for i in range(1, n):
+        value = value + alpha * (values[i] - value)
+        out[i] = value
+    return out
+
+
+def _wilder_loop(values, window):
+    n = len(values)
+    out = np.full(n, np.nan)
+    if window > n:
+        return out
+    total = 0.0
+    for i in range(window):
+        total += values[i]
+    value = total / window
+    out[window - 1] = value
+    for i in range(window, n):
+        value = value + (values[i] - value) / window
+        out[i] = value
+    return out
+
+
+def _parabolic_sar_loop(high, low, step, max_step):
+    n = len(high)
+    sar = np.full(n, np.nan)
+    trend = np.zeros(n)
+    if n < 2:
+        return sar, trend
+
+    up = high[1] >= high[0]
+    af = step
+    ep = high[0] if up else low[0]
+    value = low[0] if up else high[0]
+    sar[0] = value
+    trend[0] = 1.0 if up else -1.0
+
+    for i in range(1, n):
+        value = value + af * (ep - value)
+        if up:
+            value = min(value, low[i - 1], low[max(i - 2, 0)])
+            if low[i] < value:
+                up, value, ep, af = False, ep, low[i], step
+            elif high[i] > ep:
+                ep, af = high[i], min(af + step, max_step)
+        else:
+            value = max(value, high[i - 1], high[max(i - 2, 0)])
+            if high[i] > value:
+                up, value, ep, af = True, ep, high[i], step
+            elif low[i] < ep:
+                ep, af = low[i], min(af + step, max_step)
+        sar[i] = value
+        trend[i] = 1.0 if up else -1.0
+
+    return sar, trend
+
+
+def _supertrend_loop(high, low, close, atr, multiplier):
+    n = len(close)
+    line = np.full(n, np.nan)
+    trend = np.zeros(n)
+
+    start = n
+    for i in range(n):
+        if atr[i] == atr[i]:
+            start = i
+            break
+    if start == n:
+        return line, trend
+
+    mid = (high[start] + low[start]) / 2
+    upper = mid + multiplier * atr[start]
+    lower = mid - multiplier * atr[start]
+    up = close[start] >= lower
+    line[start] = lower if up else upper
+    trend[start] = 1.0 if up else -1.0
+
+    for i in range(start + 1, n):
+        mid = (high[i] + low[i]) / 2
+        basic_upper = mid + multiplier * atr[i]
+        basic_lower = mid - multiplier * atr[i]
+        # Bands only tighten while price stays on their side
+        if basic_upper < upper or close[i - 1] > upper:
+            upper = basic_upper
+        if basic_lower > lower or close[i - 1] < lower:
+            lower = basic_lower
+        if up and close[i] < lower:
+            up = False
+        elif not up and close[i] > upper:
+            up = True
+        line[i] = lower if up else upper
+        trend[i] = 1.0 if up else -1.0
+
+    return line, trend
+
+
+def _lttb_loop(x, y, n_out):
+    n = len(x)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    selected = 0
+
+    for i in range(n_out - 2):
+        # Average of the next bucket is the third vertex of the triangle
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(next_start, next_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        avg_x /= next_end - next_start
+        avg_y /= next_end - next_start
+
+        # Keep the point of this bucket spanning the largest triangle
+        best_area = -1.0
+        best = int(i * every) + 1
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((x[selected] - avg_x) * (y[j] - y[selected]) - (x[selected] - x[j]) * (avg_y - y[selected]))
+            if area > best_area:
+                best_area = area
+                best = j
+        out[i + 1] = best
+        selected = best
+
+    return out
+
+
+if numba is not None:
+    _compiled = {
+        'exponential': numba.njit(cache=True)(_exponential_loop),
+        'wilder': numba.njit(cache=True)(_wilder_loop),
+        'parabolic_sar': numba.njit(cache=True)(_parabolic_sar_loop),
+        'supertrend': numba.njit(cache=True)(_supertrend_loop),
+        'lttb': numba.njit(cache=True)(_lttb_loop),
+    }
+
+
+def _floats(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=float)
+
+
+def exponential_smooth(values, alpha: float) -> np.ndarray:
+    """
+    Exponential smoothing seeded with the first value (pandas ewm, adjust=False).
+
+    Args:
+        values (array-like): Input values
+        alpha (float): Smoothing factor (1 / window for Wilder smoothing)
+
+    Returns:
+        np.ndarray: Smoothed values
+    """
+    values = _floats(values)
+    if _backend == 'numba':
+        return _compiled['exponential'](values, alpha)
+    if len(values) == 0:
+        return values.copy()
+    # Initial state makes the first output equal the first value
+    out, _ = lfilter([alpha], [1, alpha - 1], values, zi=[(1 - alpha) * values[0]])
+    return out
+
+
+def wilder_smooth(values, window: int) -> np.ndarray:
+    """
+    Wilder's smoothing: a simple mean of the first `window` values, then
+    value += (x - value) / window.
+
+    Args:
+        values (array-like): Input values without missing entries
+        window (int): Smoothing period
+
+    Returns:
+        np.ndarray: Smoothed values, NaN before the first full window
+    """
+    values = _floats(values)
+    if _backend == 'numba':
+        return _compiled['wilder'](values, window)
+    out = np.full(len(values), np.nan)
+    if window > len(values):
+        return out
+    seed = values[:window].mean()
+    alpha = 1.0 / window
+    out[window - 1] = seed
+    out[window:], _ = lfilter([alpha], [1, alpha - 1], values[window:], zi=[(1 - alpha) * seed])
+    return out
+
+
+def wilder_rsi(close, window: int = 14) -> np.ndarray:
+    """
+    RSI with Wilder-smoothed average gains and losses.
+
+    Args:
+        close (array-like): Close prices
+        window (int): RSI period
+
+    Returns:
+        np.ndarray: RSI values, NaN for the first `window` bars
+    """
+    close = _floats(close)
+    out = np.full(len(close), np.nan)
+    if len(close) < 2:
+        return out
+    delta = np.diff(close)
+    avg_gain = wilder_smooth(np.maximum(delta, 0.0), window)
+    avg_loss = wilder_smooth(np.maximum(-delta, 0.0), window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[1:] = 100 - (100 / (1 + avg_gain / avg_loss))
+    return out
+
+
+def parabolic_sar(high, low, step: float = 0.02, max_step: float = 0.2):
+    """
+    Parabolic SAR.
+
+    Args:
+        high (array-like): High prices
+        low (array-like): Low prices
+        step (float): Acceleration factor increment
+        max_step (float): Maximum acceleration factor
+
+    Returns:
+        tuple: (SAR values, trend) where trend is 1 for up and -1 for down
+    """
+    high, low = _floats(high), _floats(low)
+    if _backend == 'numba':
+        return _compiled['parabolic_sar'](high, low, step, max_step)
+    return _parabolic_sar_loop(high.tolist(), low.tolist(), step, max_step)
+
+
+def supertrend(high, low, close, atr, multiplier: float = 3.0):
+    """
+    SuperTrend line over precomputed ATR values.
+
+    Args:
+        high (array-like): High prices
+        low (array-like): Low prices
+        close (array-like): Close prices
+        atr (array-like): ATR values (NaN during warm-up)
+        multiplier (float): ATR multiple for the bands
+
+    Returns:
+        tuple: (SuperTrend line, trend) where trend is 1 for up and -1 for down
+    """
+    high, low, close, atr = _floats(high), _floats(low), _floats(close), _floats(atr)
+    if _backend == 'numba':
+        return _compiled['supertrend'](high, low, close, atr, multiplier)
+    return _supertrend_loop(high.tolist(), low.tolist(), close.tolist(), atr.tolist(), multiplier)
+
+
+def lttb(x, y, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of n_out - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the next bucket's average, which preserves
+    peaks, troughs and the overall shape of the line.
+
+    Args:
+        x (array-like): Increasing x values
+        y (array-like): y values without missing entries
+        n_out (int): Number of points to keep
+
+    Returns:
+        np.ndarray: Sorted positions of the kept points
+    """
+    x, y = _floats(x), _floats(y)
+    if n_out >= len(x) or n_out < 3:
+        return np.arange(len(x))
+    if _backend == 'numba':
+        return _compiled['lttb'](x, y, n_out)
+    return _lttb_loop(x.tolist(), y.tolist(), n_out)
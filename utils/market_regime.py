@@ -13,36 +13,38 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import streamlit as st
 
+from utils.chart_decimation import DEFAULT_WIDTH_PX, covering_range, decimate_line, decimate_ohlc, visible_slice
+from utils.chart_helpers import price_trace_name, scatter_type
+from utils.figure_cache import memoize_figure
+from utils.indicator_cache import memoize_by_frame
+from utils.indicator_engine import get_engine
 
-def calculate_atr(data, window=14):
+
+def calculate_atr(data, window=14, smoothing='simple'):
     """
     Calculate Average True Range (ATR) for volatility measurement.
     
     Args:
         data (pd.DataFrame): Stock data with OHLC columns
         window (int): Window size for ATR calculation
+        smoothing (str): 'simple' for a rolling mean of true range,
+            'wilder' for Wilder's recursive smoothing
         
     Returns:
         pd.Series: ATR values
     """
-    high = data['High']
-    low = data['Low']
-    close = data['Close'].shift(1)
-    
-    # Calculate true range
-    tr1 = high - low
-    tr2 = abs(high - close)
-    tr3 = abs(low - close)
-    
-    tr = pd.DataFrame({'tr1': tr1, 'tr2': tr2, 'tr3': tr3}).max(axis=1)
-    
-    # Calculate ATR
-    atr = tr.rolling(window=window).mean()
-    
-    return atr
+    if smoothing == 'wilder':
+        # Recursive smoothing runs in the compiled kernels when available
+        return get_engine(data).get('atr_wilder', window=window)
+    if smoothing != 'simple':
+        raise ValueError(f"Unknown ATR smoothing: {smoothing}")
+    # True range is a shared engine node, reused by other range-based indicators
+    return get_engine(data).get('atr', window=window)
 
 
-def detect_market_regime(data, long_window=50, short_window=10, atr_window=14, threshold=0.05):
+@memoize_by_frame
+def detect_market_regime(data, long_window=50, short_window=10, atr_window=14, threshold=0.05,
+                         atr_smoothing='simple'):
     """
     Detect market regime based on trend and volatility indicators.
     
@@ -52,22 +54,24 @@ def detect_market_regime(data, long_window=50, short_window=10, atr_window=14, t
         short_window (int): Window size for short-term trend detection
         atr_window (int): Window size for ATR calculation
         threshold (float): Threshold for determining significant trend
+        atr_smoothing (str): ATR smoothing, 'simple' or 'wilder'
         
     Returns:
         dict: Market regime information
     """
     # Create a copy to avoid modifying the original data
     df = data.copy()
+    engine = get_engine(data)
     
     # Calculate moving averages for trend detection
-    df['SMA_Short'] = df['Close'].rolling(window=short_window).mean()
-    df['SMA_Long'] = df['Close'].rolling(window=long_window).mean()
+    df['SMA_Short'] = engine.get('sma', window=short_window)
+    df['SMA_Long'] = engine.get('sma', window=long_window)
     
     # Calculate trend strength indicators
     df['Trend_Strength'] = (df['SMA_Short'] / df['SMA_Long'] - 1) * 100
     
     # Calculate volatility using ATR
-    df['ATR'] = calculate_atr(df, window=atr_window)
+    df['ATR'] = calculate_atr(data, window=atr_window, smoothing=atr_smoothing)
     df['ATR_Pct'] = df['ATR'] / df['Close'] * 100
     
     # Determine market regime for the current period
@@ -160,13 +164,17 @@ def get_preferred_models_for_regime(regime):
         return ['Linear Regression', 'Quadratic Regression', 'Fourier Transform', 'Time Series', 'ARIMA']
 
 
-def plot_market_regime(data, regime_info):
+@memoize_figure
+def plot_market_regime(data, regime_info, x_range=None, width_px=DEFAULT_WIDTH_PX, render_mode='auto'):
     """
     Create a plot visualizing the market regime.
     
     Args:
         data (pd.DataFrame): Original stock data
         regime_info (dict): Market regime information
+        x_range (tuple, optional): (start, end) of the visible date range
+        width_px (int, optional): Plot width in pixels; None plots every bar
+        render_mode (str): 'auto', 'svg' or 'webgl' for the line traces
         
     Returns:
         plotly.graph_objects.Figure: Plotly figure with regime visualization
@@ -175,6 +183,22 @@ def plot_market_regime(data, regime_info):
     df = regime_info['data']
     regime = regime_info['regime']
     
+    if df.empty:
+        return go.Figure()
+    
+    # Only the visible range is sent, aggregated/downsampled to the plot width;
+    # a range holding no bars falls back to the full history
+    x_range = covering_range(df.index, x_range)
+    bars, interval = decimate_ohlc(data, x_range, width_px)
+    visible = df.index[visible_slice(df.index, x_range)]
+    lines = {
+        column: decimate_line(df[column], x_range, width_px)
+        for column in ('SMA_Short', 'SMA_Long', 'Trend_Strength', 'ATR_Pct')
+    }
+    # Three subplots of lines: one renderer for all of them, chosen from the
+    # visible bar count before downsampling
+    Scatter = scatter_type(len(visible), render_mode)
+    
     # Create subplots
     fig = make_subplots(rows=3, cols=1, 
                         shared_xaxes=True,
@@ -185,21 +209,21 @@ def plot_market_regime(data, regime_info):
     # Add candlestick chart to first subplot
     fig.add_trace(
         go.Candlestick(
-            x=data.index,
-            open=data['Open'],
-            high=data['High'],
-            low=data['Low'],
-            close=data['Close'],
-            name="Price"
+            x=bars.index,
+            open=bars['Open'],
+            high=bars['High'],
+            low=bars['Low'],
+            close=bars['Close'],
+            name=price_trace_name(interval)
         ),
         row=1, col=1
     )
     
     # Add moving averages to first subplot
     fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['SMA_Short'],
+        Scatter(
+            x=lines['SMA_Short'].index,
+            y=lines['SMA_Short'],
             mode='lines',
             name="Short-term SMA",
             line=dict(color='blue', width=1)
@@ -208,9 +232,9 @@ def plot_market_regime(data, regime_info):
     )
     
     fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['SMA_Long'],
+        Scatter(
+            x=lines['SMA_Long'].index,
+            y=lines['SMA_Long'],
             mode='lines',
             name="Long-term SMA",
             line=dict(color='red', width=1)
@@ -220,9 +244,9 @@ def plot_market_regime(data, regime_info):
     
     # Add trend strength to second subplot
     fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['Trend_Strength'],
+        Scatter(
+            x=lines['Trend_Strength'].index,
+            y=lines['Trend_Strength'],
             mode='lines',
             name="Trend Strength",
             line=dict(color='green')
@@ -233,22 +257,22 @@ def plot_market_regime(data, regime_info):
     # Add horizontal lines for trend strength thresholds
     threshold = 0.05  # Same as used in detect_market_regime
     fig.add_shape(
-        type="line", x0=df.index[0], x1=df.index[-1], y0=threshold, y1=threshold,
+        type="line", x0=visible[0], x1=visible[-1], y0=threshold, y1=threshold,
         line=dict(color="rgba(0,255,0,0.5)", width=1, dash="dash"),
         row=2, col=1
     )
     
     fig.add_shape(
-        type="line", x0=df.index[0], x1=df.index[-1], y0=-threshold, y1=-threshold,
+        type="line", x0=visible[0], x1=visible[-1], y0=-threshold, y1=-threshold,
         line=dict(color="rgba(255,0,0,0.5)", width=1, dash="dash"),
         row=2, col=1
     )
     
     # Add ATR to third subplot
     fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['ATR_Pct'],
+        Scatter(
+            x=lines['ATR_Pct'].index,
+            y=lines['ATR_Pct'],
             mode='lines',
             name="ATR%",
             line=dict(color='purple')
@@ -0,0 +1,247 @@
+"""
+Panel-wide indicator computation across many symbols.
+
+Indicators here work on aligned 2-D panels (time x symbols) and compute
+every symbol in one vectorized pass instead of looping over per-symbol
+DataFrames. Histories may be ragged: a NaN marks a bar the symbol does not
+have (not listed yet, delisted, exchange holiday). Each column is packed so
+its valid bars are contiguous, the indicator runs down all columns at once,
+and results are scattered back, so every symbol gets exactly what the
+single-symbol functions in utils.technical_indicators would return for its
+own bars, with NaN on the rows it has no bar for.
+
+    closes = align_panel(frames, 'Close')
+    rsi = panel_rsi(closes)
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+def align_panel(frames: Dict[str, pd.DataFrame], column: str = 'Close') -> pd.DataFrame:
+    """
+    Align one column of many symbols' frames into a time x symbols panel.
+
+    Args:
+        frames (dict): Symbol -> OHLCV DataFrame
+        column (str): Column to extract
+
+    Returns:
+        pd.DataFrame: Panel indexed by the union of all dates, one column per
+            symbol, NaN where a symbol has no bar
+    """
+    return pd.concat({symbol: data[column] for symbol, data in frames.items()}, axis=1).sort_index()
+
+
+class _Packed:
+    """Valid bars of every column moved to the top, in their original order."""
+
+    def __init__(self, valid: np.ndarray):
+        # Complete panels need no reordering
+        self.complete = bool(valid.all())
+        if self.complete:
+            return
+        self.order = np.argsort(~valid, axis=0, kind='stable')
+        counts = valid.sum(axis=0)
+        # Row k of a packed column holds its k-th valid bar
+        self.rows = np.arange(valid.shape[0])[:, None] < counts[None, :]
+
+    def pack(self, values: np.ndarray) -> np.ndarray:
+        if self.complete:
+            return values
+        return np.take_along_axis(values, self.order, axis=0)
+
+    def unpack(self, packed: np.ndarray) -> np.ndarray:
+        if self.complete:
+            return packed
+        out = np.full(packed.shape, np.nan)
+        np.put_along_axis(out, self.order, np.where(self.rows, packed, np.nan), axis=0)
+        return out
+
+
+def _as_arrays(*panels):
+    """Convert panels to float arrays, returning a function that restores the input type."""
+    arrays = [np.asarray(panel, dtype=float) for panel in panels]
+    arrays = [array[:, None] if array.ndim == 1 else array for array in arrays]
+
+    first = panels[0]
+    if isinstance(first, pd.DataFrame):
+        def wrap(array):
+            return pd.DataFrame(array, index=first.index, columns=first.columns)
+    elif isinstance(first, pd.Series):
+        def wrap(array):
+            return pd.Series(array[:, 0], index=first.index, name=first.name)
+    else:
+        def wrap(array):
+            return array if np.ndim(first) == 2 else array[:, 0]
+
+    valid = np.logical_and.reduce([~np.isnan(array) for array in arrays])
+    return arrays, _Packed(valid), wrap
+
+
+def _rolling_mean(packed: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean down packed columns via cumulative sums."""
+    cumsum = np.cumsum(np.where(np.isnan(packed), 0.0, packed), axis=0)
+    out = np.full(packed.shape, np.nan)
+    if window <= len(packed):
+        out[window - 1:] = cumsum[window - 1:]
+        out[window:] -= cumsum[:-window]
+        out[window - 1:] /= window
+    return out
+
+
+def _rolling_std(packed: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sample standard deviation (ddof=1) down packed columns."""
+    # Centre each column on its first value so the squared sums stay small
+    centred = packed - packed[:1]
+    mean = _rolling_mean(centred, window)
+    mean_sq = _rolling_mean(centred * centred, window)
+    variance = (mean_sq - mean * mean) * window / (window - 1)
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+def _ema(packed: np.ndarray, window: int) -> np.ndarray:
+    """EMA (pandas ewm, adjust=False) down packed columns with one IIR filter."""
+    alpha = 2.0 / (window + 1)
+    # Filter along contiguous rows of the transposed panel
+    values = np.ascontiguousarray(np.where(np.isnan(packed), 0.0, packed).T)
+    # Initial state makes the first output equal the first value
+    initial = (1 - alpha) * values[:, :1]
+    out, _ = lfilter([alpha], [1, alpha - 1], values, axis=1, zi=initial)
+    return out.T
+
+
+def _prev(packed: np.ndarray) -> np.ndarray:
+    """Previous valid bar of each packed column (NaN for the first)."""
+    prev = np.empty_like(packed)
+    prev[0] = np.nan
+    prev[1:] = packed[:-1]
+    return prev
+
+
+def panel_sma(close, window=20):
+    """
+    Simple Moving Average for every symbol.
+
+    Args:
+        close (pd.DataFrame or np.ndarray): Close panel (time x symbols)
+        window (int): Window size
+
+    Returns:
+        Same type as `close`: SMA panel
+    """
+    (values,), packed, wrap = _as_arrays(close)
+    return wrap(packed.unpack(_rolling_mean(packed.pack(values), window)))
+
+
+def panel_ema(close, window=20):
+    """
+    Exponential Moving Average for every symbol.
+
+    Args:
+        close (pd.DataFrame or np.ndarray): Close panel (time x symbols)
+        window (int): EMA span
+
+    Returns:
+        Same type as `close`: EMA panel
+    """
+    (values,), packed, wrap = _as_arrays(close)
+    return wrap(packed.unpack(_ema(packed.pack(values), window)))
+
+
+def panel_rsi(close, window=14):
+    """
+    Relative Strength Index for every symbol, matching calculate_rsi.
+
+    Args:
+        close (pd.DataFrame or np.ndarray): Close panel (time x symbols)
+        window (int): Window size
+
+    Returns:
+        Same type as `close`: RSI panel
+    """
+    (values,), packed, wrap = _as_arrays(close)
+    closes = packed.pack(values)
+
+    delta = closes - _prev(closes)
+    # The first bar of each symbol counts as a zero change, as in the batch version
+    delta[0] = 0.0
+    avg_gain = _rolling_mean(np.maximum(delta, 0.0), window)
+    avg_loss = _rolling_mean(np.maximum(-delta, 0.0), window)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    return wrap(packed.unpack(rsi))
+
+
+def panel_macd(close, fast_period=12, slow_period=26, signal_period=9):
+    """
+    MACD for every symbol.
+
+    Args:
+        close (pd.DataFrame or np.ndarray): Close panel (time x symbols)
+        fast_period (int): Fast EMA period
+        slow_period (int): Slow EMA period
+        signal_period (int): Signal line period
+
+    Returns:
+        tuple: (MACD line, Signal line, Histogram) panels
+    """
+    (values,), packed, wrap = _as_arrays(close)
+    closes = packed.pack(values)
+
+    macd_line = _ema(closes, fast_period) - _ema(closes, slow_period)
+    signal_line = _ema(macd_line, signal_period)
+    return (
+        wrap(packed.unpack(macd_line)),
+        wrap(packed.unpack(signal_line)),
+        wrap(packed.unpack(macd_line - signal_line))
+    )
+
+
+def panel_bollinger_bands(close, window=20, num_std=2):
+    """
+    Bollinger Bands for every symbol.
+
+    Args:
+        close (pd.DataFrame or np.ndarray): Close panel (time x symbols)
+        window (int): Window size for moving average
+        num_std (int): Number of standard deviations
+
+    Returns:
+        tuple: (Upper band, Middle band, Lower band) panels
+    """
+    (values,), packed, wrap = _as_arrays(close)
+    closes = packed.pack(values)
+
+    middle = _rolling_mean(closes, window)
+    spread = _rolling_std(closes, window) * num_std
+    return (
+        wrap(packed.unpack(middle + spread)),
+        wrap(packed.unpack(middle)),
+        wrap(packed.unpack(middle - spread))
+    )
+
+
+def panel_atr(high, low, close, window=14):
+    """
+    Average True Range for every symbol, matching calculate_atr.
+
+    Args:
+        high (pd.DataFrame or np.ndarray): High panel (time x symbols)
+        low (pd.DataFrame or np.ndarray): Low panel, aligned with `high`
+        close (pd.DataFrame or np.ndarray): Close panel, aligned with `high`
+        window (int): Window size
+
+    Returns:
+        Same type as `high`: ATR panel
+    """
+    (highs, lows, closes), packed, wrap = _as_arrays(high, low, close)
+    highs, lows, closes = packed.pack(highs), packed.pack(lows), packed.pack(closes)
+
+    prev_close = _prev(closes)
+    true_range = np.fmax(highs - lows, np.fmax(np.abs(highs - prev_close), np.abs(lows - prev_close)))
+    return wrap(packed.unpack(_rolling_mean(true_range, window)))
@@ -0,0 +1,155 @@
+"""
+Rolling pivot-point levels for every bar.
+
+Each bar gets the pivot levels of the previous completed anchor period
+(previous day, week or month), as traders would have drawn them at the
+time. Anchor periods are aggregated once with the resampling reductions,
+the levels of every method are computed as arrays over the periods, and
+they are broadcast back to the bars by period position, so the whole
+history costs a few array operations instead of a loop per bar.
+
+    levels = calculate_pivot_series(data, methods=['classic', 'camarilla'], anchor='1wk')
+    levels['Classic R1']
+"""
+
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from utils.indicator_engine import get_engine, indicator
+from utils.resampling import resample_ohlcv
+
+# Pivot anchors: the levels of a bar come from the previous period of this length
+ANCHORS = ['1d', '1wk', '1mo']
+
+
+def _classic(open_, high, low, close):
+    pivot = (high + low + close) / 3
+    return {
+        'P': pivot,
+        'S1': 2 * pivot - high,
+        'S2': pivot - (high - low),
+        'S3': low - 2 * (high - pivot),
+        'R1': 2 * pivot - low,
+        'R2': pivot + (high - low),
+        'R3': high + 2 * (pivot - low),
+    }
+
+
+def _fibonacci(open_, high, low, close):
+    pivot = (high + low + close) / 3
+    span = high - low
+    levels = {'P': pivot}
+    for i, ratio in enumerate((0.382, 0.618, 1.0), start=1):
+        levels[f'S{i}'] = pivot - ratio * span
+    for i, ratio in enumerate((0.382, 0.618, 1.0), start=1):
+        levels[f'R{i}'] = pivot + ratio * span
+    return levels
+
+
+def _camarilla(open_, high, low, close):
+    span = 1.1 * (high - low)
+    levels = {'P': (high + low + close) / 3}
+    for i, divisor in enumerate((12, 6, 4, 2), start=1):
+        levels[f'S{i}'] = close - span / divisor
+    for i, divisor in enumerate((12, 6, 4, 2), start=1):
+        levels[f'R{i}'] = close + span / divisor
+    return levels
+
+
+def _woodie(open_, high, low, close):
+    # Weights the close twice
+    pivot = (high + low + 2 * close) / 4
+    return {
+        'P': pivot,
+        'S1': 2 * pivot - high,
+        'S2': pivot - (high - low),
+        'R1': 2 * pivot - low,
+        'R2': pivot + (high - low),
+    }
+
+
+def _demark(open_, high, low, close):
+    # The period's direction decides which extreme is weighted twice
+    total = np.where(close < open_, high + 2 * low + close,
+                     np.where(close > open_, 2 * high + low + close, high + low + 2 * close))
+    return {
+        'P': total / 4,
+        'S1': total / 2 - high,
+        'R1': total / 2 - low,
+    }
+
+
+# Method name -> (column prefix, level formulas over period OHLC arrays)
+PIVOT_METHODS = {
+    'classic': ('Classic', _classic),
+    'fibonacci': ('Fibonacci', _fibonacci),
+    'camarilla': ('Camarilla', _camarilla),
+    'woodie': ('Woodie', _woodie),
+    'demark': ('DeMark', _demark),
+}
+
+
+def pivot_levels(open_, high, low, close, method: str = 'classic') -> Dict[str, np.ndarray]:
+    """
+    Pivot levels computed from one period's OHLC (scalars or arrays of periods).
+
+    Args:
+        open_ (float or np.ndarray): Period open
+        high (float or np.ndarray): Period high
+        low (float or np.ndarray): Period low
+        close (float or np.ndarray): Period close
+        method (str): Key of PIVOT_METHODS
+
+    Returns:
+        dict: Level name ('P', 'S1', 'R1', ...) -> value(s)
+    """
+    if method not in PIVOT_METHODS:
+        raise ValueError(f"Unknown pivot method: {method} (expected one of {list(PIVOT_METHODS)})")
+    return PIVOT_METHODS[method][1](open_, high, low, close)
+
+
+@indicator('pivot_series')
+def _pivot_series(engine, methods=tuple(PIVOT_METHODS), anchor='1d'):
+    if anchor not in ANCHORS:
+        raise ValueError(f"Unknown pivot anchor: {anchor} (expected one of {ANCHORS})")
+    data = engine.data
+    periods = resample_ohlcv(data[['Open', 'High', 'Low', 'Close']], anchor)
+    index = data.index
+
+    # Each bar takes the levels of the period before its own; the first
+    # period has no predecessor
+    own = periods.index.searchsorted(index, side='right') - 1
+    previous = own - 1
+    valid = previous >= 0
+    previous = np.where(valid, previous, 0)
+
+    arrays = [periods[column].to_numpy(dtype=float) for column in ('Open', 'High', 'Low', 'Close')]
+    columns = {}
+    for method in methods:
+        prefix = PIVOT_METHODS[method][0]
+        for level, values in pivot_levels(*arrays, method=method).items():
+            columns[f"{prefix} {level}"] = np.where(valid, values[previous], np.nan)
+    return pd.DataFrame(columns, index=index)
+
+
+def calculate_pivot_series(data: pd.DataFrame, methods: Iterable[str] = tuple(PIVOT_METHODS),
+                           anchor: str = '1d') -> pd.DataFrame:
+    """
+    Pivot levels for every bar, from the previous anchor period.
+
+    Args:
+        data (pd.DataFrame): Stock data with OHLC columns and a sorted DatetimeIndex
+        methods (iterable): Keys of PIVOT_METHODS to compute
+        anchor (str): Period the levels are derived from: '1d', '1wk' or '1mo'
+
+    Returns:
+        pd.DataFrame: One column per method and level, e.g. 'Classic P',
+            'Camarilla R4', 'DeMark S1'; NaN during the first period
+    """
+    methods = tuple(methods)
+    for method in methods:
+        if method not in PIVOT_METHODS:
+            raise ValueError(f"Unknown pivot method: {method} (expected one of {list(PIVOT_METHODS)})")
+    return get_engine(data).get('pivot_series', methods=methods, anchor=anchor)
@@ -17,6 +17,12 @@ from plotly.subplots import make_subplots
 import warnings
 warnings.filterwarnings('ignore')
 
+from utils.chart_helpers import scatter_type
+from utils.figure_cache import memoize_figure
+from utils.indicator_cache import memoize_by_frame
+from utils.indicator_engine import get_engine
+
+@memoize_by_frame
 def create_features(data, window_sizes=[5, 10, 20, 30]):
     """
     Create technical features for prediction models.
@@ -33,30 +39,31 @@ def create_features(data, window_sizes=[5, 10, 20, 30]):
         raise ValueError(f"Insufficient data: need at least {max(window_sizes) + 10} data points")
         
     df = data.copy()
+    engine = get_engine(data)
     
     # Calculate returns
-    df['Returns'] = df['Close'].pct_change()
+    df['Returns'] = engine.get('returns')
     df['Log_Returns'] = np.log(df['Close']/df['Close'].shift(1))
     
     # Add moving averages
     for window in window_sizes:
-        df[f'SMA_{window}'] = df['Close'].rolling(window=window).mean()
-        df[f'EMA_{window}'] = df['Close'].ewm(span=window, adjust=False).mean()
+        df[f'SMA_{window}'] = engine.get('sma', window=window)
+        df[f'EMA_{window}'] = engine.get('ema', window=window)
         
         # Add moving average crossover signals
         if window < 20:
             larger_window = window * 2
             df[f'SMA_Cross_{window}_{larger_window}'] = (
-                df[f'SMA_{window}'] > df[f'SMA_{larger_window}']
+                df[f'SMA_{window}'] > engine.get('sma', window=larger_window)
             ).astype(int)
     
     # Add rolling statistics
     for window in window_sizes:
-        df[f'Std_{window}'] = df['Close'].rolling(window=window).std()
-        df[f'Min_{window}'] = df['Close'].rolling(window=window).min()
-        df[f'Max_{window}'] = df['Close'].rolling(window=window).max()
-        df[f'Median_{window}'] = df['Close'].rolling(window=window).median()
-        df[f'Skew_{window}'] = df['Close'].rolling(window=window).skew()
+        df[f'Std_{window}'] = engine.get('std', window=window)
+        df[f'Min_{window}'] = engine.get('rolling', window=window, stat='min')
+        df[f'Max_{window}'] = engine.get('rolling', window=window, stat='max')
+        df[f'Median_{window}'] = engine.get('rolling', window=window, stat='median')
+        df[f'Skew_{window}'] = engine.get('rolling', window=window, stat='skew')
         
         # Price relative to its moving range
         df[f'Price_Range_Pct_{window}'] = (df['Close'] - df[f'Min_{window}']) / (df[f'Max_{window}'] - df[f'Min_{window}'])
@@ -68,11 +75,11 @@ def create_features(data, window_sizes=[5, 10, 20, 30]):
     
     # Add volume features
     df['Volume_Change'] = df['Volume'].pct_change()
-    df['Volume_to_MA_Ratio'] = df['Volume'] / df['Volume'].rolling(window=20).mean()
+    df['Volume_to_MA_Ratio'] = df['Volume'] / engine.get('sma', window=20, source='volume')
     
     for window in window_sizes:
-        df[f'Volume_SMA_{window}'] = df['Volume'].rolling(window=window).mean()
-        df[f'Volume_Std_{window}'] = df['Volume'].rolling(window=window).std()
+        df[f'Volume_SMA_{window}'] = engine.get('sma', window=window, source='volume')
+        df[f'Volume_Std_{window}'] = engine.get('std', window=window, source='volume')
         
         # Price-volume relationship features
         df[f'Price_Volume_Corr_{window}'] = (
@@ -80,19 +87,20 @@ def create_features(data, window_sizes=[5, 10, 20, 30]):
         )
     
     # Add volatility
-    df['Daily_Range'] = df['High'] - df['Low']
+    df['Daily_Range'] = engine.get('range')
     df['Daily_Range_Pct'] = df['Daily_Range'] / df['Close']
     
     for window in window_sizes:
-        df[f'Range_SMA_{window}'] = df['Daily_Range'].rolling(window=window).mean()
-        df[f'Range_Std_{window}'] = df['Daily_Range'].rolling(window=window).std()
+        df[f'Range_SMA_{window}'] = engine.get('sma', window=window, source='range')
+        df[f'Range_Std_{window}'] = engine.get('std', window=window, source='range')
         
         # Normalized price variance
         df[f'Close_Normalized_{window}'] = df['Close'] / df[f'SMA_{window}'] - 1
         
     # Add trend strength indicators    
-    df['Up_Down_Ratio_10'] = np.where(df['Returns'] > 0, 1, 0).rolling(10).sum() / 10
-    df['Up_Down_Ratio_20'] = np.where(df['Returns'] > 0, 1, 0).rolling(20).sum() / 20
+    up_days = (df['Returns'] > 0).astype(int)
+    df['Up_Down_Ratio_10'] = up_days.rolling(10).sum() / 10
+    df['Up_Down_Ratio_20'] = up_days.rolling(20).sum() / 20
     
     # OHLC relationships
     df['Close_to_Open'] = df['Close'] / df['Open'] - 1
@@ -118,6 +126,7 @@ def create_features(data, window_sizes=[5, 10, 20, 30]):
     
     return df
 
+@memoize_by_frame
 def linear_regression_prediction(data, prediction_days=30):
     """
     Enhanced linear regression prediction model with cross-validation and regularization.
@@ -247,6 +256,7 @@ def linear_regression_prediction(data, prediction_days=30):
         
         return predictions, confidence
 
+@memoize_by_frame
 def quadratic_regression_prediction(data, prediction_days=30):
     """
     Quadratic regression prediction model.
@@ -281,6 +291,7 @@ def quadratic_regression_prediction(data, prediction_days=30):
     
     return predictions, confidence
 
+@memoize_by_frame
 def fourier_transform_prediction(data, prediction_days=30, harmonics=10):
     """
     Fourier transform prediction model.
@@ -329,6 +340,7 @@ def fourier_transform_prediction(data, prediction_days=30, harmonics=10):
     
     return predictions, confidence
 
+@memoize_by_frame
 def arima_model_prediction(data, prediction_days=30):
     """
     ARIMA time series prediction model.
@@ -447,6 +459,7 @@ def arima_model_prediction(data, prediction_days=30):
             
             return predictions, confidence
 
+@memoize_by_frame
 def time_series_prediction(data, prediction_days=30):
     """
     Time series prediction model combining traditional and ARIMA approaches.
@@ -559,6 +572,7 @@ def time_series_prediction(data, prediction_days=30):
         st.warning(f"Combined time series model failed: {e}. Using ARIMA only.")
         return arima_model_prediction(data, prediction_days)
 
+@memoize_by_frame
 def ensemble_prediction(data, prediction_days=30, regime_weights=None):
     """
     Ensemble prediction using multiple models with dynamic weighting based on market regime.
@@ -846,7 +860,8 @@ def ensemble_prediction(data, prediction_days=30, regime_weights=None):
             
             return predictions, confidence, model_weights
 
-def plot_predictions(data, predictions, confidence, prediction_days=30):
+@memoize_figure
+def plot_predictions(data, predictions, confidence, prediction_days=30, render_mode='auto'):
     """
     Create a plot showing historical data and predictions.
     
@@ -855,10 +870,13 @@ def plot_predictions(data, predictions, confidence, prediction_days=30):
         predictions (list): List of predicted values
         confidence (list): List of confidence values
         prediction_days (int): Number of days predicted
+        render_mode (str): 'auto', 'svg' or 'webgl' for the line traces
         
     Returns:
         plotly.graph_objects.Figure: Plotly figure with predictions
     """
+    # The full price history dominates the point count
+    Scatter = scatter_type(len(data), render_mode)
     # Create date range for predictions
     last_date = data.index[-1]
     future_dates = pd.date_range(start=last_date + pd.Timedelta(days=1), periods=prediction_days)
@@ -868,7 +886,7 @@ def plot_predictions(data, predictions, confidence, prediction_days=30):
     
     # Add historical price
     fig.add_trace(
-        go.Scatter(
+        Scatter(
             x=data.index,
             y=data['Close'],
             mode='lines',
@@ -879,7 +897,7 @@ def plot_predictions(data, predictions, confidence, prediction_days=30):
     
     # Add predictions
     fig.add_trace(
-        go.Scatter(
+        Scatter(
             x=future_dates,
             y=predictions,
             mode='lines',
@@ -893,7 +911,7 @@ def plot_predictions(data, predictions, confidence, prediction_days=30):
     lower_bound = [pred - pred * (1 - conf) * 0.2 for pred, conf in zip(predictions, confidence)]
     
     fig.add_trace(
-        go.Scatter(
+        Scatter(
             x=future_dates,
             y=upper_bound,
             mode='lines',
@@ -904,7 +922,7 @@ def plot_predictions(data, predictions, confidence, prediction_days=30):
     )
     
     fig.add_trace(
-        go.Scatter(
+        Scatter(
             x=future_dates,
             y=lower_bound,
             mode='lines',
@@ -927,17 +945,20 @@ def plot_predictions(data, predictions, confidence, prediction_days=30):
     
     return fig
 
-def plot_ensemble_weights(model_weights, prediction_days=30):
+@memoize_figure
+def plot_ensemble_weights(model_weights, prediction_days=30, render_mode='auto'):
     """
     Create a plot showing model weights in the ensemble.
     
     Args:
         model_weights (list): List of weight distributions
         prediction_days (int): Number of days predicted
+        render_mode (str): 'auto', 'svg' or 'webgl' for the line traces
         
     Returns:
         plotly.graph_objects.Figure: Plotly figure with model weights
     """
+    Scatter = scatter_type(prediction_days, render_mode)
     try:
         # Check if we have 5 weights per day (includes ARIMA model)
         using_arima = len(model_weights[0]) >= 5 if model_weights else False
@@ -958,7 +979,7 @@ def plot_ensemble_weights(model_weights, prediction_days=30):
         days = list(range(1, prediction_days + 1))
         
         fig.add_trace(
-            go.Scatter(
+            Scatter(
                 x=days,
                 y=linear_weights,
                 mode='lines+markers',
@@ -968,7 +989,7 @@ def plot_ensemble_weights(model_weights, prediction_days=30):
         )
         
         fig.add_trace(
-            go.Scatter(
+            Scatter(
                 x=days,
                 y=quadratic_weights,
                 mode='lines+markers',
@@ -978,7 +999,7 @@ def plot_ensemble_weights(model_weights, prediction_days=30):
         )
         
         fig.add_trace(
-            go.Scatter(
+            Scatter(
                 x=days,
                 y=fourier_weights,
                 mode='lines+markers',
@@ -988,7 +1009,7 @@ def plot_ensemble_weights(model_weights, prediction_days=30):
         )
         
         fig.add_trace(
-            go.Scatter(
+            Scatter(
                 x=days,
                 y=time_series_weights,
                 mode='lines+markers',
@@ -999,7 +1020,7 @@ def plot_ensemble_weights(model_weights, prediction_days=30):
         
         if using_arima:
             fig.add_trace(
-                go.Scatter(
+                Scatter(
                     x=days,
                     y=arima_weights,
                     mode='lines+markers',
@@ -1042,7 +1063,7 @@ def plot_ensemble_weights(model_weights, prediction_days=30):
             
             for i, name in enumerate(model_names):
                 fig.add_trace(
-                    go.Scatter(
+                    Scatter(
                         x=days,
                         y=[w[i] if i < len(w) else 0.2 for w in dummy_weights],
                         mode='lines',
@@ -1057,7 +1078,7 @@ def plot_ensemble_weights(model_weights, prediction_days=30):
             for i, name in enumerate(model_names):
                 if i < model_count:
                     fig.add_trace(
-                        go.Scatter(
+                        Scatter(
                             x=days,
                             y=[w[i] if i < len(w) else 0 for w in model_weights],
                             mode='lines',
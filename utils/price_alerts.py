@@ -93,6 +93,41 @@ def check_price_alerts(stock_data, alerts):
     
     return triggered_alerts, updated_alerts
 
+def check_price_alerts_live(tick_buffer, alerts):
+    """
+    Check price alerts against the latest streamed ticks.
+    
+    Last prices for every alerted symbol are gathered from the tick buffer
+    in one vectorized read, so this is cheap enough to run on every tick
+    batch or page refresh.
+    
+    Args:
+        tick_buffer (utils.streaming.TickBuffer): Buffer written by the quote stream
+        alerts (list): List of PriceAlert objects
+        
+    Returns:
+        tuple: (triggered_alerts, updated_alerts)
+    """
+    pending = [alert for alert in alerts if not alert.triggered]
+    if not pending:
+        return [], alerts
+    
+    symbols = sorted({alert.stock_symbol for alert in pending})
+    last_prices = dict(zip(symbols, tick_buffer.latest_prices(symbols)))
+    triggered_alerts = []
+    
+    for alert in pending:
+        current_price = last_prices[alert.stock_symbol]
+        if pd.isna(current_price):
+            continue
+        
+        if (alert.direction == 'above' and current_price >= alert.target_price) or \
+           (alert.direction == 'below' and current_price <= alert.target_price):
+            alert.triggered = True
+            triggered_alerts.append(alert)
+    
+    return triggered_alerts, alerts
+
 def send_alert_notification(alert):
     """
     Display an in-app notification for a triggered alert.
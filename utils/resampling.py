@@ -0,0 +1,168 @@
+"""
+Vectorized OHLCV resampling.
+
+Coarser bars (5m -> 1h -> 1d -> 1wk -> 1mo) are derived from finer stored
+bars with one pass of NumPy reductions over contiguous buckets, so switching
+chart interval never needs another provider request.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Supported bar intervals (yfinance naming), finest first
+INTERVALS = ['1m', '5m', '15m', '30m', '60m', '1d', '1wk', '1mo']
+
+INTRADAY_INTERVALS = ['1m', '5m', '15m', '30m', '60m']
+
+# Display labels used by the chart pages
+INTERVAL_LABELS = {
+    '1d': 'Daily',
+    '1wk': 'Weekly',
+    '1mo': 'Monthly',
+    '1m': '1 Minute',
+    '5m': '5 Minutes',
+    '15m': '15 Minutes',
+    '30m': '30 Minutes',
+    '60m': '1 Hour'
+}
+
+_INTRADAY_MINUTES = {'1m': 1, '5m': 5, '15m': 15, '30m': 30, '60m': 60}
+
+
+def is_intraday(interval):
+    """Return True if the interval is shorter than one day."""
+    return interval in _INTRADAY_MINUTES
+
+
+def interval_nanoseconds(interval):
+    """
+    Length of an intraday interval in nanoseconds.
+
+    Raises:
+        ValueError: If the interval is not intraday
+    """
+    if not is_intraday(interval):
+        raise ValueError(f"Not an intraday interval: {interval}")
+    return _INTRADAY_MINUTES[interval] * 60 * 1_000_000_000
+
+
+def can_derive(source, target):
+    """
+    Check whether bars at `target` interval can be built from `source` bars.
+
+    Args:
+        source (str): Interval of the stored bars
+        target (str): Requested interval
+
+    Returns:
+        bool: True if every target bucket is a union of whole source bars
+    """
+    if source not in INTERVALS or target not in INTERVALS or source == target:
+        return False
+    if INTERVALS.index(source) > INTERVALS.index(target):
+        return False
+    if is_intraday(target):
+        return _INTRADAY_MINUTES[target] % _INTRADAY_MINUTES[source] == 0
+    # Daily and coarser buckets are calendar based and can be built from any finer bars
+    return True
+
+
+def bucket_labels(index, interval):
+    """
+    Map bar timestamps to the start of their `interval` bucket.
+
+    Intraday buckets are aligned to the clock (e.g. 10:00, 11:00), daily
+    buckets to the calendar date in the index timezone, weekly buckets to
+    Monday and monthly buckets to the first day of the month.
+
+    Args:
+        index (pd.DatetimeIndex): Sorted bar timestamps
+        interval (str): Target interval
+
+    Returns:
+        pd.DatetimeIndex: Bucket start for every bar
+    """
+    index = pd.DatetimeIndex(index)
+    if is_intraday(interval):
+        return index.floor(f"{_INTRADAY_MINUTES[interval]}min")
+
+    # Calendar arithmetic on wall-clock dates keeps DST shifts out of the labels
+    tz = index.tz
+    days = (index.tz_localize(None) if tz is not None else index).normalize()
+    if interval == '1wk':
+        days = days - pd.to_timedelta(days.dayofweek, unit='D')
+    elif interval == '1mo':
+        days = days - pd.to_timedelta(days.day - 1, unit='D')
+    elif interval != '1d':
+        raise ValueError(f"Unsupported interval: {interval}")
+    return days.tz_localize(tz) if tz is not None else days
+
+
+def resample_ohlcv(data, interval):
+    """
+    Aggregate OHLCV bars into coarser `interval` bars.
+
+    Bars are grouped into contiguous buckets and reduced with
+    np.*.reduceat: first open, max high, min low, last close and summed
+    volume. The input must be sorted by time (the data store guarantees it).
+
+    Args:
+        data (pd.DataFrame): OHLCV bars
+        interval (str): Target interval, e.g. '60m', '1d', '1wk'
+
+    Returns:
+        pd.DataFrame: Resampled bars indexed by bucket start
+    """
+    if data is None or data.empty:
+        return data
+
+    labels = bucket_labels(data.index, interval)
+    keys = labels.asi8
+    starts = np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
+    ends = np.append(starts[1:], len(keys)) - 1
+
+    result = {}
+    if 'Open' in data.columns:
+        result['Open'] = data['Open'].to_numpy(dtype=float)[starts]
+    if 'High' in data.columns:
+        result['High'] = np.fmax.reduceat(data['High'].to_numpy(dtype=float), starts)
+    if 'Low' in data.columns:
+        result['Low'] = np.fmin.reduceat(data['Low'].to_numpy(dtype=float), starts)
+    if 'Close' in data.columns:
+        result['Close'] = data['Close'].to_numpy(dtype=float)[ends]
+    if 'Adj Close' in data.columns:
+        result['Adj Close'] = data['Adj Close'].to_numpy(dtype=float)[ends]
+    if 'Volume' in data.columns:
+        volume = np.nan_to_num(data['Volume'].to_numpy(dtype=float))
+        result['Volume'] = np.add.reduceat(volume, starts)
+
+    resampled = pd.DataFrame(result, index=labels[starts])
+    resampled.index.name = data.index.name
+    resampled.attrs = dict(data.attrs)
+    resampled.attrs['interval'] = interval
+    return resampled
+
+
+def ticks_to_bars(timestamps, prices, sizes, interval):
+    """
+    Batch-aggregate trade ticks into OHLCV bars.
+
+    This is the reference the incremental TickBarAggregator is checked
+    against: bars are labelled by their UTC bucket start.
+
+    Args:
+        timestamps (array-like): Tick times in nanoseconds since the epoch (sorted)
+        prices (array-like): Trade prices
+        sizes (array-like): Trade sizes
+        interval (str): Bar interval, e.g. '1m', '5m'
+
+    Returns:
+        pd.DataFrame: OHLCV bars
+    """
+    prices = np.asarray(prices, dtype=float)
+    ticks = pd.DataFrame(
+        {'Open': prices, 'High': prices, 'Low': prices, 'Close': prices,
+         'Volume': np.asarray(sizes, dtype=float)},
+        index=pd.to_datetime(np.asarray(timestamps, dtype=np.int64), unit='ns', utc=True)
+    )
+    return resample_ohlcv(ticks, interval)
@@ -0,0 +1,171 @@
+"""
+Vectorized crossover and event detection.
+
+Event functions compare whole series (or time x symbols panels) at once and
+return boolean masks aligned with their input; event_table() turns any set
+of masks into a compact, date-ordered table. Pages, alerts and backtests
+share these instead of looping over bars.
+
+    events = event_table({
+        'Golden Cross': crosses_above(sma_20, sma_50),
+        'Death Cross': crosses_below(sma_20, sma_50),
+    })
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _values(x):
+    """Underlying float array of a Series/DataFrame/array, or a scalar as-is."""
+    if np.isscalar(x):
+        return x
+    return np.asarray(x, dtype=float)
+
+
+def _wrap(mask: np.ndarray, like):
+    """Return a mask with the same type and labels as `like`."""
+    if isinstance(like, pd.DataFrame):
+        return pd.DataFrame(mask, index=like.index, columns=like.columns)
+    if isinstance(like, pd.Series):
+        return pd.Series(mask, index=like.index, name=like.name)
+    return mask
+
+
+def _previous(values: np.ndarray) -> np.ndarray:
+    """Values shifted down one bar (NaN on the first bar)."""
+    prev = np.empty_like(values)
+    prev[:1] = np.nan
+    prev[1:] = values[:-1]
+    return prev
+
+
+def crosses_above(a, b):
+    """
+    Bars where `a` crosses above `b`.
+
+    A cross happens when `a` was below `b` on the previous bar and is at or
+    above it on this one.
+
+    Args:
+        a (pd.Series, pd.DataFrame or np.ndarray): Series or panel
+        b (same shape as `a`, or scalar): Series, panel or level to cross
+
+    Returns:
+        Same type as `a`: Boolean mask
+    """
+    a_values, b_values = _values(a), _values(b)
+    b_prev = b_values if np.isscalar(b_values) else _previous(b_values)
+    mask = (_previous(a_values) < b_prev) & (a_values >= b_values)
+    return _wrap(mask, a)
+
+
+def crosses_below(a, b):
+    """
+    Bars where `a` crosses below `b`.
+
+    A cross happens when `a` was above `b` on the previous bar and is at or
+    below it on this one.
+
+    Args:
+        a (pd.Series, pd.DataFrame or np.ndarray): Series or panel
+        b (same shape as `a`, or scalar): Series, panel or level to cross
+
+    Returns:
+        Same type as `a`: Boolean mask
+    """
+    a_values, b_values = _values(a), _values(b)
+    b_prev = b_values if np.isscalar(b_values) else _previous(b_values)
+    mask = (_previous(a_values) > b_prev) & (a_values <= b_values)
+    return _wrap(mask, a)
+
+
+def threshold_events(series, upper: Optional[float] = None, lower: Optional[float] = None) -> Dict:
+    """
+    Entry and exit events for zones above `upper` and below `lower`.
+
+    Typical use is RSI overbought/oversold (upper=70, lower=30).
+
+    Args:
+        series (pd.Series, pd.DataFrame or np.ndarray): Oscillator series or panel
+        upper (float, optional): Upper threshold
+        lower (float, optional): Lower threshold
+
+    Returns:
+        dict: Event name -> boolean mask ('Enter Above', 'Exit Above',
+            'Enter Below', 'Exit Below'), for the thresholds given
+    """
+    events = {}
+    if upper is not None:
+        events['Enter Above'] = crosses_above(series, upper)
+        events['Exit Above'] = crosses_below(series, upper)
+    if lower is not None:
+        events['Enter Below'] = crosses_below(series, lower)
+        events['Exit Below'] = crosses_above(series, lower)
+    return events
+
+
+def band_touches(high, low, upper, lower) -> Dict:
+    """
+    Bars where price starts touching an upper or lower band.
+
+    Only the first bar of each run of touches is reported, so a price riding
+    a band produces one event rather than one per bar.
+
+    Args:
+        high (pd.Series, pd.DataFrame or np.ndarray): High prices
+        low (same shape as `high`): Low prices
+        upper (same shape as `high`): Upper band (e.g. Bollinger upper)
+        lower (same shape as `high`): Lower band
+
+    Returns:
+        dict: {'Upper Band Touch': mask, 'Lower Band Touch': mask}
+    """
+    touch_upper = _values(high) >= _values(upper)
+    touch_lower = _values(low) <= _values(lower)
+
+    def starts(touching):
+        prev = np.zeros_like(touching)
+        prev[1:] = touching[:-1]
+        return touching & ~prev
+
+    return {
+        'Upper Band Touch': _wrap(starts(touch_upper), high),
+        'Lower Band Touch': _wrap(starts(touch_lower), high)
+    }
+
+
+def event_table(events: Dict) -> pd.DataFrame:
+    """
+    Combine event masks into one compact, date-ordered event table.
+
+    Args:
+        events (dict): Event name -> boolean mask (Series or panel DataFrame)
+
+    Returns:
+        pd.DataFrame: Columns 'Date', 'Event' and, for panel masks, 'Symbol';
+            events on the same bar keep the order of `events`
+    """
+    frames = []
+    for order, (name, mask) in enumerate(events.items()):
+        if isinstance(mask, pd.DataFrame):
+            rows, cols = np.nonzero(mask.to_numpy(dtype=bool))
+            frame = pd.DataFrame({
+                'Date': mask.index[rows],
+                'Symbol': mask.columns[cols],
+                'Event': name
+            })
+        else:
+            positions = np.flatnonzero(np.asarray(mask, dtype=bool))
+            frame = pd.DataFrame({'Date': mask.index[positions], 'Event': name})
+        frame['_order'] = order
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=['Date', 'Event'])
+
+    table = pd.concat(frames, ignore_index=True)
+    table = table.sort_values(['Date', '_order'], kind='stable')
+    return table.drop(columns='_order').reset_index(drop=True)
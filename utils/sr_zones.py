@@ -0,0 +1,96 @@
+"""
+One-dimensional clustering of swing prices into support/resistance zones.
+
+Swing highs and lows that sit within a small distance of each other mark
+the same price area, so drawing each as its own line piles dozens of
+near-identical levels onto a chart. Here the swing prices are sorted once
+and split wherever the gap to the next price exceeds a tolerance (gap-based
+single-linkage clustering); every zone is then summarized with segment
+reductions. Points of many symbols are clustered in the same pass by
+sorting on (symbol, price) and also splitting where the symbol changes.
+
+    labels, zones = cluster_zones(prices, weights, tolerance=0.8)
+    strongest = rank_zones(zones['strength'], zones['group'], max_zones=6)
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def cluster_zones(prices, weights, tolerance, groups=None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Cluster price points into zones.
+
+    Args:
+        prices (array-like): Swing prices
+        weights (array-like): Weight of every point (e.g. relative volume)
+        tolerance (float or array-like): Largest gap between neighbouring
+            prices of one zone; an array gives one tolerance per group
+        groups (array-like, optional): Integer group (symbol) code of every
+            point; points of different groups never share a zone
+
+    Returns:
+        tuple: (zone label of every point, dict of per-zone arrays 'group',
+            'low', 'high', 'price' (weighted mean), 'touches' and 'strength'
+            (summed weight)), zones ordered by group then price
+    """
+    prices = np.asarray(prices, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    groups = np.zeros(len(prices), dtype=np.intp) if groups is None else np.asarray(groups, dtype=np.intp)
+    tolerance = np.asarray(tolerance, dtype=float)
+    n = len(prices)
+    if n == 0:
+        empty = np.empty(0)
+        return np.empty(0, dtype=np.intp), {
+            'group': np.empty(0, dtype=np.intp), 'low': empty, 'high': empty, 'price': empty,
+            'touches': np.empty(0, dtype=np.intp), 'strength': empty
+        }
+
+    order = np.lexsort((prices, groups))
+    price, weight, group = prices[order], weights[order], groups[order]
+    gap_limit = tolerance[group[1:]] if tolerance.ndim else tolerance
+
+    # A zone starts at the first point of each group and after every wide gap
+    new_zone = np.ones(n, dtype=bool)
+    new_zone[1:] = (group[1:] != group[:-1]) | (np.diff(price) > gap_limit)
+    starts = np.flatnonzero(new_zone)
+    ends = np.append(starts[1:], n) - 1
+
+    labels = np.empty(n, dtype=np.intp)
+    labels[order] = np.cumsum(new_zone) - 1
+
+    strength = np.add.reduceat(weight, starts)
+    zones = {
+        'group': group[starts],
+        'low': price[starts],
+        'high': price[ends],
+        'price': np.add.reduceat(price * weight, starts) / strength,
+        'touches': ends - starts + 1,
+        'strength': strength,
+    }
+    return labels, zones
+
+
+def rank_zones(strength, groups: Optional[np.ndarray] = None, max_zones: int = 6) -> np.ndarray:
+    """
+    Positions of the strongest zones of every group, strongest first.
+
+    Args:
+        strength (array-like): Zone strengths
+        groups (array-like, optional): Group code of every zone
+        max_zones (int): Zones kept per group
+
+    Returns:
+        np.ndarray: Zone positions ordered by group, then strength descending
+    """
+    strength = np.asarray(strength, dtype=float)
+    groups = np.zeros(len(strength), dtype=np.intp) if groups is None else np.asarray(groups)
+    order = np.lexsort((-strength, groups))
+    if len(order) == 0:
+        return order
+    ranked = groups[order]
+    group_start = np.flatnonzero(np.append(True, ranked[1:] != ranked[:-1]))
+    sizes = np.diff(np.append(group_start, len(order)))
+    rank = np.arange(len(order)) - np.repeat(group_start, sizes)
+    return order[rank < max_zones]
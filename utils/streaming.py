@@ -0,0 +1,486 @@
+"""
+Streaming quote ingestion with ring-buffer tick storage.
+
+Ticks from a live feed (Finnhub websocket, or a local simulator for testing
+and offline use) are written into fixed-size per-symbol ring buffers that
+live in a few preallocated NumPy arrays. Memory is bounded by
+max_symbols x capacity regardless of how long the stream runs, and readers
+(alerts, live charts, streaming indicators) get views into those arrays
+instead of copies.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Optional dependency: only needed for the Finnhub websocket feed
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except:
+    pass
+
+FINNHUB_API_KEY = os.getenv('FINNHUB_API_KEY', '')
+FINNHUB_WS_URL = "wss://ws.finnhub.io"
+
+# Longest a feed blocks before it sees a stop request (the websocket recv timeout)
+FEED_TIMEOUT = 10
+
+
+class TickBuffer:
+    """
+    Fixed-capacity ring buffers for many symbols in preallocated arrays.
+
+    Each symbol owns one row of three (max_symbols x capacity) arrays:
+    timestamps (int64 nanoseconds), prices and sizes (float64). A tick write
+    is O(1) and never allocates. Memory use is max_symbols * capacity * 24
+    bytes, e.g. 2,000 symbols x 4,096 ticks is about 200 MB.
+
+    Writes are expected from a single ingestion thread. The tick counter of a
+    row is advanced after the tick is written, so readers never see a slot
+    that has not been filled.
+    """
+
+    def __init__(self, max_symbols: int = 2000, capacity: int = 4096):
+        """
+        Initialize the buffers.
+
+        Args:
+            max_symbols: Maximum number of symbols that can be tracked
+            capacity: Number of ticks retained per symbol
+        """
+        self.max_symbols = max_symbols
+        self.capacity = capacity
+        # np.empty reserves the blocks without touching them; pages are only
+        # committed as rows fill up, and counts guard against unwritten slots
+        self.timestamps = np.empty((max_symbols, capacity), dtype=np.int64)
+        self.prices = np.empty((max_symbols, capacity))
+        self.sizes = np.empty((max_symbols, capacity))
+        self.counts = np.zeros(max_symbols, dtype=np.int64)
+        self.rows: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def row(self, symbol: str) -> int:
+        """
+        Get (or assign) the buffer row of a symbol.
+
+        Raises:
+            MemoryError: If all rows are in use
+        """
+        row = self.rows.get(symbol)
+        if row is not None:
+            return row
+        with self.lock:
+            if symbol not in self.rows:
+                if len(self.rows) >= self.max_symbols:
+                    raise MemoryError(f"Tick buffer full: {self.max_symbols} symbols already tracked")
+                self.rows[symbol] = len(self.rows)
+            return self.rows[symbol]
+
+    def append(self, symbol: str, timestamp: int, price: float, size: float = 0.0) -> int:
+        """
+        Write one tick.
+
+        Args:
+            symbol: Stock symbol
+            timestamp: Tick time in nanoseconds since the epoch
+            price: Trade price
+            size: Trade size
+
+        Returns:
+            The symbol's buffer row
+        """
+        row = self.row(symbol)
+        count = self.counts[row]
+        slot = count % self.capacity
+        self.timestamps[row, slot] = timestamp
+        self.prices[row, slot] = price
+        self.sizes[row, slot] = size
+        self.counts[row] = count + 1
+        return row
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, symbol):
+        return symbol in self.rows
+
+    def count(self, symbol: str) -> int:
+        """Number of ticks currently retained for a symbol."""
+        row = self.rows.get(symbol)
+        return 0 if row is None else int(min(self.counts[row], self.capacity))
+
+    def total_ticks(self, symbol: str) -> int:
+        """Number of ticks ever written for a symbol (including overwritten ones)."""
+        row = self.rows.get(symbol)
+        return 0 if row is None else int(self.counts[row])
+
+    def latest(self, symbol: str) -> Optional[Tuple[int, float, float]]:
+        """
+        Get the most recent tick of a symbol.
+
+        Returns:
+            (timestamp, price, size), or None if no tick was received
+        """
+        row = self.rows.get(symbol)
+        if row is None or self.counts[row] == 0:
+            return None
+        slot = (self.counts[row] - 1) % self.capacity
+        return int(self.timestamps[row, slot]), float(self.prices[row, slot]), float(self.sizes[row, slot])
+
+    def latest_prices(self, symbols: List[str]) -> np.ndarray:
+        """
+        Get the last price of many symbols in one vectorized gather.
+
+        Returns:
+            np.ndarray: Last prices (NaN for symbols without ticks)
+        """
+        rows = np.array([self.rows.get(symbol, -1) for symbol in symbols], dtype=np.int64)
+        known = rows >= 0
+        result = np.full(len(symbols), np.nan)
+        if known.any():
+            counts = self.counts[rows[known]]
+            slots = (counts - 1) % self.capacity
+            prices = self.prices[rows[known], slots]
+            result[known] = np.where(counts > 0, prices, np.nan)
+        return result
+
+    def segments(self, symbol: str) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Get the retained ticks of a symbol as zero-copy views, oldest first.
+
+        Once the ring has wrapped the ticks are split into two contiguous
+        segments (older tail of the row, then its head), so at most two
+        (timestamps, prices, sizes) view tuples are returned.
+
+        Returns:
+            list: (timestamps, prices, sizes) tuples of array views
+        """
+        row = self.rows.get(symbol)
+        if row is None:
+            return []
+
+        count = int(self.counts[row])
+        if count <= self.capacity:
+            return [(self.timestamps[row, :count], self.prices[row, :count], self.sizes[row, :count])]
+
+        split = count % self.capacity
+        ranges = [slice(split, self.capacity), slice(0, split)]
+        return [
+            (self.timestamps[row, part], self.prices[row, part], self.sizes[row, part])
+            for part in ranges if part.stop > part.start
+        ]
+
+    def ticks(self, symbol: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the retained ticks as contiguous arrays, oldest first.
+
+        This is a view while the ring has not wrapped and a copy afterwards;
+        use segments() where copies must be avoided.
+
+        Returns:
+            tuple: (timestamps, prices, sizes)
+        """
+        parts = self.segments(symbol)
+        if not parts:
+            empty = np.empty(0)
+            return np.empty(0, dtype=np.int64), empty, empty
+        if len(parts) == 1:
+            return parts[0]
+        return tuple(np.concatenate(columns) for columns in zip(*parts))
+
+
+class SimulatedQuoteFeed:
+    """
+    Local stand-in for a live quote feed.
+    Generates random-walk trades for a list of symbols at a fixed tick rate.
+    Its prices are not real, so they must never trigger alerts.
+    """
+
+    simulated = True
+
+    def __init__(self, symbols: List[str], start_prices: Optional[Dict[str, float]] = None,
+                 ticks_per_second: float = 50.0, volatility: float = 0.0005, seed: Optional[int] = None):
+        """
+        Initialize the simulator.
+
+        Args:
+            symbols: Symbols to generate ticks for
+            start_prices: Optional starting price per symbol (default 100)
+            ticks_per_second: Total tick rate across all symbols
+            volatility: Standard deviation of the log return per tick
+            seed: Random seed for reproducible streams
+        """
+        self.symbols = list(symbols)
+        self.prices = np.array([(start_prices or {}).get(symbol, 100.0) for symbol in self.symbols], dtype=float)
+        self.ticks_per_second = ticks_per_second
+        self.volatility = volatility
+        self.rng = np.random.default_rng(seed)
+
+    def generate(self, n_ticks: int, start_time: Optional[int] = None):
+        """
+        Generate a batch of ticks without sleeping.
+
+        Args:
+            n_ticks: Number of ticks to generate
+            start_time: Timestamp of the first tick in nanoseconds (default: now)
+
+        Returns:
+            tuple: (symbols, timestamps, prices, sizes) arrays
+        """
+        start_time = time.time_ns() if start_time is None else start_time
+        picks = self.rng.integers(0, len(self.symbols), n_ticks)
+        log_shocks = self.rng.normal(0.0, self.volatility, n_ticks)
+
+        # Cumulative log return of each symbol in tick order: cumsum over the
+        # ticks grouped by symbol, minus the running total at each group start
+        order = np.argsort(picks, kind='stable')
+        grouped = np.cumsum(log_shocks[order])
+        group_starts = np.searchsorted(picks[order], np.arange(len(self.symbols)))
+        offsets = np.concatenate(([0.0], grouped))[group_starts]
+        cumulative = np.empty(n_ticks)
+        cumulative[order] = grouped - offsets[picks[order]]
+
+        prices = self.prices[picks] * np.exp(cumulative)
+        ticked = np.unique(picks)
+        last_tick = np.full(len(self.symbols), -1)
+        last_tick[picks] = np.arange(n_ticks)
+        self.prices[ticked] = prices[last_tick[ticked]]
+
+        spacing = int(1e9 / self.ticks_per_second)
+        timestamps = start_time + np.arange(n_ticks, dtype=np.int64) * spacing
+        sizes = self.rng.integers(1, 500, n_ticks).astype(float)
+        return np.array(self.symbols)[picks], timestamps, np.round(prices, 4), sizes
+
+    def run(self, on_tick: Callable, stop_event: threading.Event):
+        """
+        Stream ticks to `on_tick(symbol, timestamp, price, size)` until stopped.
+        """
+        batch = max(1, int(self.ticks_per_second / 10))
+        while not stop_event.is_set():
+            symbols, timestamps, prices, sizes = self.generate(batch)
+            for tick in zip(symbols, timestamps, prices, sizes):
+                on_tick(str(tick[0]), int(tick[1]), float(tick[2]), float(tick[3]))
+            stop_event.wait(batch / self.ticks_per_second)
+
+
+class FinnhubQuoteFeed:
+    """
+    Live trade feed from the Finnhub websocket API.
+    Requires the optional `websocket-client` package and a Finnhub API key.
+    """
+
+    simulated = False
+
+    def __init__(self, symbols: List[str], api_key: str = FINNHUB_API_KEY):
+        """
+        Initialize the feed.
+
+        Args:
+            symbols: Symbols to subscribe to
+            api_key: Finnhub API key
+        """
+        if websocket is None:
+            raise ImportError("websocket-client is required for the Finnhub feed (pip install websocket-client)")
+        if not api_key:
+            raise Exception("Finnhub API key not configured")
+        self.symbols = list(symbols)
+        self.api_key = api_key
+
+    def run(self, on_tick: Callable, stop_event: threading.Event):
+        """
+        Stream trades to `on_tick(symbol, timestamp, price, size)` until stopped.
+        Reconnects with a short backoff if the connection drops.
+        """
+        backoff = 1
+        while not stop_event.is_set():
+            try:
+                connection = websocket.create_connection(f"{FINNHUB_WS_URL}?token={self.api_key}", timeout=FEED_TIMEOUT)
+                for symbol in self.symbols:
+                    connection.send(json.dumps({'type': 'subscribe', 'symbol': symbol}))
+                backoff = 1
+
+                while not stop_event.is_set():
+                    message = json.loads(connection.recv())
+                    if message.get('type') != 'trade':
+                        continue
+                    for trade in message.get('data', []):
+                        # Finnhub timestamps are in milliseconds
+                        on_tick(trade['s'], int(trade['t']) * 1_000_000, float(trade['p']), float(trade.get('v', 0)))
+                connection.close()
+            except Exception:
+                stop_event.wait(backoff)
+                backoff = min(backoff * 2, 60)
+
+
+class QuoteStreamService:
+    """
+    Runs a quote feed on a background thread and writes ticks into a TickBuffer.
+    Subscribers are notified with (symbol, buffer) after each tick and read
+    the data directly from the buffer.
+
+    The service is shared by all sessions, so sessions hold it through
+    acquire()/release() rather than starting and stopping the feed
+    themselves: the feed streams the union of the symbols of every holder,
+    is restarted when that union changes, and stops when the last holder
+    releases it.
+    """
+
+    def __init__(self, buffer: Optional[TickBuffer] = None):
+        """
+        Initialize the service.
+
+        Args:
+            buffer: Tick buffer to write into (a new one by default)
+        """
+        self.buffer = buffer or TickBuffer()
+        self.subscribers: List[Tuple[Callable, Optional[set]]] = []
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.feed = None
+        self.holders: Dict[str, Tuple[set, Dict[str, float]]] = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, callback: Callable, symbols: Optional[List[str]] = None):
+        """
+        Register a tick subscriber.
+
+        Args:
+            callback: Called as callback(symbol, buffer) after every tick
+            symbols: Optional symbols to filter on (all symbols by default)
+        """
+        self.subscribers.append((callback, set(symbols) if symbols else None))
+
+    def unsubscribe(self, callback: Callable):
+        """Remove a tick subscriber."""
+        self.subscribers = [entry for entry in self.subscribers if entry[0] is not callback]
+
+    def on_tick(self, symbol: str, timestamp: int, price: float, size: float = 0.0):
+        """Write a tick to the buffer and notify subscribers."""
+        self.buffer.append(symbol, timestamp, price, size)
+        for callback, symbols in self.subscribers:
+            if symbols is None or symbol in symbols:
+                callback(symbol, self.buffer)
+
+    def start(self, feed):
+        """
+        Start streaming from a feed on a daemon thread.
+
+        The buffer allows a single writer, so a running feed is stopped
+        first, and the new feed is refused if the old thread does not exit.
+
+        Args:
+            feed: SimulatedQuoteFeed, FinnhubQuoteFeed or any object with run(on_tick, stop_event)
+
+        Raises:
+            RuntimeError: If the previous feed thread is still running
+        """
+        if self.thread is not None:
+            self.stop()
+        if self.thread is not None:
+            raise RuntimeError("The previous quote feed has not stopped; not starting another writer")
+        self.feed = feed
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=feed.run, args=(self.on_tick, self.stop_event), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stop the running feed.
+
+        Waits longer than a feed can block, so the thread has exited when
+        this returns; if it has not, it stays in `thread` and start()
+        refuses to add a second writer.
+        """
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=FEED_TIMEOUT + 5)
+            if not self.thread.is_alive():
+                self.thread = None
+
+    def is_running(self) -> bool:
+        """Check whether a feed is currently streaming."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def is_simulated(self) -> bool:
+        """Check whether the current feed generates simulated prices."""
+        return getattr(self.feed, 'simulated', True)
+
+    def acquire(self, holder: str, symbols: List[str], start_prices: Optional[Dict[str, float]] = None,
+                feed_factory: Optional[Callable] = None):
+        """
+        Hold the stream for a set of symbols.
+
+        Calling it again with the same holder replaces that holder's symbols.
+        The feed is (re)started whenever the union of all holders' symbols
+        changes.
+
+        Args:
+            holder: Identifier of the holder (e.g. a session id)
+            symbols: Symbols the holder needs
+            start_prices: Starting prices for a simulated feed
+            feed_factory: Called as feed_factory(symbols, start_prices=...) to
+                create the feed (default: create_quote_feed)
+        """
+        with self.lock:
+            self.holders[holder] = (set(symbols), dict(start_prices or {}))
+            self._refresh(feed_factory or create_quote_feed)
+
+    def release(self, holder: str):
+        """Release a holder's symbols, stopping the feed if no holders remain."""
+        with self.lock:
+            if self.holders.pop(holder, None) is not None:
+                self._refresh(create_quote_feed)
+
+    def is_held(self, holder: str) -> bool:
+        """Check whether a holder currently holds the stream."""
+        return holder in self.holders
+
+    def _refresh(self, feed_factory: Callable):
+        """Restart or stop the feed to match the holders (caller holds the lock)."""
+        symbols = set().union(*(held for held, _ in self.holders.values()))
+        if not symbols:
+            if self.is_running():
+                self.stop()
+            self.feed = None
+            return
+        if self.is_running() and set(getattr(self.feed, 'symbols', ())) == symbols:
+            return
+        start_prices = {}
+        for _, prices in self.holders.values():
+            start_prices.update(prices)
+        self.start(feed_factory(sorted(symbols), start_prices=start_prices))
+
+
+def create_quote_feed(symbols: List[str], start_prices: Optional[Dict[str, float]] = None):
+    """
+    Create the best available feed: Finnhub if configured, otherwise the simulator.
+
+    Args:
+        symbols: Symbols to stream
+        start_prices: Starting prices for the simulator
+
+    Returns:
+        A feed object for QuoteStreamService.start()
+    """
+    if FINNHUB_API_KEY and websocket is not None:
+        return FinnhubQuoteFeed(symbols)
+    return SimulatedQuoteFeed(symbols, start_prices=start_prices)
+
+
+# Global stream service instance
+_service = QuoteStreamService()
+
+
+def get_stream_service() -> QuoteStreamService:
+    """Get the global quote stream service instance."""
+    return _service
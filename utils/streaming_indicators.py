@@ -0,0 +1,256 @@
+"""
+Streaming (incremental) indicator kernels.
+
+Each indicator keeps just enough state to absorb one new bar in O(1) and
+reproduces the batch functions in utils.technical_indicators and
+utils.market_regime.calculate_atr to floating-point tolerance. They can be
+seeded from a batch history with from_batch() and then fed live bars, e.g.
+from the tick-to-bar aggregator's bar-close events:
+
+    rsi = StreamingRSI.from_batch(history)
+    rsi.update({'Close': 101.2})
+    rsi.snapshot()
+
+Bars are mappings (dicts, pandas rows) with the usual OHLC keys; the
+close-only indicators just read 'Close'. As with the batch code, inputs
+are assumed to be cleaned bars without missing prices.
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from utils.indicator_engine import get_engine
+
+
+class RollingWindow:
+    """
+    Fixed-size window with O(1) running sum and sum of squares.
+
+    The sums are recomputed from the window contents once per `size`
+    updates so rounding error cannot accumulate over long streams.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.pushes = 0
+
+    def push(self, value: float):
+        if len(self.values) == self.size:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+
+        self.pushes += 1
+        if self.pushes % self.size == 0:
+            self.total = float(np.sum(self.values))
+            self.total_sq = float(np.dot(self.values, self.values))
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    def mean(self) -> float:
+        return self.total / self.size if self.full else np.nan
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), like pandas rolling std."""
+        if not self.full or self.size < 2:
+            return np.nan
+        mean = self.total / self.size
+        variance = (self.total_sq - self.size * mean * mean) / (self.size - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+
+class StreamingSMA:
+    """Simple moving average of closes."""
+
+    def __init__(self, window: int = 20):
+        self.window = RollingWindow(window)
+
+    @classmethod
+    def from_batch(cls, data: pd.DataFrame, window: int = 20):
+        """Seed from a price history (only the last `window` closes are needed)."""
+        indicator = cls(window)
+        for close in data['Close'].iloc[-window:].to_numpy(dtype=float):
+            indicator.window.push(close)
+        return indicator
+
+    def update(self, bar) -> float:
+        self.window.push(float(bar['Close']))
+        return self.snapshot()
+
+    def snapshot(self) -> float:
+        return self.window.mean()
+
+
+class StreamingEMA:
+    """Exponential moving average of closes (pandas ewm, adjust=False)."""
+
+    def __init__(self, window: int = 20):
+        self.alpha = 2.0 / (window + 1)
+        self.value = np.nan
+
+    @classmethod
+    def from_batch(cls, data: pd.DataFrame, window: int = 20):
+        """Seed from the last value of the batch EMA."""
+        indicator = cls(window)
+        if len(data):
+            indicator.value = float(get_engine(data).get('ema', window=window).iloc[-1])
+        return indicator
+
+    def push(self, value: float) -> float:
+        if np.isnan(self.value):
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+    def update(self, bar) -> float:
+        return self.push(float(bar['Close']))
+
+    def snapshot(self) -> float:
+        return self.value
+
+
+class StreamingRSI:
+    """RSI over simple rolling means of gains and losses, like calculate_rsi."""
+
+    def __init__(self, window: int = 14):
+        self.gains = RollingWindow(window)
+        self.losses = RollingWindow(window)
+        self.prev_close = np.nan
+
+    @classmethod
+    def from_batch(cls, data: pd.DataFrame, window: int = 14):
+        """Seed from the last `window` close-to-close changes."""
+        indicator = cls(window)
+        closes = data['Close'].iloc[-(window + 1):].to_numpy(dtype=float)
+        if len(data) <= window:
+            # The first bar of a history counts as a zero change
+            indicator.gains.push(0.0)
+            indicator.losses.push(0.0)
+        for delta in np.diff(closes):
+            indicator.gains.push(max(delta, 0.0))
+            indicator.losses.push(max(-delta, 0.0))
+        if len(closes):
+            indicator.prev_close = closes[-1]
+        return indicator
+
+    def update(self, bar) -> float:
+        close = float(bar['Close'])
+        delta = 0.0 if np.isnan(self.prev_close) else close - self.prev_close
+        self.prev_close = close
+        self.gains.push(max(delta, 0.0))
+        self.losses.push(max(-delta, 0.0))
+        return self.snapshot()
+
+    def snapshot(self) -> float:
+        avg_gain = self.gains.mean()
+        avg_loss = self.losses.mean()
+        if np.isnan(avg_gain) or (avg_gain == 0 and avg_loss == 0):
+            return np.nan
+        if avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+class StreamingMACD:
+    """MACD line, signal line and histogram, like calculate_macd."""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.fast = StreamingEMA(fast_period)
+        self.slow = StreamingEMA(slow_period)
+        self.signal = StreamingEMA(signal_period)
+
+    @classmethod
+    def from_batch(cls, data: pd.DataFrame, fast_period: int = 12, slow_period: int = 26,
+                   signal_period: int = 9):
+        """Seed from the last values of the batch EMAs."""
+        indicator = cls(fast_period, slow_period, signal_period)
+        if len(data):
+            engine = get_engine(data)
+            indicator.fast.value = float(engine.get('ema', window=fast_period).iloc[-1])
+            indicator.slow.value = float(engine.get('ema', window=slow_period).iloc[-1])
+            _, signal_line, _ = engine.get(
+                'macd', fast_period=fast_period, slow_period=slow_period, signal_period=signal_period
+            )
+            indicator.signal.value = float(signal_line.iloc[-1])
+        return indicator
+
+    def update(self, bar):
+        close = float(bar['Close'])
+        self.fast.push(close)
+        self.slow.push(close)
+        self.signal.push(self.fast.value - self.slow.value)
+        return self.snapshot()
+
+    def snapshot(self):
+        """Returns (MACD line, Signal line, Histogram)."""
+        macd_line = self.fast.value - self.slow.value
+        return macd_line, self.signal.value, macd_line - self.signal.value
+
+
+class StreamingBollingerBands:
+    """Bollinger Bands over closes, like calculate_bollinger_bands."""
+
+    def __init__(self, window: int = 20, num_std: float = 2):
+        self.window = RollingWindow(window)
+        self.num_std = num_std
+
+    @classmethod
+    def from_batch(cls, data: pd.DataFrame, window: int = 20, num_std: float = 2):
+        """Seed from the last `window` closes."""
+        indicator = cls(window, num_std)
+        for close in data['Close'].iloc[-window:].to_numpy(dtype=float):
+            indicator.window.push(close)
+        return indicator
+
+    def update(self, bar):
+        self.window.push(float(bar['Close']))
+        return self.snapshot()
+
+    def snapshot(self):
+        """Returns (Upper band, Middle band, Lower band)."""
+        middle = self.window.mean()
+        spread = self.window.std() * self.num_std
+        return middle + spread, middle, middle - spread
+
+
+class StreamingATR:
+    """Average True Range over a simple rolling mean, like calculate_atr."""
+
+    def __init__(self, window: int = 14):
+        self.window = RollingWindow(window)
+        self.prev_close = np.nan
+
+    @classmethod
+    def from_batch(cls, data: pd.DataFrame, window: int = 14):
+        """Seed from the last `window` true ranges of the batch computation."""
+        indicator = cls(window)
+        true_range = get_engine(data).get('true_range')
+        for value in true_range.iloc[-window:].to_numpy(dtype=float):
+            indicator.window.push(value)
+        if len(data):
+            indicator.prev_close = float(data['Close'].iloc[-1])
+        return indicator
+
+    def update(self, bar) -> float:
+        high = float(bar['High'])
+        low = float(bar['Low'])
+        true_range = high - low
+        if not np.isnan(self.prev_close):
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = float(bar['Close'])
+        self.window.push(true_range)
+        return self.snapshot()
+
+    def snapshot(self) -> float:
+        return self.window.mean()
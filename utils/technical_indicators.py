@@ -2,6 +2,18 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+
+from utils import kernels
+from utils.candlestick_patterns import PATTERNS, scan_patterns
+from utils.chart_decimation import (
+    DEFAULT_WIDTH_PX, covering_range, decimate_line, decimate_ohlc, visible_slice
+)
+from utils.chart_helpers import add_zone_bands, bar_traces, direction_colors, price_trace_name, scatter_type
+from utils.figure_cache import memoize_figure
+from utils.indicator_engine import get_engine, indicator
+from utils.resampling import is_intraday
+from utils.sr_zones import cluster_zones, rank_zones
 
 def calculate_sma(data, window=20):
     """
@@ -14,7 +26,7 @@ def calculate_sma(data, window=20):
     Returns:
         pd.Series: Series containing SMA values
     """
-    return data['Close'].rolling(window=window).mean()
+    return get_engine(data).get('sma', window=window)
 
 def calculate_ema(data, window=20):
     """
@@ -27,31 +39,28 @@ def calculate_ema(data, window=20):
     Returns:
         pd.Series: Series containing EMA values
     """
-    return data['Close'].ewm(span=window, adjust=False).mean()
+    return get_engine(data).get('ema', window=window)
 
-def calculate_rsi(data, window=14):
+def calculate_rsi(data, window=14, smoothing='simple'):
     """
     Calculate Relative Strength Index.
     
     Args:
         data (pd.DataFrame): Stock data with 'Close' column
         window (int): Window size for RSI
+        smoothing (str): 'simple' for rolling means of gains and losses,
+            'wilder' for Wilder's recursive smoothing
         
     Returns:
         pd.Series: Series containing RSI values
     """
-    delta = data['Close'].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    
-    avg_gain = gain.rolling(window=window).mean()
-    avg_loss = loss.rolling(window=window).mean()
-    
+    if smoothing == 'wilder':
+        # Recursive smoothing runs in the compiled kernels when available
+        return get_engine(data).get('rsi_wilder', window=window)
+    if smoothing != 'simple':
+        raise ValueError(f"Unknown RSI smoothing: {smoothing}")
     # For the first window observations, RSI is not defined
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    
-    return rsi
+    return get_engine(data).get('rsi', window=window)
 
 def calculate_bollinger_bands(data, window=20, num_std=2):
     """
@@ -65,13 +74,8 @@ def calculate_bollinger_bands(data, window=20, num_std=2):
     Returns:
         tuple: (Upper band, Middle band, Lower band)
     """
-    middle_band = data['Close'].rolling(window=window).mean()
-    std_dev = data['Close'].rolling(window=window).std()
-    
-    upper_band = middle_band + (std_dev * num_std)
-    lower_band = middle_band - (std_dev * num_std)
-    
-    return upper_band, middle_band, lower_band
+    # The middle band is the shared SMA node, not a second rolling mean
+    return get_engine(data).get('bollinger', window=window, num_std=num_std)
 
 def calculate_macd(data, fast_period=12, slow_period=26, signal_period=9):
     """
@@ -86,20 +90,52 @@ def calculate_macd(data, fast_period=12, slow_period=26, signal_period=9):
     Returns:
         tuple: (MACD line, Signal line, Histogram)
     """
-    # Calculate fast and slow EMAs
-    fast_ema = data['Close'].ewm(span=fast_period, adjust=False).mean()
-    slow_ema = data['Close'].ewm(span=slow_period, adjust=False).mean()
+    # Fast and slow EMAs are shared nodes, reused by calculate_ema callers
+    return get_engine(data).get(
+        'macd',
+        fast_period=fast_period,
+        slow_period=slow_period,
+        signal_period=signal_period
+    )
+
+def find_local_extrema(values, window=10, kind='max', strict=True):
+    """
+    Find bars that are local extrema of their neighbourhood.
+    
+    A bar qualifies when it is greater (kind='max') or smaller (kind='min')
+    than each of the `window` bars on either side, or equal to them as well
+    when strict=False. The neighbourhood extremes come from one O(n) rolling
+    pass, shifted to cover the left and right sides, instead of per-bar
+    comparisons.
+    
+    Args:
+        values (array-like): Price series
+        window (int): Number of bars on each side to compare against
+        kind (str): 'max' for peaks, 'min' for troughs
+        strict (bool): Whether ties with a neighbour disqualify the bar
+        
+    Returns:
+        np.ndarray: Integer positions of the extrema
+    """
+    series = pd.Series(np.asarray(values, dtype=float))
+    n = len(series)
+    if window < 1 or n < 2 * window + 1:
+        return np.empty(0, dtype=np.intp)
     
-    # Calculate MACD line
-    macd_line = fast_ema - slow_ema
+    rolling = series.rolling(window=window)
+    # Any NaN in a neighbourhood makes its extreme NaN, so the bar is rejected
+    neighbour = (rolling.max() if kind == 'max' else rolling.min()).to_numpy()
     
-    # Calculate signal line (EMA of MACD line)
-    signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+    centre = series.to_numpy()[window:n - window]
+    left = neighbour[window - 1:n - window - 1]
+    right = neighbour[2 * window:]
     
-    # Calculate histogram (MACD line - Signal line)
-    histogram = macd_line - signal_line
+    if kind == 'max':
+        mask = (centre > left) & (centre > right) if strict else (centre >= left) & (centre >= right)
+    else:
+        mask = (centre < left) & (centre < right) if strict else (centre <= left) & (centre <= right)
     
-    return macd_line, signal_line, histogram
+    return np.flatnonzero(mask) + window
 
 def calculate_support_resistance(data, window=10):
     """
@@ -112,22 +148,136 @@ def calculate_support_resistance(data, window=10):
     Returns:
         tuple: (support_levels, resistance_levels)
     """
-    # Identify local maxima for resistance levels
-    resistance_levels = []
-    for i in range(window, len(data) - window):
-        if all(data['High'].iloc[i] > data['High'].iloc[i-j] for j in range(1, window+1)) and \
-           all(data['High'].iloc[i] > data['High'].iloc[i+j] for j in range(1, window+1)):
-            resistance_levels.append((data.index[i], data['High'].iloc[i]))
+    high = data['High'].to_numpy()
+    low = data['Low'].to_numpy()
     
-    # Identify local minima for support levels
-    support_levels = []
-    for i in range(window, len(data) - window):
-        if all(data['Low'].iloc[i] < data['Low'].iloc[i-j] for j in range(1, window+1)) and \
-           all(data['Low'].iloc[i] < data['Low'].iloc[i+j] for j in range(1, window+1)):
-            support_levels.append((data.index[i], data['Low'].iloc[i]))
+    # Local maxima of highs are resistance levels, local minima of lows support
+    peaks = find_local_extrema(high, window, kind='max')
+    troughs = find_local_extrema(low, window, kind='min')
+    
+    resistance_levels = list(zip(data.index[peaks], high[peaks]))
+    support_levels = list(zip(data.index[troughs], low[troughs]))
     
     return support_levels, resistance_levels
 
+ZONE_COLUMNS = ['Low', 'High', 'Price', 'Touches', 'Strength', 'Last Touch', 'Type']
+
+def _zone_points(data, window, band_atr, atr_window):
+    """
+    Swing highs and lows of one frame as zone clustering input.
+    
+    Returns:
+        tuple: (prices, weights, positions, tolerance)
+    """
+    high = data['High'].to_numpy(dtype=float)
+    low = data['Low'].to_numpy(dtype=float)
+    peaks = find_local_extrema(high, window, kind='max', strict=False)
+    troughs = find_local_extrema(low, window, kind='min', strict=False)
+    positions = np.concatenate([peaks, troughs])
+    prices = np.concatenate([high[peaks], low[troughs]])
+    
+    # Swings on heavy volume count for more than swings on thin volume
+    if 'Volume' in data.columns:
+        volume = data['Volume'].to_numpy(dtype=float)
+        typical = np.nanmedian(volume) if len(volume) else np.nan
+        weights = volume[positions] / typical if typical > 0 else np.ones(len(positions))
+        weights = np.where(np.isfinite(weights), weights, 1.0)
+    else:
+        weights = np.ones(len(positions))
+    
+    # Zone width follows the average true range of the last atr_window bars
+    close = data['Close'].to_numpy(dtype=float)
+    start = max(len(close) - atr_window, 1)
+    prev_close = close[start - 1:-1]
+    true_range = np.fmax(high[start:] - low[start:],
+                         np.fmax(np.abs(high[start:] - prev_close), np.abs(low[start:] - prev_close)))
+    tolerance = band_atr * true_range.mean() if len(true_range) else np.nan
+    return prices, weights, positions, tolerance
+
+def _zone_table(zones, keep, last_touch, tolerance, close):
+    """Assemble the ranked zones as a ZONE_COLUMNS frame."""
+    price = zones['price'][keep]
+    half_width = np.asarray(tolerance, dtype=float) / 2
+    low = np.minimum(zones['low'][keep], price - half_width)
+    high = np.maximum(zones['high'][keep], price + half_width)
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame({
+        'Low': low,
+        'High': high,
+        'Price': price,
+        'Touches': zones['touches'][keep],
+        'Strength': zones['strength'][keep],
+        'Last Touch': last_touch,
+        'Type': np.where(high < close, 'Support', np.where(low > close, 'Resistance', 'Current')),
+    }, columns=ZONE_COLUMNS)
+
+def calculate_sr_zones(data, window=10, band_atr=0.5, atr_window=14, max_zones=6):
+    """
+    Cluster swing highs and lows into ranked support/resistance zones.
+    
+    Swing prices closer than `band_atr` x ATR to their neighbour are merged
+    into one zone (see utils.sr_zones). Each swing is weighted by its
+    relative volume, so a zone's strength grows with its touches and the
+    volume traded at them. Zones are typed against the last close.
+    
+    Args:
+        data (pd.DataFrame): Stock data with OHLCV columns
+        window (int): Bars on each side that define a swing point
+        band_atr (float): Largest price gap inside a zone, in ATRs
+        atr_window (int): Bars of the ATR used for the zone width
+        max_zones (int): Number of zones to return
+        
+    Returns:
+        pd.DataFrame: The strongest zones, strongest first, with columns
+            'Low', 'High', 'Price', 'Touches', 'Strength', 'Last Touch' and
+            'Type' ('Support', 'Resistance' or 'Current' when price is inside)
+    """
+    prices, weights, positions, tolerance = _zone_points(data, window, band_atr, atr_window)
+    labels, zones = cluster_zones(prices, weights, tolerance)
+    keep = rank_zones(zones['strength'], max_zones=max_zones)
+    
+    last = np.full(len(zones['strength']), -1)
+    np.maximum.at(last, labels, positions)
+    close = data['Close'].iloc[-1] if len(data) else np.nan
+    return _zone_table(zones, keep, data.index[last[keep]], tolerance, close)
+
+def find_watchlist_zones(frames, window=10, band_atr=0.5, atr_window=14, max_zones=6):
+    """
+    Support/resistance zones for every symbol of a watchlist.
+    
+    Swing points are collected per symbol, then all symbols are clustered
+    and ranked together in one pass, each with its own ATR-based width.
+    
+    Args:
+        frames (dict): Symbol -> OHLCV DataFrame
+        window (int): Bars on each side that define a swing point
+        band_atr (float): Largest price gap inside a zone, in ATRs
+        atr_window (int): Bars of the ATR used for the zone width
+        max_zones (int): Zones returned per symbol
+        
+    Returns:
+        pd.DataFrame: calculate_sr_zones columns plus 'Symbol'
+    """
+    symbols = list(frames)
+    parts = [_zone_points(frames[symbol], window, band_atr, atr_window) for symbol in symbols]
+    if not parts:
+        return pd.DataFrame(columns=['Symbol'] + ZONE_COLUMNS)
+    
+    prices, weights, positions = (np.concatenate([part[i] for part in parts]) for i in range(3))
+    tolerance = np.array([part[3] for part in parts])
+    groups = np.repeat(np.arange(len(parts)), [len(part[0]) for part in parts])
+    labels, zones = cluster_zones(prices, weights, tolerance, groups)
+    keep = rank_zones(zones['strength'], zones['group'], max_zones=max_zones)
+    
+    last = np.full(len(zones['strength']), -1)
+    np.maximum.at(last, labels, positions)
+    group = zones['group'][keep]
+    closes = np.array([frames[symbol]['Close'].iloc[-1] for symbol in symbols])
+    last_touch = [frames[symbols[code]].index[position] for code, position in zip(group, last[keep])]
+    table = _zone_table(zones, keep, last_touch, tolerance[group], closes[group])
+    table.insert(0, 'Symbol', np.asarray(symbols, dtype=object)[group])
+    return table
+
 def detect_candlestick_patterns(data):
     """
     Detect common candlestick patterns.
@@ -136,64 +286,590 @@ def detect_candlestick_patterns(data):
         data (pd.DataFrame): Stock data with OHLC columns
         
     Returns:
-        dict: Dictionary of detected patterns
-    """
-    patterns = {}
-    
-    # Detect Doji patterns
-    doji = []
-    for i in range(len(data)):
-        if abs(data['Open'].iloc[i] - data['Close'].iloc[i]) / (data['High'].iloc[i] - data['Low'].iloc[i] + 0.001) < 0.1:
-            if data['High'].iloc[i] - max(data['Open'].iloc[i], data['Close'].iloc[i]) > 3 * abs(data['Open'].iloc[i] - data['Close'].iloc[i]) and \
-               min(data['Open'].iloc[i], data['Close'].iloc[i]) - data['Low'].iloc[i] > 3 * abs(data['Open'].iloc[i] - data['Close'].iloc[i]):
-                doji.append((data.index[i], 'Long-Legged Doji'))
-            else:
-                doji.append((data.index[i], 'Doji'))
-    
-    # Detect Hammer patterns
-    hammer = []
-    for i in range(len(data)):
-        body = abs(data['Open'].iloc[i] - data['Close'].iloc[i])
-        if body > 0:
-            lower_shadow = min(data['Open'].iloc[i], data['Close'].iloc[i]) - data['Low'].iloc[i]
-            upper_shadow = data['High'].iloc[i] - max(data['Open'].iloc[i], data['Close'].iloc[i])
-            if lower_shadow > 2 * body and upper_shadow < 0.1 * body:
-                hammer.append((data.index[i], 'Hammer'))
-    
-    # Detect Engulfing patterns
-    engulfing = []
-    for i in range(1, len(data)):
-        # Bullish engulfing
-        if data['Close'].iloc[i-1] < data['Open'].iloc[i-1] and \
-           data['Close'].iloc[i] > data['Open'].iloc[i] and \
-           data['Close'].iloc[i] > data['Open'].iloc[i-1] and \
-           data['Open'].iloc[i] < data['Close'].iloc[i-1]:
-            engulfing.append((data.index[i], 'Bullish Engulfing'))
-        
-        # Bearish engulfing
-        elif data['Close'].iloc[i-1] > data['Open'].iloc[i-1] and \
-             data['Close'].iloc[i] < data['Open'].iloc[i] and \
-             data['Close'].iloc[i] < data['Open'].iloc[i-1] and \
-             data['Open'].iloc[i] > data['Close'].iloc[i-1]:
-            engulfing.append((data.index[i], 'Bearish Engulfing'))
-    
-    patterns['doji'] = doji
-    patterns['hammer'] = hammer
-    patterns['engulfing'] = engulfing
+        dict: Dictionary of detected patterns, keyed by pattern group
+            ('doji', 'hammer', 'engulfing', ...), each a list of (date, label)
+    """
+    patterns = {group: [] for group in dict.fromkeys(p.group for p in PATTERNS.values())}
+    
+    found = scan_patterns(data)
+    for (date, label), group in zip(found.index, found['Group']):
+        patterns[group].append((date, label))
     
     return patterns
 
-def plot_with_indicators(data, indicators):
+def calculate_obv(data):
+    """
+    Calculate On-Balance Volume.
+    
+    Args:
+        data (pd.DataFrame): Stock data with 'Close' and 'Volume' columns
+        
+    Returns:
+        pd.Series: Series containing OBV values
+    """
+    return get_engine(data).get('obv')
+
+def _rolling_sum(values, window):
+    """
+    Trailing rolling sum via cumulative sums.
+    
+    Like pandas rolling sums, a window is NaN until it is full and while it
+    contains a NaN.
+    """
+    out = np.full(len(values), np.nan)
+    if window <= len(values):
+        missing = np.isnan(values)
+        cumsum = np.cumsum(np.where(missing, 0.0, values))
+        gaps = np.cumsum(missing)
+        out[window - 1:] = cumsum[window - 1:]
+        out[window:] -= cumsum[:-window]
+        gaps_in_window = gaps[window - 1:].copy()
+        gaps_in_window[1:] -= gaps[:-window]
+        out[window - 1:][gaps_in_window > 0] = np.nan
+    return out
+
+def _rolling_extremes(high, low, windows):
+    """
+    Trailing rolling max of `high` and min of `low` for several windows.
+    
+    Each window is one O(n) filter pass; indicators that share a window
+    (Stochastic, Williams %R, Ichimoku, Donchian) share its result.
+    
+    Returns:
+        dict: window -> (highest high, lowest low)
+    """
+    extremes = {}
+    for window in sorted(set(windows)):
+        # A centred filter shifted by (window - 1) // 2 is the trailing window
+        shift = (window - 1) // 2
+        highest = np.full(len(high), np.nan)
+        lowest = np.full(len(low), np.nan)
+        if window <= len(high):
+            centred_high = maximum_filter1d(high, window, mode='nearest')
+            centred_low = minimum_filter1d(low, window, mode='nearest')
+            highest[window - 1:] = centred_high[window - 1 - shift:len(high) - shift]
+            lowest[window - 1:] = centred_low[window - 1 - shift:len(low) - shift]
+        extremes[window] = (highest, lowest)
+    return extremes
+
+# Columns of the extended pack. The Ichimoku Chikou span (the close shifted
+# 26 bars back) is left out: its value on a bar is a future close, so it is
+# only available as a display line from calculate_ichimoku.
+EXTENDED_COLUMNS = [
+    'Stoch %K', 'Stoch %D', 'Williams %R', 'ADX', '+DI', '-DI', 'CCI', 'MFI', 'OBV',
+    'Ichimoku Tenkan', 'Ichimoku Kijun', 'Ichimoku Senkou A', 'Ichimoku Senkou B',
+    'Keltner Upper', 'Keltner Middle', 'Keltner Lower',
+    'Donchian Upper', 'Donchian Middle', 'Donchian Lower', 'PSAR', 'PSAR Trend'
+]
+
+def _shift(values, periods):
+    """Shift an array by `periods` bars (forward if positive), filling with NaN."""
+    out = np.full(len(values), np.nan)
+    if periods >= 0:
+        out[periods:] = values[:len(values) - periods]
+    else:
+        out[:periods] = values[-periods:]
+    return out
+
+# Extended indicators are separate engine nodes, so each wrapper only
+# computes what it needs; shared inputs (rolling extremes per window, true
+# range, typical price, EMA) are nodes themselves and computed once.
+
+@indicator('rolling_extremes')
+def _rolling_extremes_node(engine, window=14):
+    high = engine.data['High'].to_numpy(dtype=float)
+    low = engine.data['Low'].to_numpy(dtype=float)
+    return _rolling_extremes(high, low, [window])[window]
+
+@indicator('stochastic')
+def _stochastic(engine, window=14, smooth=3):
+    close = engine.data['Close'].to_numpy(dtype=float)
+    highest, lowest = engine.get('rolling_extremes', window=window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch_k = 100 * (close - lowest) / (highest - lowest)
+        williams_r = -100 * (highest - close) / (highest - lowest)
+    return pd.DataFrame({
+        'Stoch %K': stoch_k,
+        'Stoch %D': _rolling_sum(stoch_k, smooth) / smooth,
+        'Williams %R': williams_r
+    }, index=engine.data.index)
+
+@indicator('adx')
+def _adx(engine, window=14):
+    # ADX / DMI from directional movement and the shared true range
+    high = engine.data['High'].to_numpy(dtype=float)
+    low = engine.data['Low'].to_numpy(dtype=float)
+    true_range = engine.get('true_range').to_numpy(dtype=float)
+    if len(high) == 0:
+        return pd.DataFrame(columns=['ADX', '+DI', '-DI'], index=engine.data.index, dtype=float)
+    up_move = np.diff(high, prepend=high[0])
+    down_move = -np.diff(low, prepend=low[0])
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    alpha = 1.0 / window
+    with np.errstate(divide='ignore', invalid='ignore'):
+        smoothed_tr = kernels.exponential_smooth(true_range, alpha)
+        plus_di = 100 * kernels.exponential_smooth(plus_dm, alpha) / smoothed_tr
+        minus_di = 100 * kernels.exponential_smooth(minus_dm, alpha) / smoothed_tr
+        di_sum = plus_di + minus_di
+        dx = np.where(di_sum > 0, 100 * np.abs(plus_di - minus_di) / di_sum, 0.0)
+    return pd.DataFrame({
+        'ADX': kernels.exponential_smooth(dx, alpha),
+        '+DI': plus_di,
+        '-DI': minus_di
+    }, index=engine.data.index)
+
+@indicator('cci')
+def _cci(engine, window=20):
+    # The mean absolute deviation is accumulated one lag at a time, so memory
+    # stays O(n) instead of holding every window
+    typical_price = engine.get('typical_price').to_numpy(dtype=float)
+    n = len(typical_price)
+    tp_mean = _rolling_sum(typical_price, window) / window
+    mean_dev = np.full(n, np.nan)
+    if window <= n:
+        current = tp_mean[window - 1:]
+        total = np.zeros(n - window + 1)
+        for lag in range(window):
+            total += np.abs(typical_price[window - 1 - lag:n - lag] - current)
+        mean_dev[window - 1:] = total / window
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.Series((typical_price - tp_mean) / (0.015 * mean_dev), index=engine.data.index)
+
+@indicator('mfi')
+def _mfi(engine, window=14):
+    typical_price = engine.get('typical_price').to_numpy(dtype=float)
+    money_flow = typical_price * engine.data['Volume'].to_numpy(dtype=float)
+    tp_change = np.diff(typical_price, prepend=np.nan)
+    positive_flow = _rolling_sum(np.where(tp_change > 0, money_flow, 0.0), window)
+    negative_flow = _rolling_sum(np.where(tp_change < 0, money_flow, 0.0), window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.Series(100 - 100 / (1 + positive_flow / negative_flow), index=engine.data.index)
+
+@indicator('ichimoku')
+def _ichimoku(engine, windows=(9, 26, 52)):
+    # Causal lines only: Senkou spans move past values forward; the Chikou
+    # span (future closes) is added for display by calculate_ichimoku
+    def midpoint(window):
+        highest, lowest = engine.get('rolling_extremes', window=window)
+        return (highest + lowest) / 2
+    
+    tenkan_window, kijun_window, senkou_window = windows
+    tenkan = midpoint(tenkan_window)
+    kijun = midpoint(kijun_window)
+    return pd.DataFrame({
+        'Ichimoku Tenkan': tenkan,
+        'Ichimoku Kijun': kijun,
+        'Ichimoku Senkou A': _shift((tenkan + kijun) / 2, kijun_window),
+        'Ichimoku Senkou B': _shift(midpoint(senkou_window), kijun_window)
+    }, index=engine.data.index)
+
+@indicator('keltner')
+def _keltner(engine, window=20, atr_window=10, multiplier=2):
+    # Keltner around the shared EMA node, using the shared true range
+    middle = engine.get('ema', window=window).to_numpy(dtype=float)
+    atr = _rolling_sum(engine.get('true_range').to_numpy(dtype=float), atr_window) / atr_window
+    return pd.DataFrame({
+        'Keltner Upper': middle + multiplier * atr,
+        'Keltner Middle': middle,
+        'Keltner Lower': middle - multiplier * atr
+    }, index=engine.data.index)
+
+@indicator('donchian')
+def _donchian(engine, window=20):
+    # The Donchian channel is the rolling extremes themselves
+    highest, lowest = engine.get('rolling_extremes', window=window)
+    return pd.DataFrame({
+        'Donchian Upper': highest,
+        'Donchian Middle': (highest + lowest) / 2,
+        'Donchian Lower': lowest
+    }, index=engine.data.index)
+
+@indicator('extended_pack')
+def _extended_pack(engine, adx_window=14, stoch_window=14, stoch_smooth=3, cci_window=20,
+                   mfi_window=14, ichimoku_windows=(9, 26, 52), keltner_window=20,
+                   keltner_atr_window=10, keltner_mult=2, donchian_window=20,
+                   psar_step=0.02, psar_max_step=0.2):
+    # All extended nodes side by side; windows they share are computed once
+    sar, trend = engine.get('psar', step=psar_step, max_step=psar_max_step)
+    pack = pd.concat([
+        engine.get('stochastic', window=stoch_window, smooth=stoch_smooth),
+        engine.get('adx', window=adx_window),
+        engine.get('cci', window=cci_window).rename('CCI'),
+        engine.get('mfi', window=mfi_window).rename('MFI'),
+        engine.get('obv').rename('OBV'),
+        engine.get('ichimoku', windows=tuple(ichimoku_windows)),
+        engine.get('keltner', window=keltner_window, atr_window=keltner_atr_window,
+                   multiplier=keltner_mult),
+        engine.get('donchian', window=donchian_window),
+        sar.rename('PSAR'),
+        trend.rename('PSAR Trend'),
+    ], axis=1)
+    return pack[EXTENDED_COLUMNS]
+
+def calculate_extended_indicators(data, **params):
+    """
+    Calculate the extended indicator pack: ADX/DMI, Stochastic, Williams %R,
+    CCI, OBV, MFI, Ichimoku, Keltner and Donchian channels, and Parabolic SAR.
+    
+    Every indicator is its own engine node; those sharing rolling windows,
+    the true range or the typical price reuse them, and the result is
+    memoized like every other engine node. The Ichimoku Chikou span is not
+    included (it looks ahead; see calculate_ichimoku).
+    
+    Args:
+        data (pd.DataFrame): Stock data with OHLCV columns
+        **params: Overrides for the pack parameters (adx_window, stoch_window,
+            stoch_smooth, cci_window, mfi_window, ichimoku_windows,
+            keltner_window, keltner_atr_window, keltner_mult, donchian_window,
+            psar_step, psar_max_step)
+        
+    Returns:
+        pd.DataFrame: One column per indicator output
+    """
+    return get_engine(data).get('extended_pack', **params)
+
+def calculate_adx(data, window=14):
+    """
+    Calculate the Average Directional Index with the Directional Movement lines.
+    
+    Returns:
+        tuple: (ADX, +DI, -DI)
+    """
+    adx = get_engine(data).get('adx', window=window)
+    return adx['ADX'], adx['+DI'], adx['-DI']
+
+def calculate_stochastic(data, window=14, smooth=3):
+    """
+    Calculate the Stochastic Oscillator.
+    
+    Returns:
+        tuple: (%K, %D)
+    """
+    stochastic = get_engine(data).get('stochastic', window=window, smooth=smooth)
+    return stochastic['Stoch %K'], stochastic['Stoch %D']
+
+def calculate_williams_r(data, window=14):
+    """
+    Calculate Williams %R.
+    
+    Returns:
+        pd.Series: Williams %R values (-100 to 0)
+    """
+    return get_engine(data).get('stochastic', window=window)['Williams %R']
+
+def calculate_cci(data, window=20):
+    """
+    Calculate the Commodity Channel Index.
+    
+    Returns:
+        pd.Series: CCI values
+    """
+    return get_engine(data).get('cci', window=window)
+
+def calculate_mfi(data, window=14):
+    """
+    Calculate the Money Flow Index.
+    
+    Returns:
+        pd.Series: MFI values (0 to 100)
+    """
+    return get_engine(data).get('mfi', window=window)
+
+def calculate_ichimoku(data, windows=(9, 26, 52)):
+    """
+    Calculate the Ichimoku Cloud lines.
+    
+    The Chikou span is the close shifted back by the Kijun window, so its
+    value on a bar is a later close: it is for drawing only and must never
+    feed a signal or backtest.
+    
+    Returns:
+        tuple: (Tenkan-sen, Kijun-sen, Senkou Span A, Senkou Span B, Chikou Span)
+    """
+    windows = tuple(windows)
+    lines = get_engine(data).get('ichimoku', windows=windows)
+    chikou = pd.Series(_shift(data['Close'].to_numpy(dtype=float), -windows[1]), index=data.index)
+    return tuple(lines[f'Ichimoku {line}'] for line in ('Tenkan', 'Kijun', 'Senkou A', 'Senkou B')) + (chikou,)
+
+def calculate_keltner_channels(data, window=20, atr_window=10, multiplier=2):
+    """
+    Calculate Keltner Channels (EMA middle line, ATR-based bands).
+    
+    Returns:
+        tuple: (Upper band, Middle band, Lower band)
+    """
+    keltner = get_engine(data).get('keltner', window=window, atr_window=atr_window, multiplier=multiplier)
+    return keltner['Keltner Upper'], keltner['Keltner Middle'], keltner['Keltner Lower']
+
+def calculate_donchian_channels(data, window=20):
+    """
+    Calculate Donchian Channels.
+    
+    Returns:
+        tuple: (Upper band, Middle band, Lower band)
+    """
+    donchian = get_engine(data).get('donchian', window=window)
+    return donchian['Donchian Upper'], donchian['Donchian Middle'], donchian['Donchian Lower']
+
+def calculate_parabolic_sar(data, step=0.02, max_step=0.2):
+    """
+    Calculate the Parabolic SAR.
+    
+    Returns:
+        tuple: (SAR values, trend) where trend is 1 in uptrends and -1 in downtrends
+    """
+    return get_engine(data).get('psar', step=step, max_step=max_step)
+
+def calculate_supertrend(data, window=10, multiplier=3):
+    """
+    Calculate the SuperTrend indicator over Wilder's ATR.
+    
+    Args:
+        data (pd.DataFrame): Stock data with OHLC columns
+        window (int): ATR period
+        multiplier (float): ATR multiple for the bands
+        
+    Returns:
+        tuple: (SuperTrend line, trend) where trend is 1 in uptrends and -1 in downtrends
+    """
+    return get_engine(data).get('supertrend', window=window, multiplier=multiplier)
+
+def default_vwap_session(data):
+    """
+    Session a VWAP restarts at: every day for intraday bars, every month for
+    daily and coarser bars (where a daily VWAP is just the typical price).
+    """
+    interval = data.attrs.get('interval')
+    if interval is not None:
+        return '1d' if is_intraday(interval) else '1mo'
+    if len(data) > 1 and (data.index[1:] - data.index[:-1]).median() < pd.Timedelta(days=1):
+        return '1d'
+    return '1mo'
+
+def calculate_vwap(data, session='1d', num_std=2):
+    """
+    Calculate the session VWAP with volume-weighted standard deviation bands.
+    
+    Prices are measured from the typical price of their session's first
+    bar, so the squared terms stay small. Running totals of volume,
+    offset x volume and offset^2 x volume are taken once over the whole
+    history, and each session's values are differences of those totals,
+    so there is no per-session loop.
+    
+    Args:
+        data (pd.DataFrame): Stock data with OHLCV columns
+        session (str, optional): '1d', '1wk' or '1mo' session length, or
+            None for one VWAP over the whole data
+        num_std (float): Number of standard deviations for the bands
+        
+    Returns:
+        tuple: (Upper band, VWAP, Lower band)
+    """
+    vwap, std = get_engine(data).get('vwap', session=session)
+    return vwap + num_std * std, vwap, vwap - num_std * std
+
+def vwap_anchor_points(data, window=10, max_anchors=3):
+    """
+    Dates of the most recent swing highs and lows, to anchor VWAPs at.
+    
+    Args:
+        data (pd.DataFrame): Stock data with 'High' and 'Low' columns
+        window (int): Bars on each side that define a swing point
+        max_anchors (int): Number of swing points to return
+        
+    Returns:
+        pd.DatetimeIndex: Anchor dates, oldest first
+    """
+    swings = _swing_points(data, window)
+    positions = np.union1d(swings['Low'], swings['High'])[-max_anchors:]
+    return data.index[positions]
+
+def calculate_anchored_vwap(data, anchors='swings'):
+    """
+    Calculate anchored VWAPs from several dates at once.
+    
+    Every anchor is the difference of the same running volume totals from
+    its first bar on, so many anchors cost one pass over the data.
+    
+    Args:
+        data (pd.DataFrame): Stock data with OHLCV columns
+        anchors (iterable or str): Anchor dates (each snapped to the first bar
+            on or after it), or 'swings' for the most recent swing points
+        
+    Returns:
+        pd.DataFrame: One column per anchor bar date, NaN before the anchor
+    """
+    if isinstance(anchors, str):
+        if anchors != 'swings':
+            raise ValueError(f"Unknown VWAP anchors: {anchors}")
+        anchors = vwap_anchor_points(data)
+    positions = sorted({visible_slice(data.index, (anchor, None)).start for anchor in anchors})
+    positions = tuple(position for position in positions if position < len(data))
+    return get_engine(data).get('anchored_vwap', anchors=positions)
+
+# Oscillators supported by the divergence engine
+DIVERGENCE_OSCILLATORS = {
+    'RSI': lambda data: calculate_rsi(data),
+    'MACD': lambda data: calculate_macd(data)[0],
+    'OBV': lambda data: calculate_obv(data),
+}
+
+# (swing column, label, price move, oscillator move) per divergence type
+_DIVERGENCE_RULES = [
+    ('Low', 'Bullish Divergence', np.less, np.greater),
+    ('High', 'Bearish Divergence', np.greater, np.less),
+    ('Low', 'Hidden Bullish Divergence', np.greater, np.less),
+    ('High', 'Hidden Bearish Divergence', np.less, np.greater),
+]
+
+DIVERGENCE_COLUMNS = ['Date', 'Type', 'Start', 'Price', 'Oscillator']
+
+def _swing_points(data, window):
+    """Swing low positions of 'Low' and swing high positions of 'High'."""
+    return {
+        'Low': find_local_extrema(data['Low'], window, kind='min', strict=False),
+        'High': find_local_extrema(data['High'], window, kind='max', strict=False)
+    }
+
+def _match_divergences(data, osc, swings, hidden):
+    """
+    Match consecutive swings against the oscillator as arrays.
+    
+    Returns:
+        tuple: (positions, previous swing positions, labels, prices, oscillator values)
+    """
+    rules = _DIVERGENCE_RULES if hidden else _DIVERGENCE_RULES[:2]
+    parts = []
+    for column, label, price_move, osc_move in rules:
+        positions = swings[column]
+        if len(positions) < 2:
+            continue
+        
+        price = data[column].to_numpy(dtype=float)[positions]
+        values = osc[positions]
+        # Compare every swing with the one before it
+        found = np.flatnonzero(price_move(price[1:], price[:-1]) & osc_move(values[1:], values[:-1])) + 1
+        parts.append((positions[found], positions[found - 1], np.full(len(found), label, dtype=object),
+                      price[found], values[found]))
+    
+    if not parts:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0, dtype=object), np.empty(0), np.empty(0)
+    
+    columns = [np.concatenate(column) for column in zip(*parts)]
+    order = np.argsort(columns[0], kind='stable')
+    return tuple(column[order] for column in columns)
+
+def find_divergences(data, oscillator='RSI', window=5, hidden=True):
+    """
+    Detect price/oscillator divergences.
+    
+    Swing lows of 'Low' and swing highs of 'High' are found with one
+    vectorized extrema pass each (a bar at or beyond every neighbour within
+    `window` bars). Consecutive swings are then compared as arrays against
+    the oscillator value at the same bars:
+    
+    - Bullish: price makes a lower low, oscillator a higher low
+    - Bearish: price makes a higher high, oscillator a lower high
+    - Hidden Bullish: price makes a higher low, oscillator a lower low
+    - Hidden Bearish: price makes a lower high, oscillator a higher high
+    
+    Args:
+        data (pd.DataFrame): Stock data with OHLCV columns
+        oscillator (str or pd.Series): 'RSI', 'MACD', 'OBV' or a series aligned with data
+        window (int): Bars on each side that define a swing point
+        hidden (bool): Whether to include hidden divergences
+        
+    Returns:
+        pd.DataFrame: One row per divergence, in date order, with columns
+            'Date', 'Type', 'Start' (previous swing date), 'Price' and 'Oscillator'
+    """
+    if isinstance(oscillator, str):
+        oscillator = DIVERGENCE_OSCILLATORS[oscillator](data)
+    osc = np.asarray(oscillator, dtype=float)
+    
+    positions, starts, labels, price, values = _match_divergences(data, osc, _swing_points(data, window), hidden)
+    return pd.DataFrame({
+        'Date': data.index[positions],
+        'Type': labels,
+        'Start': data.index[starts],
+        'Price': price,
+        'Oscillator': values
+    }, columns=DIVERGENCE_COLUMNS)
+
+def find_watchlist_divergences(frames, oscillators=('RSI', 'MACD', 'OBV'), window=5, hidden=True):
+    """
+    Detect divergences for every symbol of a watchlist.
+    
+    Swing points are found once per symbol and shared by all oscillators,
+    and the result table is assembled once at the end.
+    
+    Args:
+        frames (dict): Symbol -> OHLCV DataFrame
+        oscillators (iterable): Oscillator names from DIVERGENCE_OSCILLATORS
+        window (int): Bars on each side that define a swing point
+        hidden (bool): Whether to include hidden divergences
+        
+    Returns:
+        pd.DataFrame: find_divergences columns plus 'Symbol' and 'Indicator'
+    """
+    columns = {name: [] for name in ['Symbol', 'Indicator'] + DIVERGENCE_COLUMNS}
+    for symbol, data in frames.items():
+        swings = _swing_points(data, window)
+        for name in oscillators:
+            osc = np.asarray(DIVERGENCE_OSCILLATORS[name](data), dtype=float)
+            positions, starts, labels, price, values = _match_divergences(data, osc, swings, hidden)
+            columns['Symbol'].append(np.full(len(positions), symbol, dtype=object))
+            columns['Indicator'].append(np.full(len(positions), name, dtype=object))
+            columns['Date'].append(data.index[positions])
+            columns['Type'].append(labels)
+            columns['Start'].append(data.index[starts])
+            columns['Price'].append(price)
+            columns['Oscillator'].append(values)
+    
+    if not frames:
+        return pd.DataFrame(columns=list(columns))
+    
+    return pd.DataFrame({
+        name: (parts[0].append(parts[1:]) if name in ('Date', 'Start') else np.concatenate(parts))
+        for name, parts in columns.items()
+    })
+
+@memoize_figure
+def plot_with_indicators(data, indicators, x_range=None, width_px=DEFAULT_WIDTH_PX, render_mode='auto',
+                         vwap_anchors='swings'):
     """
     Create a plot with specified technical indicators.
     
+    Indicators are computed over the full history, then only the visible
+    range is plotted: candles aggregated and lines downsampled to fit the
+    plot width.
+    
     Args:
         data (pd.DataFrame): Stock data with OHLC columns
         indicators (list): List of indicators to include
+        x_range (tuple, optional): (start, end) of the visible date range
+        width_px (int, optional): Plot width in pixels; None plots every bar
+        render_mode (str): 'auto', 'svg' or 'webgl' for line and bar traces
+        vwap_anchors (iterable or str): Anchor dates for 'Anchored VWAP', or
+            'swings' for the most recent swing points
         
     Returns:
         plotly.graph_objects.Figure: Plotly figure with indicators
     """
+    if data.empty:
+        return go.Figure()
+    # A range between bars (or past the data) falls back to the full history
+    x_range = covering_range(data.index, x_range)
+    bars, interval = decimate_ohlc(data, x_range, width_px)
+    visible = data.index[visible_slice(data.index, x_range)]
+    
+    def line(series):
+        return decimate_line(series, x_range, width_px)
+    
+    Scatter = scatter_type(len(visible), render_mode)
+    
     # Create figure with secondary y-axis
     fig = make_subplots(
         rows=2, 
@@ -207,12 +883,12 @@ def plot_with_indicators(data, indicators):
     # Add candlestick chart
     fig.add_trace(
         go.Candlestick(
-            x=data.index,
-            open=data['Open'],
-            high=data['High'],
-            low=data['Low'],
-            close=data['Close'],
-            name="Price"
+            x=bars.index,
+            open=bars['Open'],
+            high=bars['High'],
+            low=bars['Low'],
+            close=bars['Close'],
+            name=price_trace_name(interval)
         ),
         row=1, col=1
     )
@@ -223,10 +899,10 @@ def plot_with_indicators(data, indicators):
         colors = ['rgba(13, 71, 161, 0.7)', 'rgba(46, 125, 50, 0.7)', 'rgba(183, 28, 28, 0.7)']
         
         for period, color in zip(periods, colors):
-            sma = calculate_sma(data, window=period)
+            sma = line(calculate_sma(data, window=period))
             fig.add_trace(
-                go.Scatter(
-                    x=data.index,
+                Scatter(
+                    x=sma.index,
                     y=sma,
                     line=dict(color=color, width=1),
                     name=f"SMA {period}"
@@ -236,11 +912,14 @@ def plot_with_indicators(data, indicators):
     
     if 'Bollinger Bands' in indicators:
         upper, middle, lower = calculate_bollinger_bands(data)
+        # Bands share the middle line's points so the fill stays aligned
+        middle = line(middle)
+        upper, lower = upper.loc[middle.index], lower.loc[middle.index]
         
         # Add middle band
         fig.add_trace(
-            go.Scatter(
-                x=data.index,
+            Scatter(
+                x=middle.index,
                 y=middle,
                 line=dict(color='rgba(46, 125, 50, 0.7)', width=1),
                 name="BB Middle"
@@ -250,8 +929,8 @@ def plot_with_indicators(data, indicators):
         
         # Add upper and lower bands
         fig.add_trace(
-            go.Scatter(
-                x=data.index,
+            Scatter(
+                x=upper.index,
                 y=upper,
                 line=dict(color='rgba(0, 0, 0, 0)'),
                 name="BB Upper"
@@ -260,8 +939,8 @@ def plot_with_indicators(data, indicators):
         )
         
         fig.add_trace(
-            go.Scatter(
-                x=data.index,
+            Scatter(
+                x=lower.index,
                 y=lower,
                 line=dict(color='rgba(0, 0, 0, 0)'),
                 fill='tonexty',
@@ -271,12 +950,53 @@ def plot_with_indicators(data, indicators):
             row=1, col=1
         )
     
+    if 'VWAP' in indicators:
+        upper, vwap, lower = calculate_vwap(data, session=default_vwap_session(data))
+        vwap = line(vwap)
+        upper, lower = upper.loc[vwap.index], lower.loc[vwap.index]
+        
+        fig.add_trace(
+            Scatter(
+                x=vwap.index,
+                y=vwap,
+                line=dict(color='rgba(255, 143, 0, 0.9)', width=1.5),
+                name="VWAP"
+            ),
+            row=1, col=1
+        )
+        for band, name in ((upper, "VWAP +2σ"), (lower, "VWAP -2σ")):
+            fig.add_trace(
+                Scatter(
+                    x=band.index,
+                    y=band,
+                    line=dict(color='rgba(255, 143, 0, 0.5)', width=1, dash='dot'),
+                    name=name
+                ),
+                row=1, col=1
+            )
+    
+    if 'Anchored VWAP' in indicators:
+        anchored = calculate_anchored_vwap(data, vwap_anchors)
+        colors = ['rgba(123, 31, 162, 0.8)', 'rgba(0, 131, 143, 0.8)', 'rgba(194, 24, 91, 0.8)']
+        
+        for i, (anchor, values) in enumerate(anchored.items()):
+            values = line(values)
+            fig.add_trace(
+                Scatter(
+                    x=values.index,
+                    y=values,
+                    line=dict(color=colors[i % len(colors)], width=1),
+                    name=f"AVWAP {anchor:%Y-%m-%d}"
+                ),
+                row=1, col=1
+            )
+    
     if 'RSI' in indicators:
-        rsi = calculate_rsi(data)
+        rsi = line(calculate_rsi(data))
         
         fig.add_trace(
-            go.Scatter(
-                x=data.index,
+            Scatter(
+                x=rsi.index,
                 y=rsi,
                 line=dict(color='purple', width=1),
                 name="RSI"
@@ -287,9 +1007,9 @@ def plot_with_indicators(data, indicators):
         # Add RSI overbought/oversold lines
         fig.add_shape(
             type='line',
-            x0=data.index[0],
+            x0=visible[0],
             y0=70,
-            x1=data.index[-1],
+            x1=visible[-1],
             y1=70,
             line=dict(color='red', width=1, dash='dash'),
             row=2, col=1
@@ -297,9 +1017,9 @@ def plot_with_indicators(data, indicators):
         
         fig.add_shape(
             type='line',
-            x0=data.index[0],
+            x0=visible[0],
             y0=30,
-            x1=data.index[-1],
+            x1=visible[-1],
             y1=30,
             line=dict(color='green', width=1, dash='dash'),
             row=2, col=1
@@ -309,12 +1029,12 @@ def plot_with_indicators(data, indicators):
         fig.update_yaxes(range=[0, 100], row=2, col=1)
     
     if 'MACD' in indicators:
-        macd_line, signal_line, histogram = calculate_macd(data)
+        macd_line, signal_line, histogram = (line(values) for values in calculate_macd(data))
         
         # Add MACD line and signal line
         fig.add_trace(
-            go.Scatter(
-                x=data.index,
+            Scatter(
+                x=macd_line.index,
                 y=macd_line,
                 line=dict(color='blue', width=1),
                 name="MACD"
@@ -323,8 +1043,8 @@ def plot_with_indicators(data, indicators):
         )
         
         fig.add_trace(
-            go.Scatter(
-                x=data.index,
+            Scatter(
+                x=signal_line.index,
                 y=signal_line,
                 line=dict(color='red', width=1),
                 name="Signal"
@@ -333,42 +1053,24 @@ def plot_with_indicators(data, indicators):
         )
         
         # Add histogram as bar chart
-        colors = ['green' if val >= 0 else 'red' for val in histogram]
-        fig.add_trace(
-            go.Bar(
-                x=data.index,
-                y=histogram,
-                marker_color=colors,
-                name="Histogram"
-            ),
-            row=2, col=1
-        )
+        colors = direction_colors(histogram)
+        for trace in bar_traces(histogram.index, histogram, colors, "Histogram", render_mode, len(visible)):
+            fig.add_trace(trace, row=2, col=1)
     
     # Add support and resistance lines if selected
     if 'Support/Resistance' in indicators:
-        support_levels, resistance_levels = calculate_support_resistance(data)
-        
-        # Add resistance levels
-        for date, level in resistance_levels:
-            fig.add_shape(
-                type="line",
-                x0=date,
-                y0=level,
-                x1=data.index[-1],
-                y1=level,
-                line=dict(color="red", width=1, dash="dash"),
-                row=1, col=1
-            )
+        zones = calculate_sr_zones(data)
         
-        # Add support levels
-        for date, level in support_levels:
-            fig.add_shape(
-                type="line",
-                x0=date,
-                y0=level,
-                x1=data.index[-1],
-                y1=level,
-                line=dict(color="green", width=1, dash="dash"),
+        # A few ranked zones as shaded bands instead of a line per swing level
+        for zone_type, color in (('Resistance', 'red'), ('Support', 'green'), ('Current', 'orange')):
+            band = zones[zones['Type'] == zone_type]
+            add_zone_bands(
+                fig,
+                [visible[0]] * len(band),
+                [visible[-1]] * len(band),
+                band['Low'],
+                band['High'],
+                color=color,
                 row=1, col=1
             )
     
@@ -0,0 +1,91 @@
+"""
+Time range presets for slicing price history.
+
+Pages offer "1 Month" / "3 Months" / ... selectors over the full history.
+Filtering with a boolean mask allocates a mask and a new frame on every
+rerun; since bars are kept on a sorted DatetimeIndex, the range is instead
+located with two binary searches and returned as a positional slice, which
+pandas serves as a view of the cached frame rather than a copy (read-only
+by convention: see select_range).
+
+Presets are calendar offsets measured back from the last bar and snapped
+forward to the first bar on or after that date, so "1 Month" of daily data
+starts on the first trading day of the window however weekends and
+holidays fall.
+
+    recent = select_range(stock_data, '6 Months')
+"""
+
+from typing import Optional
+
+import pandas as pd
+
+from utils.chart_decimation import visible_slice
+
+# Preset label -> offset back from the last bar (None keeps the whole history)
+RANGE_PRESETS = {
+    'All Data': None,
+    '1 Month': pd.DateOffset(months=1),
+    '3 Months': pd.DateOffset(months=3),
+    '6 Months': pd.DateOffset(months=6),
+    '1 Year': pd.DateOffset(years=1),
+}
+
+# Other labels pages use for the whole history
+_FULL_HISTORY = {'Full History'}
+
+
+def range_start(index: pd.Index, preset: str) -> Optional[pd.Timestamp]:
+    """
+    Start date of a preset range ending at the last bar.
+
+    Args:
+        index (pd.Index): Sorted DatetimeIndex of the bars
+        preset (str): Key of RANGE_PRESETS
+
+    Returns:
+        pd.Timestamp: Start of the range, or None for the whole history
+    """
+    if preset in _FULL_HISTORY:
+        return None
+    if preset not in RANGE_PRESETS:
+        raise ValueError(f"Unknown time range: {preset} (expected one of {list(RANGE_PRESETS)})")
+    offset = RANGE_PRESETS[preset]
+    if offset is None or len(index) == 0:
+        return None
+    return index[-1] - offset
+
+
+def range_slice(index: pd.Index, preset: str) -> slice:
+    """
+    Positions of the bars inside a preset range.
+
+    Args:
+        index (pd.Index): Sorted DatetimeIndex of the bars
+        preset (str): Key of RANGE_PRESETS
+
+    Returns:
+        slice: Positional slice from the first bar on or after the range start
+    """
+    return visible_slice(index, (range_start(index, preset), None))
+
+
+def select_range(data: pd.DataFrame, preset: str) -> pd.DataFrame:
+    """
+    Bars of a preset time range, without copying the data.
+
+    The result is `data` itself or a view sharing its memory. Only pandas
+    3 copy-on-write isolates it; on earlier versions, writing to it can
+    change `data`, so copy it before modifying it in place.
+
+    Args:
+        data (pd.DataFrame): Bars with a sorted DatetimeIndex
+        preset (str): Key of RANGE_PRESETS (or 'Full History')
+
+    Returns:
+        pd.DataFrame: The bars inside the range
+    """
+    window = range_slice(data.index, preset)
+    if window == slice(0, len(data)):
+        return data
+    return data.iloc[window]
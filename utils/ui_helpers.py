@@ -1,8 +1,13 @@
 """
 Utility functions for consistent page styling and headers
 """
+from datetime import timedelta
+
 import streamlit as st
 
+from utils.chart_helpers import RENDER_MODES, WEBGL_POINT_THRESHOLD
+from utils.resampling import is_intraday
+
 def page_header(title: str, subtitle: str, icon: str = "📈"):
     """Premium gradient page header used across all pages."""
     st.markdown(
@@ -18,6 +23,45 @@ def page_header(title: str, subtitle: str, icon: str = "📈"):
         unsafe_allow_html=True,
     )
 
+def render_mode_selector():
+    """Sidebar control for chart rendering, shared by the chart pages."""
+    return st.sidebar.selectbox(
+        "Chart Rendering",
+        list(RENDER_MODES),
+        format_func=RENDER_MODES.get,
+        key="chart_render_mode",
+        help=f"Auto draws charts with more than {WEBGL_POINT_THRESHOLD:,} points per trace with WebGL"
+    )
+
+def visible_range_slider(data, key: str):
+    """
+    Slider choosing the part of the data a chart shows.
+
+    Long ranges are drawn with aggregated candles to fit the plot width;
+    narrowing the slider brings back full-resolution bars.
+
+    Returns:
+        tuple: (start, end) to pass as a chart's x_range, or None for all bars
+    """
+    if len(data) < 2:
+        return None
+    index = data.index if data.index.tz is None else data.index.tz_localize(None)
+    first, last = index[0].to_pydatetime(), index[-1].to_pydatetime()
+    intraday = is_intraday(data.attrs.get('interval'))
+    start, end = st.slider(
+        "Visible Range",
+        min_value=first,
+        max_value=last,
+        value=(first, last),
+        step=timedelta(minutes=1) if intraday else timedelta(days=1),
+        format="YYYY-MM-DD HH:mm" if intraday else "YYYY-MM-DD",
+        key=key,
+        help="Zoom the chart in; narrower ranges are drawn with full-resolution bars"
+    )
+    if start <= first and end >= last:
+        return None
+    return start, end
+
 def premium_metric(label: str, value: str, change: str = None, is_negative: bool = False):
     """Shared metric chip with subtle gradients."""
     change_html = ""
@@ -0,0 +1,258 @@
+"""
+Volume profile (volume traded at each price).
+
+Each bar's volume is spread uniformly over its Low-High range and summed
+into price bins. Rather than intersecting every bar with every bin, the
+cumulative volume below a price x,
+
+    C(x) = sum over bars of volume * clip((x - low) / (high - low), 0, 1),
+
+is piecewise linear in x, so it is evaluated at all bin edges at once
+from bars sorted by low and by high with prefix sums and a binary search;
+bin volumes are the differences of C between consecutive edges. A whole
+profile costs O(n log n) however many bins it has, so it can be recomputed
+for the visible range on every zoom. Sessions are profiled in the same
+pass by sorting on (session, price).
+
+    result = volume_profile(data, bins=50, x_range=(start, end))
+    result['poc'], result['value_area_low'], result['value_area_high']
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.chart_decimation import visible_slice
+from utils.indicator_cache import memoize_by_frame
+from utils.resampling import bucket_labels
+
+# Default number of price bins
+DEFAULT_BINS = 50
+
+# Share of the volume inside the value area
+VALUE_AREA = 0.7
+
+# Columns a profile is computed from; profiles are cached on a hash of them
+PROFILE_COLUMNS = ('Low', 'High', 'Volume')
+
+
+def price_edges(low, high, bins: int = DEFAULT_BINS, bin_size: Optional[float] = None) -> np.ndarray:
+    """
+    Bin edges spanning a price range.
+
+    Args:
+        low (array-like): Bar lows
+        high (array-like): Bar highs
+        bins (int): Number of bins (ignored when bin_size is given)
+        bin_size (float, optional): Fixed bin height; edges are aligned to
+            multiples of it so profiles of different ranges line up
+
+    Returns:
+        np.ndarray: Increasing bin edges
+    """
+    low, high = np.asarray(low, dtype=float), np.asarray(high, dtype=float)
+    if not np.isfinite(low).any() or not np.isfinite(high).any():
+        return np.empty(0)
+    bottom, top = np.nanmin(low), np.nanmax(high)
+    if bin_size:
+        start = np.floor(bottom / bin_size) * bin_size
+        count = max(int(np.ceil((top - start) / bin_size)), 1)
+        return start + bin_size * np.arange(count + 1)
+    if top <= bottom:
+        top = bottom + max(abs(bottom) * 1e-6, 1e-9)
+    return np.linspace(bottom, top, bins + 1)
+
+
+def _cumulative_at(points, density, edges, groups, n_groups):
+    """
+    sum(density * (edge - point)) over the points at or below each edge, per group.
+
+    Points are sorted on (group, point) and keyed as group * span + point,
+    so one searchsorted finds, for every group and edge, how many of the
+    group's points lie at or below the edge.
+    """
+    base = min(points.min(), edges[0])
+    span = max(points.max(), edges[-1]) - base + 1
+    keys = groups * span + (points - base)
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    weight = np.concatenate(([0.0], np.cumsum(density[order])))
+    moment = np.concatenate(([0.0], np.cumsum(density[order] * points[order])))
+
+    offsets = np.arange(n_groups)[:, None] * span
+    first = np.searchsorted(keys, offsets[:, 0], side='left')[:, None]
+    last = np.searchsorted(keys, offsets + (edges - base)[None, :], side='right')
+    return edges[None, :] * (weight[last] - weight[first]) - (moment[last] - moment[first])
+
+
+def distribute_volume(low, high, volume, edges, groups=None, n_groups: Optional[int] = None) -> np.ndarray:
+    """
+    Volume per price bin, each bar's volume spread uniformly over its range.
+
+    Bars with no range put all their volume in the bin of their price;
+    volume outside the edges is left out.
+
+    Args:
+        low (array-like): Bar lows
+        high (array-like): Bar highs
+        volume (array-like): Bar volumes
+        edges (np.ndarray): Increasing bin edges
+        groups (array-like, optional): Integer session code of every bar
+        n_groups (int, optional): Number of sessions (default: max code + 1)
+
+    Returns:
+        np.ndarray: Volume per bin, shape (bins,) without groups or
+            (n_groups, bins) with them
+    """
+    low = np.asarray(low, dtype=float)
+    high = np.asarray(high, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    grouped = groups is not None
+    groups = np.zeros(len(low), dtype=np.intp) if groups is None else np.asarray(groups, dtype=np.intp)
+    if n_groups is None:
+        n_groups = int(groups.max()) + 1 if len(groups) else 1
+    n_bins = max(len(edges) - 1, 0)
+    out = np.zeros((n_groups, n_bins))
+
+    valid = np.isfinite(low) & np.isfinite(high) & np.isfinite(volume) & (volume > 0)
+    if n_bins == 0 or not valid.any():
+        return out if grouped else out[0]
+
+    ranged = valid & (high > low)
+    if ranged.any():
+        density = volume[ranged] / (high[ranged] - low[ranged])
+        # C(x) = sum d * (x - low)+ - sum d * (x - high)+ per group
+        cumulative = (_cumulative_at(low[ranged], density, edges, groups[ranged], n_groups)
+                      - _cumulative_at(high[ranged], density, edges, groups[ranged], n_groups))
+        out += np.maximum(np.diff(cumulative, axis=1), 0.0)
+
+    flat = valid & ~ranged
+    if flat.any():
+        price = low[flat]
+        inside = (price >= edges[0]) & (price <= edges[-1])
+        position = np.clip(np.searchsorted(edges, price[inside], side='right') - 1, 0, n_bins - 1)
+        out += np.bincount(groups[flat][inside] * n_bins + position, weights=volume[flat][inside],
+                           minlength=n_groups * n_bins).reshape(n_groups, n_bins)
+
+    return out if grouped else out[0]
+
+
+def value_area(volumes, fraction: float = VALUE_AREA) -> Tuple[int, int, int]:
+    """
+    Point of control and value area of a profile.
+
+    Starting from the bin with the most volume, the area grows one bin at a
+    time towards the side with more volume until it holds `fraction` of
+    the total.
+
+    Args:
+        volumes (array-like): Volume per bin
+        fraction (float): Share of the volume the area must hold
+
+    Returns:
+        tuple: (POC bin, first bin, last bin) of the value area
+    """
+    volumes = np.asarray(volumes, dtype=float)
+    poc = int(np.argmax(volumes))
+    target = fraction * volumes.sum()
+    first = last = poc
+    inside = volumes[poc]
+    while inside < target and (first > 0 or last < len(volumes) - 1):
+        below = volumes[first - 1] if first > 0 else -1.0
+        above = volumes[last + 1] if last < len(volumes) - 1 else -1.0
+        if above >= below:
+            last += 1
+            inside += above
+        else:
+            first -= 1
+            inside += below
+    return poc, first, last
+
+
+@memoize_by_frame(columns=PROFILE_COLUMNS)
+def volume_profile(data: pd.DataFrame, bins: int = DEFAULT_BINS, bin_size: Optional[float] = None,
+                   x_range=None, value_area_fraction: float = VALUE_AREA) -> dict:
+    """
+    Volume profile of the bars inside a date range.
+
+    Args:
+        data (pd.DataFrame): Stock data with 'High', 'Low' and 'Volume' columns
+        bins (int): Number of price bins (ignored when bin_size is given)
+        bin_size (float, optional): Fixed bin height in price units
+        x_range (tuple, optional): (start, end) of the range to profile
+        value_area_fraction (float): Share of the volume in the value area
+
+    Returns:
+        dict: 'profile' (DataFrame with 'Low', 'High', 'Price' and 'Volume'
+            per bin), 'poc' (price of the bin with the most volume),
+            'value_area_low', 'value_area_high' and 'total_volume'
+    """
+    bars = data.iloc[visible_slice(data.index, x_range)]
+    edges = price_edges(bars['Low'], bars['High'], bins, bin_size)
+    volumes = distribute_volume(bars['Low'], bars['High'], bars['Volume'], edges)
+    profile = pd.DataFrame({
+        'Low': edges[:-1],
+        'High': edges[1:],
+        'Price': (edges[:-1] + edges[1:]) / 2,
+        'Volume': volumes
+    })
+
+    if not volumes.any():
+        return {'profile': profile, 'poc': np.nan, 'value_area_low': np.nan,
+                'value_area_high': np.nan, 'total_volume': 0.0}
+    poc, first, last = value_area(volumes, value_area_fraction)
+    return {
+        'profile': profile,
+        'poc': profile['Price'].iloc[poc],
+        'value_area_low': edges[first],
+        'value_area_high': edges[last + 1],
+        'total_volume': volumes.sum()
+    }
+
+
+@memoize_by_frame(columns=PROFILE_COLUMNS)
+def session_profiles(data: pd.DataFrame, bins: int = DEFAULT_BINS, bin_size: Optional[float] = None,
+                     x_range=None, session: str = '1d', value_area_fraction: float = VALUE_AREA) -> dict:
+    """
+    Volume profile of every session on one shared price grid.
+
+    Args:
+        data (pd.DataFrame): Intraday (or daily) OHLCV bars
+        bins (int): Number of price bins (ignored when bin_size is given)
+        bin_size (float, optional): Fixed bin height in price units
+        x_range (tuple, optional): (start, end) of the range to profile
+        session (str): Session length: '1d', '1wk' or '1mo'
+        value_area_fraction (float): Share of the volume in the value area
+
+    Returns:
+        dict: 'profiles' (DataFrame of volume, one row per session and one
+            column per bin mid price) and 'levels' (DataFrame with 'POC',
+            'Value Area Low', 'Value Area High' and 'Volume' per session)
+    """
+    bars = data.iloc[visible_slice(data.index, x_range)]
+    edges = price_edges(bars['Low'], bars['High'], bins, bin_size)
+    labels = bucket_labels(bars.index, session)
+    keys = labels.asi8
+    new_session = np.ones(len(keys), dtype=bool)
+    new_session[1:] = keys[1:] != keys[:-1]
+    codes = np.cumsum(new_session) - 1
+    sessions = labels[new_session]
+    volumes = distribute_volume(bars['Low'], bars['High'], bars['Volume'], edges, codes, len(sessions))
+
+    mids = (edges[:-1] + edges[1:]) / 2
+    levels = np.full((len(sessions), 3), np.nan)
+    for row, session_volume in enumerate(volumes):
+        if session_volume.any():
+            poc, first, last = value_area(session_volume, value_area_fraction)
+            levels[row] = mids[poc], edges[first], edges[last + 1]
+
+    return {
+        'profiles': pd.DataFrame(volumes, index=sessions, columns=mids),
+        'levels': pd.DataFrame({
+            'POC': levels[:, 0],
+            'Value Area Low': levels[:, 1],
+            'Value Area High': levels[:, 2],
+            'Volume': volumes.sum(axis=1)
+        }, index=sessions)
+    }